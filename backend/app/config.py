@@ -1,5 +1,6 @@
+import os
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -9,13 +10,55 @@ class Settings(BaseSettings):
     VECTOR_DB_PATH: str = ""
     VECTOR_DB_TYPE: str = ""
     CHROMA_METADATA: str = ""
+    QDRANT_URL: str = ""  # Empty to use the embedded on-disk Qdrant at VECTOR_DB_PATH
+    QDRANT_API_KEY: str = ""
+
+    FAISS_INDEX_TYPE: str = "flat"  # flat, ivfpq or hnsw
+    FAISS_NLIST: int = 1024  # Max IVF lists; scaled down for small collections
+    FAISS_NPROBE: int = 16  # IVF lists scanned per query
+    FAISS_PQ_M: int = 16  # PQ sub-quantizers (bytes per vector)
+    FAISS_HNSW_M: int = 32  # HNSW graph neighbours per node
+    FAISS_HNSW_EF_SEARCH: int = 64  # HNSW candidate list size per query
+
+    VECTOR_QUANTIZATION: str = "none"  # none, int8 or binary; numpy and qdrant only
+    QUANTIZATION_OVERSAMPLING: float = 4.0  # Candidates rescored per requested result
+
+    # Dimensionality reduction of new collections: none, truncate (Matryoshka
+    # models such as text-embedding-3) or pca; kept per collection once created
+    EMBEDDING_PROJECTION: str = "none"
+    EMBEDDING_PROJECTION_DIMENSION: int = 256  # Stored dimension of projected vectors
+    EMBEDDING_PROJECTION_FIT_SAMPLES: int = 2048  # Vectors a PCA projection is fit on
+
+    HYBRID_SEARCH_ENABLED: bool = False  # Fuse BM25 and vector rankings
+    LEXICAL_INDEX_PATH: Path = Path("lexical_index")
+    HYBRID_CANDIDATES: int = 20  # Hits taken from each ranking before fusion
+    RRF_K: int = 60  # Reciprocal rank fusion constant
+
+    RERANK_ENABLED: bool = False  # Rescore retrieved chunks with a cross-encoder
+    RERANK_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    RERANK_CANDIDATES: int = 50  # Chunks over-fetched for the reranker
+    RERANK_BATCH_SIZE: int = 32  # (question, chunk) pairs per forward pass
+    RERANK_CACHE_SIZE: int = 10000  # Scores kept per (question, chunk id)
 
     EMBEDDER_TYPE: str = ""
     EMBEDDER_API_KEY: str = ""
     HUGGINGFACE_MODEL: str = ""
     EMBEDDER_MODEL_ID: str = ""
+    EMBEDDER_API_URL: str = ""  # Override the provider endpoint, e.g. for a proxy
+    EMBEDDER_BATCH_SIZE: int = 0  # Texts per request; 0 uses the provider default
+    EMBEDDER_MAX_CONCURRENCY: int = 4  # Embedding requests in flight per call
+    EMBEDDER_MAX_RETRIES: int = 5  # Retries for rate limits and server errors
     VECTOR_DB_DISTANCE_METHOD: str = "cosine"
 
+    EMBEDDING_CACHE_ENABLED: bool = False
+    EMBEDDING_CACHE_PATH: Path = Path("cache/embeddings.sqlite3")
+    EMBEDDING_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # 512MB on disk
+    EMBEDDING_CACHE_MEMORY_ITEMS: int = 10000  # Vectors kept in the in-memory LRU
+
+    QUERY_BATCH_MAX_SIZE: int = 32  # Concurrent questions embedded in one call
+    QUERY_BATCH_MAX_WAIT_MS: float = 5.0  # Time to wait for a batch to fill up
+    QUERY_CACHE_SIZE: int = 1024  # Question embeddings kept in the LRU cache
+
     MODEL_ID: str = ""
     GENERATOR_TYPE: str = ""
     GENERATOR_API_KEY: str = ""
@@ -23,14 +66,77 @@ class Settings(BaseSettings):
     MAX_OUTPUT_TOKENS: int = 1024
     TEMPERATURE: float = 0.7
 
+    CONTEXT_CANDIDATES: int = 8  # Chunks retrieved for packing into the prompt
+    CONTEXT_WINDOW_TOKENS: int = 0  # 0 looks up the window of MODEL_ID
+    CONTEXT_MAX_TOKENS: int = 3000  # Cap on chunk tokens per prompt; 0 for no cap
+
+    ANSWER_CACHE_ENABLED: bool = False
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = 0.95  # Min cosine similarity for a hit
+    ANSWER_CACHE_TTL_SECONDS: float = 3600
+    ANSWER_CACHE_MAX_ENTRIES: int = 256  # Cached answers per experiment
+
     UPLOAD_DIR: Path = Path("uploads")
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
     ALLOWED_FILE_TYPES: List[str] = ["application/pdf"]
     PDF_STORING_PATH: Path = Path("pdf_store")
 
+    BLOCKING_EXECUTOR_WORKERS: int = 8  # Threads for blocking model/DB calls
+
+    INGESTION_WORKERS: int = 2  # Concurrent background ingestion jobs
+    INGESTION_JOBS_DB: Path = Path("jobs/ingestion_jobs.sqlite3")
+    DOCUMENT_REGISTRY_DB: Path = Path("jobs/documents.sqlite3")  # Document fingerprints
+    INGESTION_BATCH_SIZE: int = 64  # Chunks per embedding / insert batch
+    INGESTION_MAX_BUFFERED_BATCHES: int = 4  # Batches held between pipeline stages
+
+    PARSE_WORKERS: int = 0  # Processes used to parse PDFs; 0 uses one per CPU
+    PARSE_PAGES_PER_TASK: int = 8  # Min pages per parsing task; 0 parses in a thread
+    IMPORT_DIR: Path = Path("imports")  # Root for server-side directory/zip imports
+    MAX_BATCH_FILES: int = 500  # Files accepted by one batch upload or import
+
+    CONFIG_RELOAD_INTERVAL: float = 5.0  # Seconds between .env checks; 0 disables
+
+    LAZY_STARTUP: bool = False  # Serve (health) requests while components warm up
+    STARTUP_IMPORT_BUDGET: float = 2.0  # Seconds; slower module imports are logged
+
+    METRICS_ENABLED: bool = False  # Collect stage timings and serve /metrics
+
+    # Offline EMBEDDER_TYPE / GENERATOR_TYPE "FAKE", used by the benchmarks
+    FAKE_EMBEDDER_DIMENSION: int = 384
+    FAKE_EMBEDDER_LATENCY_MS: float = 0.0  # Simulated latency per embedding request
+    FAKE_GENERATOR_FIRST_TOKEN_MS: float = 0.0  # Simulated time to first token
+    FAKE_GENERATOR_TOKEN_MS: float = 0.0  # Simulated time per generated token
+
     class Config:
         env_file: str = ".env"
 
 
-def get_settings():
-    return Settings()
+_settings: Optional[Settings] = None
+_settings_mtime: Optional[float] = None
+
+
+def _env_file_mtime() -> Optional[float]:
+    try:
+        return os.stat(Settings.Config.env_file).st_mtime
+    except OSError:
+        return None
+
+
+def get_settings() -> Settings:
+    """Return the shared settings, reading the environment and `.env` once."""
+    if _settings is None:
+        return reload_settings()
+    return _settings
+
+
+def reload_settings() -> Settings:
+    """Re-read the environment and `.env` into a new shared `Settings`."""
+    global _settings, _settings_mtime
+    # Taken before reading, so a write during the read is seen as a change
+    _settings_mtime = _env_file_mtime()
+    _settings = Settings()
+    return _settings
+
+
+def settings_file_changed() -> bool:
+    """Whether `.env` was modified, created or removed since the last read."""
+    return _env_file_mtime() != _settings_mtime
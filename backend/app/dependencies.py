@@ -0,0 +1,425 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Depends, HTTPException, Request
+
+from app.config import Settings, reload_settings
+from app.processors.embedders import (
+    EmbedderFactory,
+    EmbedderType,
+    EmbeddingBase,
+    QueryEmbeddingBatcher,
+)
+from app.processors.file_manager import FileHandler, FileProcessor
+from app.processors.generators import (
+    ContextBuilder,
+    GeneratorType,
+    SemanticAnswerCache,
+    TextGeneratorFactory,
+)
+from app.processors.ingestion import (
+    DocumentRegistry,
+    IngestionJobStore,
+    IngestionPipeline,
+    IngestionQueue,
+)
+from app.processors.retrieval import BM25Index, CrossEncoderReranker, Retriever
+from app.processors.vectordb import BaseVectorDB, VectorDBFactory
+from app.utils.executors import run_blocking
+from app.utils.metrics import configure_metrics
+
+# Settings each hot-reloadable component is built from; the component is
+# rebuilt when one of them changes
+RELOADABLE_COMPONENTS: Dict[str, set] = {
+    "file_handler": {"UPLOAD_DIR", "MAX_FILE_SIZE", "ALLOWED_FILE_TYPES", "IMPORT_DIR"},
+    "generator": {
+        "GENERATOR_TYPE",
+        "GENERATOR_API_KEY",
+        "MODEL_ID",
+        "FAKE_GENERATOR_FIRST_TOKEN_MS",
+        "FAKE_GENERATOR_TOKEN_MS",
+    },
+    "context_builder": {
+        "MODEL_ID",
+        "MAX_OUTPUT_TOKENS",
+        "CONTEXT_WINDOW_TOKENS",
+        "CONTEXT_MAX_TOKENS",
+    },
+}
+
+# Settings applied without rebuilding a component
+PER_REQUEST_SETTINGS = {
+    "MAX_OUTPUT_TOKENS",
+    "TEMPERATURE",
+    "CONTEXT_CANDIDATES",
+    "MAX_BATCH_FILES",
+    "CONFIG_RELOAD_INTERVAL",
+    "METRICS_ENABLED",
+}
+
+
+class ComponentRegistry:
+    """
+    Holds the single instance of every application component.
+
+    Components are built on first access and then reused by every request,
+    so endpoints never construct handlers, clients or models themselves. They
+    are served to endpoints through the `Depends` providers below.
+
+    `reload()` re-reads the settings and rebuilds the components listed in
+    `RELOADABLE_COMPONENTS` whose settings changed. Other components (the
+    embedder, vector DB, indexes and ingestion workers) hold on-disk state or
+    loaded models and only pick up changes on restart.
+
+    `start()` builds everything up front and reports the time each component
+    took in `build_seconds`; `ready` is set once the ingestion workers run.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._components: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self.ready = False
+        self.startup_error: Optional[str] = None
+        self.import_seconds: Optional[float] = None
+        self.startup_seconds: Optional[float] = None
+        self.build_seconds: Dict[str, float] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def _get(self, name: str, create: Callable[[], Any]) -> Any:
+        component = self._components.get(name)
+        if component is None:
+            with self._lock:
+                component = self._components.get(name)
+                if component is None:
+                    started = time.perf_counter()
+                    component = create()
+                    # Includes the components it depends on built in the meantime
+                    self.build_seconds[name] = time.perf_counter() - started
+                    self._components[name] = component
+        return component
+
+    @property
+    def embedder(self) -> EmbeddingBase:
+        return self._get("embedder", self._create_embedder)
+
+    @property
+    def query_embedder(self) -> QueryEmbeddingBatcher:
+        return self._get(
+            "query_embedder",
+            lambda: QueryEmbeddingBatcher(
+                embedder=self.embedder,
+                max_batch_size=self.settings.QUERY_BATCH_MAX_SIZE,
+                max_wait_ms=self.settings.QUERY_BATCH_MAX_WAIT_MS,
+                cache_size=self.settings.QUERY_CACHE_SIZE,
+            ),
+        )
+
+    @property
+    def vector_db(self) -> BaseVectorDB:
+        return self._get("vector_db", self._create_vector_db)
+
+    @property
+    def lexical_index(self) -> Optional[BM25Index]:
+        if not self.settings.HYBRID_SEARCH_ENABLED:
+            return None
+        return self._get(
+            "lexical_index",
+            lambda: BM25Index(index_path=self.settings.LEXICAL_INDEX_PATH),
+        )
+
+    @property
+    def retriever(self) -> Retriever:
+        return self._get("retriever", self._create_retriever)
+
+    @property
+    def generator(self):
+        return self._get("generator", self._create_generator)
+
+    @property
+    def context_builder(self) -> ContextBuilder:
+        return self._get(
+            "context_builder",
+            lambda: ContextBuilder(
+                model_id=self.settings.MODEL_ID,
+                max_output_tokens=self.settings.MAX_OUTPUT_TOKENS,
+                context_window=self.settings.CONTEXT_WINDOW_TOKENS,
+                max_context_tokens=self.settings.CONTEXT_MAX_TOKENS,
+            ),
+        )
+
+    @property
+    def answer_cache(self) -> Optional[SemanticAnswerCache]:
+        if not self.settings.ANSWER_CACHE_ENABLED:
+            return None
+        return self._get(
+            "answer_cache",
+            lambda: SemanticAnswerCache(
+                similarity_threshold=self.settings.ANSWER_CACHE_SIMILARITY_THRESHOLD,
+                ttl_seconds=self.settings.ANSWER_CACHE_TTL_SECONDS,
+                max_entries=self.settings.ANSWER_CACHE_MAX_ENTRIES,
+            ),
+        )
+
+    @property
+    def file_handler(self) -> FileHandler:
+        return self._get("file_handler", lambda: FileHandler(settings=self.settings))
+
+    @property
+    def file_processor(self) -> FileProcessor:
+        return self._get(
+            "file_processor",
+            lambda: FileProcessor(
+                pages_per_task=self.settings.PARSE_PAGES_PER_TASK,
+                max_parallel_tasks=self.settings.PARSE_WORKERS,
+            ),
+        )
+
+    @property
+    def ingestion_queue(self) -> IngestionQueue:
+        return self._get("ingestion_queue", self._create_ingestion_queue)
+
+    def _create_embedder(self) -> EmbeddingBase:
+        settings = self.settings
+        embedder = EmbedderFactory.create_embedder(
+            embedder_type=settings.EMBEDDER_TYPE,
+            api_key=settings.EMBEDDER_API_KEY,
+            model_id=settings.EMBEDDER_MODEL_ID,
+            api_url=settings.EMBEDDER_API_URL or None,
+            batch_size=settings.EMBEDDER_BATCH_SIZE or None,
+            max_concurrency=settings.EMBEDDER_MAX_CONCURRENCY,
+            max_retries=settings.EMBEDDER_MAX_RETRIES,
+            cache_path=(
+                settings.EMBEDDING_CACHE_PATH
+                if settings.EMBEDDING_CACHE_ENABLED
+                else None
+            ),
+            cache_max_bytes=settings.EMBEDDING_CACHE_MAX_BYTES,
+            cache_memory_items=settings.EMBEDDING_CACHE_MEMORY_ITEMS,
+            **(
+                {
+                    "dimension": settings.FAKE_EMBEDDER_DIMENSION,
+                    "latency_ms": settings.FAKE_EMBEDDER_LATENCY_MS,
+                }
+                if settings.EMBEDDER_TYPE == EmbedderType.FAKE.value
+                else {}
+            ),
+        )
+        self.logger.info("Embedder initialized successfully.")
+        return embedder
+
+    def _create_generator(self):
+        settings = self.settings
+        return TextGeneratorFactory.create_generator(
+            generator_type=settings.GENERATOR_TYPE,
+            api_key=settings.GENERATOR_API_KEY,
+            model_id=settings.MODEL_ID,
+            **(
+                {
+                    "first_token_latency_ms": settings.FAKE_GENERATOR_FIRST_TOKEN_MS,
+                    "token_latency_ms": settings.FAKE_GENERATOR_TOKEN_MS,
+                }
+                if settings.GENERATOR_TYPE == GeneratorType.FAKE.value
+                else {}
+            ),
+        )
+
+    def _create_vector_db(self) -> BaseVectorDB:
+        settings = self.settings
+        vector_db = VectorDBFactory.create(
+            vector_db_type=settings.VECTOR_DB_TYPE,
+            db_path=settings.VECTOR_DB_PATH,
+            qdrant_url=settings.QDRANT_URL,
+            qdrant_api_key=settings.QDRANT_API_KEY,
+            faiss_index_type=settings.FAISS_INDEX_TYPE,
+            faiss_nlist=settings.FAISS_NLIST,
+            faiss_nprobe=settings.FAISS_NPROBE,
+            faiss_pq_m=settings.FAISS_PQ_M,
+            faiss_hnsw_m=settings.FAISS_HNSW_M,
+            faiss_hnsw_ef_search=settings.FAISS_HNSW_EF_SEARCH,
+            quantization=settings.VECTOR_QUANTIZATION,
+            quantization_oversampling=settings.QUANTIZATION_OVERSAMPLING,
+            projection=settings.EMBEDDING_PROJECTION,
+            projection_dimension=settings.EMBEDDING_PROJECTION_DIMENSION,
+            projection_fit_samples=settings.EMBEDDING_PROJECTION_FIT_SAMPLES,
+        )
+        vector_db.connect()
+        self.logger.info("Vector database connected successfully.")
+        return vector_db
+
+    def _create_retriever(self) -> Retriever:
+        settings = self.settings
+        return Retriever(
+            vector_db=self.vector_db,
+            lexical_index=self.lexical_index,
+            candidates=settings.HYBRID_CANDIDATES,
+            rrf_k=settings.RRF_K,
+            reranker=(
+                CrossEncoderReranker(
+                    model_name=settings.RERANK_MODEL,
+                    batch_size=settings.RERANK_BATCH_SIZE,
+                    cache_size=settings.RERANK_CACHE_SIZE,
+                )
+                if settings.RERANK_ENABLED
+                else None
+            ),
+            rerank_candidates=settings.RERANK_CANDIDATES,
+        )
+
+    def _create_ingestion_queue(self) -> IngestionQueue:
+        settings = self.settings
+        answer_cache = self.answer_cache
+        return IngestionQueue(
+            store=IngestionJobStore(db_path=settings.INGESTION_JOBS_DB),
+            pipeline=IngestionPipeline(
+                embedder=self.embedder,
+                vector_db=self.vector_db,
+                file_processor=self.file_processor,
+                distance_method=settings.VECTOR_DB_DISTANCE_METHOD,
+                batch_size=settings.INGESTION_BATCH_SIZE,
+                max_buffered_batches=settings.INGESTION_MAX_BUFFERED_BATCHES,
+                on_indexed=answer_cache.invalidate if answer_cache else None,
+                lexical_index=self.lexical_index,
+                parse_concurrency=settings.PARSE_WORKERS,
+                document_registry=DocumentRegistry(
+                    db_path=settings.DOCUMENT_REGISTRY_DB
+                ),
+            ),
+            num_workers=settings.INGESTION_WORKERS,
+        )
+
+    def reload(self) -> Settings:
+        """Re-read the settings and rebuild the components they affect."""
+        settings = reload_settings()
+        old, new = self.settings.model_dump(), settings.model_dump()
+        changed = {name for name in new if old.get(name) != new[name]}
+        if not changed:
+            return settings
+
+        configure_metrics(settings.METRICS_ENABLED)
+        with self._lock:
+            self.settings = settings
+            for name, fields in RELOADABLE_COMPONENTS.items():
+                if changed & fields:
+                    # Rebuilt on next access; requests in flight keep the old one
+                    self._components.pop(name, None)
+
+        reloadable = set().union(*RELOADABLE_COMPONENTS.values())
+        pending = sorted(changed - reloadable - PER_REQUEST_SETTINGS)
+        self.logger.info(f"Settings reloaded; changed: {', '.join(sorted(changed))}")
+        if pending:
+            self.logger.warning(
+                f"Changes to {', '.join(pending)} take effect after a restart."
+            )
+        return settings
+
+    def _build(self):
+        for name in (
+            "query_embedder",
+            "retriever",
+            "generator",
+            "context_builder",
+            "file_handler",
+            "ingestion_queue",
+        ):
+            getattr(self, name)
+
+        # Local models initialize lazily on their first batch; run it now
+        # rather than on the first user request
+        if self.settings.EMBEDDER_TYPE == EmbedderType.SENTENCE_TRANSFORMER.value:
+            started = time.perf_counter()
+            self.embedder.embed_text(["warm-up"])
+            self.build_seconds["embedder_warm_up"] = time.perf_counter() - started
+
+    async def start(self):
+        """Build and warm up the components, then start the ingestion workers."""
+        started = time.perf_counter()
+        try:
+            await run_blocking(self._build)
+            await self.ingestion_queue.start()
+        except Exception as e:
+            self.startup_error = str(e)
+            raise
+        self.startup_seconds = time.perf_counter() - started
+        self.ready = True
+        self.logger.info(
+            f"Components ready in {self.startup_seconds:.2f}s: "
+            + ", ".join(
+                f"{name} {seconds:.2f}s" for name, seconds in self.build_seconds.items()
+            )
+        )
+
+    async def close(self):
+        """Stop the ingestion workers and close on-disk stores."""
+        ingestion_queue = self._components.pop("ingestion_queue", None)
+        if ingestion_queue is not None:
+            await ingestion_queue.stop()
+            ingestion_queue.store.close()
+            ingestion_queue.pipeline.document_registry.close()
+            self.logger.info("Ingestion queue stopped successfully.")
+        vector_db = self._components.pop("vector_db", None)
+        if vector_db is not None:
+            vector_db.disconnect()
+            self.logger.info("Vector database disconnected successfully.")
+        lexical_index = self._components.pop("lexical_index", None)
+        if lexical_index is not None:
+            lexical_index.close()
+        self._components.clear()
+
+
+def get_registry(request: Request) -> ComponentRegistry:
+    return request.app.state.registry
+
+
+def get_app_settings(
+    registry: ComponentRegistry = Depends(get_registry),
+) -> Settings:
+    return registry.settings
+
+
+def get_file_handler(
+    registry: ComponentRegistry = Depends(get_registry),
+) -> FileHandler:
+    return registry.file_handler
+
+
+def get_ingestion_queue(
+    registry: ComponentRegistry = Depends(get_registry),
+) -> IngestionQueue:
+    # Jobs are only accepted once the workers run; they resume stored jobs
+    # on start and would queue those submitted before a second time
+    if not registry.ready:
+        raise HTTPException(
+            status_code=503,
+            detail="Ingestion is not available until startup completes.",
+            headers={"Retry-After": "5"},
+        )
+    return registry.ingestion_queue
+
+
+def get_query_embedder(
+    registry: ComponentRegistry = Depends(get_registry),
+) -> QueryEmbeddingBatcher:
+    return registry.query_embedder
+
+
+def get_retriever(registry: ComponentRegistry = Depends(get_registry)) -> Retriever:
+    return registry.retriever
+
+
+def get_generator(registry: ComponentRegistry = Depends(get_registry)):
+    return registry.generator
+
+
+def get_context_builder(
+    registry: ComponentRegistry = Depends(get_registry),
+) -> ContextBuilder:
+    return registry.context_builder
+
+
+def get_answer_cache(
+    registry: ComponentRegistry = Depends(get_registry),
+) -> Optional[SemanticAnswerCache]:
+    return registry.answer_cache
@@ -1,5 +1,6 @@
 # embedders/__init__.py
-from .base import EmbeddingBase
+from .base import EmbeddingBase, Embeddings, to_float32_matrix
+from .cached_embedder import CachedEmbedder, EmbeddingCacheStore
 from .config import EmbedderConfig
 from .exceptions import (
     ClientNotInitializedException,
@@ -8,9 +9,14 @@ from .exceptions import (
     ModelNotSetException,
 )
 from .factory import EmbedderFactory, EmbedderType
+from .query_batcher import QueryEmbeddingBatcher
 
 __all__ = [
     "EmbeddingBase",
+    "Embeddings",
+    "to_float32_matrix",
+    "CachedEmbedder",
+    "EmbeddingCacheStore",
     "EmbedderFactory",
     "EmbedderType",
     "EmbedderConfig",
@@ -18,4 +24,5 @@ __all__ = [
     "ClientNotInitializedException",
     "ModelNotSetException",
     "EmbeddingException",
+    "QueryEmbeddingBatcher",
 ]
@@ -3,6 +3,23 @@ from typing import List, Optional, Union
 
 import numpy as np
 
+from app.utils.executors import run_blocking
+
+Embeddings = Union[List[List[float]], np.ndarray]
+
+
+def to_float32_matrix(embeddings) -> np.ndarray:
+    """
+    Return `embeddings` as a C-contiguous (n, dim) float32 matrix.
+
+    Arrays that already are one are returned as is; lists of vectors or of
+    1-D arrays are converted in a single pass.
+    """
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1) if matrix.size else matrix.reshape(0, 0)
+    return np.ascontiguousarray(matrix)
+
 
 class EmbeddingBase(ABC):
     """Base abstract class for embedders."""
@@ -15,14 +32,32 @@ class EmbeddingBase(ABC):
         pass
 
     @abstractmethod
-    def embed_text(self, chunks: List[str]) -> List[List[float]]:
+    def embed_text(self, chunks: List[str], as_array: bool = False) -> Embeddings:
         """
         Embed the given text chunks into vectors.
 
         Args:
             chunks: List of text strings to embed
+            as_array: Return a contiguous (n, dim) float32 numpy array instead
+                of lists, avoiding a Python float object per dimension
 
         Returns:
-            List of embedding vectors or numpy array
+            List of embedding vectors, or a numpy array with `as_array`
         """
         pass
+
+    async def aembed_text(
+        self, chunks: List[str], as_array: bool = False
+    ) -> Embeddings:
+        """
+        Asynchronous counterpart of `embed_text`.
+
+        Runs `embed_text` in the shared bounded executor; embedders backed by
+        a native async client override this.
+        """
+        return await run_blocking(self.embed_text, chunks, as_array)
+
+    @staticmethod
+    def _output(embeddings, as_array: bool) -> Embeddings:
+        matrix = to_float32_matrix(embeddings)
+        return matrix if as_array else matrix.tolist()
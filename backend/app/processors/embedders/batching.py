@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+import httpx
+import numpy as np
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff policy for provider calls."""
+
+    max_retries: int = 5
+    initial_backoff: float = 0.5
+    max_backoff: float = 30.0
+    retryable_exceptions: Tuple[Type[BaseException], ...] = (
+        httpx.TransportError,
+        ConnectionError,
+        TimeoutError,
+    )
+
+    def is_retryable(self, error: BaseException) -> bool:
+        status_code = _status_code(error)
+        if status_code is not None:
+            return status_code in RETRYABLE_STATUS_CODES
+        return isinstance(error, self.retryable_exceptions)
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        """Seconds to wait before retry `attempt`, honouring Retry-After."""
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        delay = min(self.initial_backoff * (2**attempt), self.max_backoff)
+        return delay * random.uniform(0.5, 1.0)
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(error, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def join_batches(results: List[Any]) -> Any:
+    """
+    Join per-batch results in order: matrices returned by the batch function
+    are concatenated into one array, anything else is flattened into a list.
+    """
+    if results and all(isinstance(result, np.ndarray) for result in results):
+        return np.concatenate(results)
+    return [vector for result in results for vector in result]
+
+
+def split_batches(chunks: Sequence[str], batch_size: int) -> List[Sequence[str]]:
+    """Split `chunks` into consecutive batches of at most `batch_size` items."""
+    return [chunks[i : i + batch_size] for i in range(0, len(chunks), batch_size)]
+
+
+def call_with_retries(
+    func: Callable[[Sequence[str]], Any], batch: Sequence[str], policy: RetryPolicy
+) -> Any:
+    attempt = 0
+    while True:
+        try:
+            return func(batch)
+        except Exception as e:
+            if attempt >= policy.max_retries or not policy.is_retryable(e):
+                raise
+            delay = policy.backoff(attempt, e)
+            logger.warning(f"Retrying embedding batch in {delay:.2f}s: {e}")
+            time.sleep(delay)
+            attempt += 1
+
+
+async def acall_with_retries(
+    func: Callable[[Sequence[str]], Awaitable[Any]],
+    batch: Sequence[str],
+    policy: RetryPolicy,
+) -> Any:
+    attempt = 0
+    while True:
+        try:
+            return await func(batch)
+        except Exception as e:
+            if attempt >= policy.max_retries or not policy.is_retryable(e):
+                raise
+            delay = policy.backoff(attempt, e)
+            logger.warning(f"Retrying embedding batch in {delay:.2f}s: {e}")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+def run_batches(
+    func: Callable[[Sequence[str]], Any],
+    chunks: Sequence[str],
+    batch_size: int,
+    max_concurrency: int,
+    policy: RetryPolicy,
+) -> Union[List[List[float]], np.ndarray]:
+    """
+    Embed `chunks` in provider-sized batches on up to `max_concurrency`
+    threads, retrying transient failures, and return vectors in input order
+    (one matrix when `func` returns numpy arrays, see `join_batches`).
+    """
+    batches = split_batches(chunks, batch_size)
+    if len(batches) <= 1 or max_concurrency <= 1:
+        results = [call_with_retries(func, batch, policy) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(batches))) as pool:
+            results = list(
+                pool.map(lambda batch: call_with_retries(func, batch, policy), batches)
+            )
+    return join_batches(results)
+
+
+async def arun_batches(
+    func: Callable[[Sequence[str]], Awaitable[Any]],
+    chunks: Sequence[str],
+    batch_size: int,
+    max_concurrency: int,
+    policy: RetryPolicy,
+) -> Union[List[List[float]], np.ndarray]:
+    """Async counterpart of `run_batches` with at most `max_concurrency` in flight."""
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(batch: Sequence[str]):
+        async with semaphore:
+            return await acall_with_retries(func, batch, policy)
+
+    results = await asyncio.gather(
+        *(run(batch) for batch in split_batches(chunks, batch_size))
+    )
+    return join_batches(results)
@@ -0,0 +1,245 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from app.utils.executors import run_blocking
+from app.utils.metrics import CACHE_REQUESTS
+
+from .base import EmbeddingBase, Embeddings, to_float32_matrix
+
+# Stay well below SQLite's bound-parameter limit
+_MAX_PARAMS = 500
+
+
+class EmbeddingCacheStore:
+    """
+    On-disk embedding store backed by SQLite.
+
+    Vectors are stored as float32 blobs keyed by a content hash. When the total
+    size of stored vectors exceeds `max_bytes`, the least recently used entries
+    are evicted.
+    """
+
+    def __init__(self, db_path: Path, max_bytes: int = 512 * 1024 * 1024):
+        self.base_dir = Path(__file__).parent.parent.parent
+        self.db_path = self.base_dir / db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access "
+            "ON embeddings (last_access)"
+        )
+        self._conn.commit()
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM embeddings"
+        ).fetchone()[0]
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        if not keys:
+            return {}
+
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), _MAX_PARAMS):
+                batch = keys[i : i + _MAX_PARAMS]
+                placeholders = ", ".join("?" for _ in batch)
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                found.update(
+                    (key, np.frombuffer(blob, dtype=np.float32)) for key, blob in rows
+                )
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        if not items:
+            return
+
+        now = time.time()
+        rows = [
+            (key, vector.astype(np.float32).tobytes(), vector.size * 4, now)
+            for key, vector in items.items()
+        ]
+        with self._lock:
+            replaced = 0
+            for i in range(0, len(rows), _MAX_PARAMS):
+                batch = [row[0] for row in rows[i : i + _MAX_PARAMS]]
+                placeholders = ", ".join("?" for _ in batch)
+                replaced += self._conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM embeddings "
+                    f"WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchone()[0]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, size, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._total_bytes += sum(row[2] for row in rows) - replaced
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the store fits `max_bytes`."""
+        target = int(self.max_bytes * 0.9)
+        cursor = self._conn.execute(
+            "SELECT key, size FROM embeddings ORDER BY last_access"
+        )
+        evicted = []
+        for key, size in cursor:
+            if self._total_bytes <= target:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM embeddings WHERE key = ?", evicted)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbedder(EmbeddingBase):
+    """
+    Content-addressed cache in front of another embedder.
+
+    Embeddings are keyed by (embedder, model id, SHA-256 of the text) and looked
+    up in an in-memory LRU first, then in the on-disk store. Only texts missing
+    from both are sent to the wrapped embedder.
+    """
+
+    def __init__(
+        self,
+        embedder: EmbeddingBase,
+        store: EmbeddingCacheStore,
+        memory_items: int = 10000,
+        **kwargs,
+    ):
+        self.embedder = embedder
+        self.config = embedder.config
+        self.store = store
+        self.memory_items = memory_items
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._namespace = (
+            f"{type(embedder).__name__}:{embedder.config.embedding_model_id}"
+        )
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger(__name__)
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache hit/miss counters since startup."""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_items": len(self._memory),
+        }
+
+    def _key(self, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self._namespace}:{digest}"
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Resolve keys from memory, then from disk; returns the hits."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+            self.memory_hits += len(found)
+
+        on_disk = self.store.get_many([key for key in keys if key not in found])
+        with self._lock:
+            self.disk_hits += len(on_disk)
+            for key, vector in on_disk.items():
+                self._remember(key, vector)
+        CACHE_REQUESTS.inc(len(found) + len(on_disk), cache="embedding", result="hit")
+        found.update(on_disk)
+        return found
+
+    def _store(self, keys: List[str], embeddings) -> Dict[str, np.ndarray]:
+        vectors = to_float32_matrix(embeddings)
+        computed = {key: vectors[i] for i, key in enumerate(keys)}
+        with self._lock:
+            self.misses += len(keys)
+            for key, vector in computed.items():
+                self._remember(key, vector)
+        CACHE_REQUESTS.inc(len(keys), cache="embedding", result="miss")
+        self.store.put_many(computed)
+        return computed
+
+    def _split(self, chunks: List[str]):
+        keys = [self._key(chunk) for chunk in chunks]
+        return keys, dict(zip(keys, chunks))
+
+    @staticmethod
+    def _gather(keys: List[str], vectors: Dict[str, np.ndarray], as_array: bool):
+        # Stack the cached rows once instead of converting each to a list
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32) if as_array else []
+        matrix = np.stack([vectors[key] for key in keys])
+        return matrix if as_array else matrix.tolist()
+
+    def embed_text(self, chunks: List[str], as_array: bool = False) -> Embeddings:
+        keys, texts = self._split(chunks)
+        vectors = self._lookup(list(texts))
+        missing = [key for key in texts if key not in vectors]
+        if missing:
+            embeddings = self.embedder.embed_text(
+                [texts[key] for key in missing], as_array=True
+            )
+            vectors.update(self._store(missing, embeddings))
+        return self._gather(keys, vectors, as_array)
+
+    async def aembed_text(
+        self, chunks: List[str], as_array: bool = False
+    ) -> Embeddings:
+        keys, texts = self._split(chunks)
+        vectors = await run_blocking(self._lookup, list(texts))
+        missing = [key for key in texts if key not in vectors]
+        if missing:
+            embeddings = await self.embedder.aembed_text(
+                [texts[key] for key in missing], as_array=True
+            )
+            vectors.update(await run_blocking(self._store, missing, embeddings))
+        return self._gather(keys, vectors, as_array)
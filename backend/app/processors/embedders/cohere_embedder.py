@@ -1,5 +1,5 @@
 import logging
-from typing import List, Optional, Union
+from typing import List, Optional, Sequence
 
 try:
     import cohere
@@ -7,7 +7,8 @@ except ImportError:
     raise ImportError("Please install the cohere package")
 import numpy as np
 
-from .base import EmbeddingBase
+from .base import EmbeddingBase, Embeddings
+from .batching import RetryPolicy, arun_batches, run_batches
 from .config import EmbedderConfig
 from .exceptions import ClientNotInitializedException, EmbeddingException
 
@@ -15,41 +16,114 @@ from .exceptions import ClientNotInitializedException, EmbeddingException
 class CohereEmbedder(EmbeddingBase):
     """Cohere implementation of embedder."""
 
+    # Cohere's embed endpoint accepts at most 96 texts per call
+    DEFAULT_BATCH_SIZE = 96
+
     def __init__(
-        self, api_key: str, embedding_model_id: str = "embed-english-v3.0", **kwargs
+        self,
+        api_key: str,
+        embedding_model_id: str = "embed-english-v3.0",
+        api_url: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_concurrency: int = 4,
+        max_retries: int = 5,
+        **kwargs,
     ):
         self.config = EmbedderConfig(
-            api_key=api_key, embedding_model_id=embedding_model_id, extra_params=kwargs
+            api_key=api_key,
+            embedding_model_id=embedding_model_id,
+            extra_params=kwargs,
+            api_url=api_url,
+            batch_size=min(
+                batch_size or self.DEFAULT_BATCH_SIZE, self.DEFAULT_BATCH_SIZE
+            ),
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
         )
+        self.retry_policy = RetryPolicy(max_retries=max_retries)
 
         self.client = None
+        self.async_client = None
         self.logger = logging.getLogger(__name__)
         self.connect()
 
     def connect(self):
         """Initialize the Cohere client."""
         try:
-            self.client = cohere.Client(api_key=self.config.api_key)
+            # Retries are handled per batch by the embedder's RetryPolicy
+            self.client = cohere.Client(
+                api_key=self.config.api_key,
+                base_url=self.config.api_url or None,
+                max_retries=0,
+            )
+            self.async_client = cohere.AsyncClient(
+                api_key=self.config.api_key,
+                base_url=self.config.api_url or None,
+                max_retries=0,
+            )
         except Exception as e:
             self.logger.error(f"Failed to initialize Cohere client: {str(e)}")
             raise ClientNotInitializedException(
                 f"Failed to initialize Cohere client: {str(e)}"
             )
 
-    def embed_text(self, chunks: List[str]) -> List[List[float]]:
+    def _embed_kwargs(self, batch: Sequence[str]) -> dict:
+        return dict(
+            model=self.config.embedding_model_id,
+            texts=list(batch),
+            input_type="classification",
+            embedding_types=["float"],
+        )
+
+    def _float_embeddings(self, response) -> np.ndarray:
+        embeddings = response.embeddings
+        # Newer SDKs expose the "float" embeddings as `float_`
+        vectors = getattr(embeddings, "float_", None) or embeddings.float
+        return np.asarray(vectors, dtype=np.float32)
+
+    def _embed_batch(self, batch: Sequence[str]) -> np.ndarray:
+        response = self.client.embed(**self._embed_kwargs(batch))
+        return self._float_embeddings(response)
+
+    async def _aembed_batch(self, batch: Sequence[str]) -> np.ndarray:
+        response = await self.async_client.embed(**self._embed_kwargs(batch))
+        return self._float_embeddings(response)
+
+    def embed_text(self, chunks: List[str], as_array: bool = False) -> Embeddings:
         """Generate embeddings for the given text chunks."""
         if not self.client:
             raise ClientNotInitializedException("Cohere client is not connected")
 
         try:
-            response = self.client.embed(
-                model=self.config.embedding_model_id,
-                texts=chunks,
-                input_type="classification",
-                embedding_types=["float"],
+            embeddings = run_batches(
+                self._embed_batch,
+                chunks,
+                batch_size=self.config.batch_size,
+                max_concurrency=self.config.max_concurrency,
+                policy=self.retry_policy,
             )
+            return self._output(embeddings, as_array)
 
-            return np.array(response.embeddings.float).tolist()
+        except Exception as e:
+            self.logger.error(f"Error generating embeddings with Cohere: {str(e)}")
+            raise EmbeddingException(f"Failed to generate embeddings: {str(e)}")
+
+    async def aembed_text(
+        self, chunks: List[str], as_array: bool = False
+    ) -> Embeddings:
+        """Generate embeddings for the given text chunks using the async client."""
+        if not self.async_client:
+            raise ClientNotInitializedException("Cohere client is not connected")
+
+        try:
+            embeddings = await arun_batches(
+                self._aembed_batch,
+                chunks,
+                batch_size=self.config.batch_size,
+                max_concurrency=self.config.max_concurrency,
+                policy=self.retry_policy,
+            )
+            return self._output(embeddings, as_array)
 
         except Exception as e:
             self.logger.error(f"Error generating embeddings with Cohere: {str(e)}")
@@ -9,3 +9,7 @@ class EmbedderConfig:
     embedding_model_id: str
     api_key: Optional[str] = None
     extra_params: Dict[str, Any] = None
+    api_url: Optional[str] = None
+    batch_size: int = 96  # Texts per provider request
+    max_concurrency: int = 4  # Provider requests in flight per call
+    max_retries: int = 5  # Retries for 429/5xx and connection errors
@@ -8,6 +8,7 @@ class EmbedderType(Enum):
     COHERE = "COHERE"
     OPENAI = "OPENAI"
     SENTENCE_TRANSFORMER = "SENTENCE_TRANSFORMER"
+    FAKE = "FAKE"
 
 
 class EmbedderFactory:
@@ -17,6 +18,7 @@ class EmbedderFactory:
         EmbedderType.COHERE.value: "embed-english-v3.0",
         EmbedderType.OPENAI.value: "text-embedding-3-small",
         EmbedderType.SENTENCE_TRANSFORMER.value: "all-MiniLM-L6-v2",
+        EmbedderType.FAKE.value: "fake",
     }
 
     @staticmethod
@@ -24,9 +26,17 @@ class EmbedderFactory:
         embedder_type: EmbedderType,
         api_key: Optional[str] = None,
         model_id: Optional[str] = None,
+        cache_path: Optional[str] = None,
+        cache_max_bytes: int = 512 * 1024 * 1024,
+        cache_memory_items: int = 10000,
         **kwargs,
     ) -> EmbeddingBase:
-        """Create an embedder instance based on the specified type."""
+        """
+        Create an embedder instance based on the specified type.
+
+        When `cache_path` is given, the embedder is wrapped in a `CachedEmbedder`
+        backed by an on-disk store at that path.
+        """
 
         if embedder_type == EmbedderType.COHERE.value:
             from .cohere_embedder import CohereEmbedder
@@ -40,6 +50,10 @@ class EmbedderFactory:
             from .sentence_transformer_embedder import SentenceTransformerEmbedder
 
             embedder_class = SentenceTransformerEmbedder
+        elif embedder_type == EmbedderType.FAKE.value:
+            from .fake_embedder import FakeEmbedder
+
+            embedder_class = FakeEmbedder
         else:
             raise ValueError(f"Unsupported embedder type: {embedder_type}")
 
@@ -47,12 +61,30 @@ class EmbedderFactory:
         if not model_id:
             model_id = EmbedderFactory.DEFAULT_MODELS[embedder_type]
 
-        # SentenceTransformer doesn't need an API key
-        if embedder_type == EmbedderType.SENTENCE_TRANSFORMER:
-            return embedder_class(embedding_model_id=model_id, **kwargs)
+        # SentenceTransformer and the offline fake don't need an API key
+        if embedder_type in (
+            EmbedderType.SENTENCE_TRANSFORMER.value,
+            EmbedderType.FAKE.value,
+        ):
+            embedder = embedder_class(embedding_model_id=model_id, **kwargs)
+        else:
+            # Other embedders need an API key
+            if not api_key:
+                raise ValueError(f"API key is required for {embedder_type}")
+
+            embedder = embedder_class(
+                api_key=api_key, embedding_model_id=model_id, **kwargs
+            )
+
+        if cache_path:
+            from .cached_embedder import CachedEmbedder, EmbeddingCacheStore
 
-        # Other embedders need an API key
-        if not api_key:
-            raise ValueError(f"API key is required for {embedder_type.value}")
+            return CachedEmbedder(
+                embedder=embedder,
+                store=EmbeddingCacheStore(
+                    db_path=cache_path, max_bytes=cache_max_bytes
+                ),
+                memory_items=cache_memory_items,
+            )
 
-        return embedder_class(api_key=api_key, embedding_model_id=model_id, **kwargs)
+        return embedder
@@ -0,0 +1,97 @@
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .base import EmbeddingBase, Embeddings
+from .batching import RetryPolicy, arun_batches, run_batches
+from .config import EmbedderConfig
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class FakeEmbedder(EmbeddingBase):
+    """
+    Deterministic offline embedder for benchmarks and evaluation.
+
+    Each text is embedded as a normalized hashed bag of words, so texts that
+    share words are close and retrieval behaves sensibly without a model.
+    Every batch waits `latency_ms` to simulate a provider round trip.
+    """
+
+    DEFAULT_BATCH_SIZE = 256
+
+    def __init__(
+        self,
+        embedding_model_id: str = "fake",
+        dimension: int = 384,
+        latency_ms: float = 0.0,
+        batch_size: Optional[int] = None,
+        max_concurrency: int = 4,
+        **kwargs,
+    ):
+        self.config = EmbedderConfig(
+            embedding_model_id=embedding_model_id,
+            extra_params=kwargs,
+            batch_size=batch_size or self.DEFAULT_BATCH_SIZE,
+            max_concurrency=max_concurrency,
+            max_retries=0,
+        )
+        self.dimension = dimension
+        self.latency = latency_ms / 1000
+        self.retry_policy = RetryPolicy(max_retries=0)
+        self.logger = logging.getLogger(__name__)
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for word in _WORD_PATTERN.findall(text.lower()):
+            digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            vector[value % self.dimension] += 1.0 if value >> 63 else -1.0
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            vector[0] = 1.0
+            return vector
+        return vector / norm
+
+    def _embed_batch(self, batch: Sequence[str]) -> np.ndarray:
+        if self.latency:
+            time.sleep(self.latency)
+        return np.stack([self._embed_one(text) for text in batch])
+
+    async def _aembed_batch(self, batch: Sequence[str]) -> np.ndarray:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return np.stack([self._embed_one(text) for text in batch])
+
+    def embed_text(self, chunks: List[str], as_array: bool = False) -> Embeddings:
+        """Embed the chunks in batches, waiting the simulated latency per batch."""
+        return self._output(
+            run_batches(
+                self._embed_batch,
+                chunks,
+                batch_size=self.config.batch_size,
+                max_concurrency=self.config.max_concurrency,
+                policy=self.retry_policy,
+            ),
+            as_array,
+        )
+
+    async def aembed_text(
+        self, chunks: List[str], as_array: bool = False
+    ) -> Embeddings:
+        """Async counterpart of `embed_text`; batches wait concurrently."""
+        return self._output(
+            await arun_batches(
+                self._aembed_batch,
+                chunks,
+                batch_size=self.config.batch_size,
+                max_concurrency=self.config.max_concurrency,
+                policy=self.retry_policy,
+            ),
+            as_array,
+        )
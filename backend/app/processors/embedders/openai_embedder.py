@@ -1,14 +1,16 @@
+import base64
 import logging
-from typing import List, Optional, Union
+from typing import List, Optional, Sequence
 
 import numpy as np
 
 try:
-    from openai import OpenAI
+    from openai import APIConnectionError, APITimeoutError, AsyncOpenAI, OpenAI
 except ImportError:
     raise ImportError("Please install the openai package")
 
-from .base import EmbeddingBase
+from .base import EmbeddingBase, Embeddings
+from .batching import RetryPolicy, arun_batches, run_batches
 from .config import EmbedderConfig
 from .exceptions import (
     ClientNotInitializedException,
@@ -20,39 +22,129 @@ from .exceptions import (
 class OpenAIEmbedder(EmbeddingBase):
     """OpenAI implementation of embedder."""
 
+    # OpenAI accepts up to 2048 inputs per request; smaller batches keep each
+    # request well under the per-request token limit.
+    DEFAULT_BATCH_SIZE = 256
+
     def __init__(
-        self, api_key: str, embedding_model_id: str = "text-embedding-3-small", **kwargs
+        self,
+        api_key: str,
+        embedding_model_id: str = "text-embedding-3-small",
+        api_url: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_concurrency: int = 4,
+        max_retries: int = 5,
+        **kwargs,
     ):
         self.config = EmbedderConfig(
-            api_key=api_key, embedding_model_id=embedding_model_id, extra_params=kwargs
+            api_key=api_key,
+            embedding_model_id=embedding_model_id,
+            extra_params=kwargs,
+            api_url=api_url,
+            batch_size=batch_size or self.DEFAULT_BATCH_SIZE,
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+        )
+        self.retry_policy = RetryPolicy(
+            max_retries=max_retries,
+            retryable_exceptions=RetryPolicy.retryable_exceptions
+            + (APIConnectionError, APITimeoutError),
         )
 
         self.client = None
+        self.async_client = None
         self.logger = logging.getLogger(__name__)
         self.connect()
 
     def connect(self):
         """Initialize the OpenAI client."""
         try:
-            self.client = OpenAI(api_key=self.config.api_key)
+            # Retries are handled per batch by the embedder's RetryPolicy
+            self.client = OpenAI(
+                api_key=self.config.api_key,
+                base_url=self.config.api_url or None,
+                max_retries=0,
+            )
+            self.async_client = AsyncOpenAI(
+                api_key=self.config.api_key,
+                base_url=self.config.api_url or None,
+                max_retries=0,
+            )
         except Exception as e:
             self.logger.error(f"Failed to initialize OpenAI client: {str(e)}")
             raise ClientNotInitializedException(
                 f"Failed to initialize OpenAI client: {str(e)}"
             )
 
-    def embed_text(self, chunks: List[str]) -> Union[List[List[float]], np.ndarray]:
+    @staticmethod
+    def _decode(response) -> np.ndarray:
+        """
+        Decode a batch of base64 float32 embeddings straight into a matrix.
+
+        Servers that ignore `encoding_format` and send float lists (some
+        OpenAI-compatible APIs) are converted with a single `np.asarray`.
+        """
+        embeddings = [item.embedding for item in response.data]
+        if embeddings and isinstance(embeddings[0], str):
+            return np.stack(
+                [
+                    np.frombuffer(base64.b64decode(data), dtype=np.float32)
+                    for data in embeddings
+                ]
+            )
+        return np.asarray(embeddings, dtype=np.float32)
+
+    def _embed_batch(self, batch: Sequence[str]) -> np.ndarray:
+        response = self.client.embeddings.create(
+            model=self.config.embedding_model_id,
+            input=list(batch),
+            encoding_format="base64",
+        )
+        return self._decode(response)
+
+    async def _aembed_batch(self, batch: Sequence[str]) -> np.ndarray:
+        response = await self.async_client.embeddings.create(
+            model=self.config.embedding_model_id,
+            input=list(batch),
+            encoding_format="base64",
+        )
+        return self._decode(response)
+
+    def embed_text(self, chunks: List[str], as_array: bool = False) -> Embeddings:
         """Generate embeddings for the given text chunks."""
         if not self.client:
             raise ClientNotInitializedException("OpenAI client is not connected")
 
         try:
-            response = self.client.embeddings.create(
-                model=self.config.embedding_model_id, input=chunks
+            embeddings = run_batches(
+                self._embed_batch,
+                chunks,
+                batch_size=self.config.batch_size,
+                max_concurrency=self.config.max_concurrency,
+                policy=self.retry_policy,
             )
+            return self._output(embeddings, as_array)
+
+        except Exception as e:
+            self.logger.error(f"Error generating embeddings with OpenAI: {str(e)}")
+            raise EmbeddingException(f"Failed to generate embeddings: {str(e)}")
 
-            embeddings = [item.embedding for item in response.data]
-            return np.array(embeddings)
+    async def aembed_text(
+        self, chunks: List[str], as_array: bool = False
+    ) -> Embeddings:
+        """Generate embeddings for the given text chunks using the async client."""
+        if not self.async_client:
+            raise ClientNotInitializedException("OpenAI client is not connected")
+
+        try:
+            embeddings = await arun_batches(
+                self._aembed_batch,
+                chunks,
+                batch_size=self.config.batch_size,
+                max_concurrency=self.config.max_concurrency,
+                policy=self.retry_policy,
+            )
+            return self._output(embeddings, as_array)
 
         except Exception as e:
             self.logger.error(f"Error generating embeddings with OpenAI: {str(e)}")
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.utils.metrics import CACHE_REQUESTS
+
+from .base import EmbeddingBase
+
+
+class QueryEmbeddingBatcher:
+    """
+    Dynamic micro-batcher for query embeddings.
+
+    Concurrent `embed` calls are collected for up to `max_wait_ms` (or until
+    `max_batch_size` queries are pending) and embedded with a single
+    `aembed_text` call. Results for repeated questions are served from an LRU
+    cache of `cache_size` entries.
+    """
+
+    def __init__(
+        self,
+        embedder: EmbeddingBase,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        cache_size: int = 1024,
+    ):
+        self.embedder = embedder
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # The event loop only keeps weak references to running tasks
+        self._tasks: Set[asyncio.Task] = set()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.logger = logging.getLogger(__name__)
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Return the embedding of a single query as a float32 vector."""
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            self.cache_hits += 1
+            CACHE_REQUESTS.inc(cache="query_embedding", result="hit")
+            return cached
+        self.cache_misses += 1
+        CACHE_REQUESTS.inc(cache="query_embedding", result="miss")
+
+        # Identical questions in the same window share one slot in the batch
+        future = self._pending.get(text)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[text] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch = list(self._pending.items())
+        self._pending = {}
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        texts = [text for text, _ in batch]
+        try:
+            embeddings = await self.embedder.aembed_text(texts, as_array=True)
+            if len(embeddings) != len(batch):
+                raise ValueError(
+                    f"Embedder returned {len(embeddings)} vectors "
+                    f"for {len(batch)} queries"
+                )
+            for (text, future), vector in zip(batch, embeddings):
+                # Rows are read-only so cached vectors shared between requests
+                # cannot be modified in place
+                vector.flags.writeable = False
+                self._remember(text, vector)
+                if not future.done():
+                    future.set_result(vector)
+        except BaseException as e:
+            self.logger.error(f"Error embedding query batch: {e}")
+            # Every waiting request must be resolved, or it would hang
+            error = e if isinstance(e, Exception) else RuntimeError(str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            if not isinstance(e, Exception):
+                raise
+
+    def _remember(self, text: str, vector: np.ndarray):
+        if self.cache_size <= 0:
+            return
+        self._cache[text] = vector
+        self._cache.move_to_end(text)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
@@ -1,15 +1,13 @@
 # embedders/sentence_transformer_embedder.py
 import logging
-from typing import List, Optional, Union
-
-import numpy as np
+from typing import List
 
 try:
     from sentence_transformers import SentenceTransformer
 except ImportError:
     raise ImportError("Please install the sentence-transformers package")
 
-from .base import EmbeddingBase
+from .base import EmbeddingBase, Embeddings
 from .config import EmbedderConfig
 from .exceptions import ClientNotInitializedException, EmbeddingException
 
@@ -40,7 +38,7 @@ class SentenceTransformerEmbedder(EmbeddingBase):
                 f"Failed to initialize Sentence Transformer model: {str(e)}"
             )
 
-    def embed_text(self, chunks: List[str]) -> List[List[float]]:
+    def embed_text(self, chunks: List[str], as_array: bool = False) -> Embeddings:
         """Generate embeddings for the given text chunks."""
         if not self.model:
             raise ClientNotInitializedException(
@@ -50,8 +48,8 @@ class SentenceTransformerEmbedder(EmbeddingBase):
         try:
             embeddings = self.model.encode(
                 chunks, convert_to_numpy=True, show_progress_bar=False
-            ).tolist()
-            return embeddings
+            )
+            return self._output(embeddings, as_array)
 
         except Exception as e:
             self.logger.error(
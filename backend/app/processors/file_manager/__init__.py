@@ -1,5 +1,11 @@
-from .file_chunking import FileProcessor
+from .file_chunking import FileProcessor, TextChunk
 from .file_handler import FileHandler
-from .models import FileUploadResponse
+from .models import FileUploadResponse, ImportRequest
 
-__all__ = ["FileProcessor", "FileHandler", "FileUploadResponse"]
+__all__ = [
+    "FileProcessor",
+    "FileHandler",
+    "FileUploadResponse",
+    "ImportRequest",
+    "TextChunk",
+]
@@ -1,27 +1,228 @@
-from typing import List
+import asyncio
+import functools
+import math
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncIterator, Deque, Iterator, List, Optional
 
-from langchain.docstore.document import Document
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from pypdf import PdfReader
 
+from app.utils.executors import run_blocking, run_in_process, stream_blocking
 
-class FileProcessor:
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=len,
+# langchain is slow to import, so it is loaded on first use instead of at startup
+if TYPE_CHECKING:
+    from langchain.docstore.document import Document
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+
+@dataclass
+class TextChunk:
+    """A chunk of a document with its 0-based page and offset in the page text."""
+
+    text: str
+    page: int
+    offset: int
+
+
+@functools.lru_cache(maxsize=8)
+def _get_text_splitter(
+    chunk_size: int, chunk_overlap: int
+) -> "RecursiveCharacterTextSplitter":
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        add_start_index=True,
+    )
+
+
+def split_page(
+    text_splitter: "RecursiveCharacterTextSplitter", text: str, page: int
+) -> List[TextChunk]:
+    return [
+        TextChunk(
+            text=document.page_content,
+            page=page,
+            offset=document.metadata["start_index"],
+        )
+        for document in text_splitter.create_documents([text])
+    ]
+
+
+def count_pdf_pages(file_path: str) -> int:
+    return len(PdfReader(file_path).pages)
+
+
+def split_pdf_pages(
+    file_path: str,
+    start: int,
+    stop: Optional[int],
+    chunk_size: int,
+    chunk_overlap: int,
+) -> List[TextChunk]:
+    """
+    Parse and split pages `[start, stop)` of a PDF into text chunks.
+
+    Runs inside process-pool workers, so it only takes and returns plain values.
+    Pages are split one at a time, exactly like `FileProcessor.iter_chunks`.
+    """
+    reader = PdfReader(file_path)
+    text_splitter = _get_text_splitter(chunk_size, chunk_overlap)
+    chunks = []
+    for number, page in enumerate(reader.pages[start:stop], start=start):
+        chunks.extend(
+            split_page(
+                text_splitter, page.extract_text(extraction_mode="plain"), number
+            )
         )
+    return chunks
+
 
-    async def generate_chunks(self, file_path: str) -> List[str]:
+def split_pdf(file_path: str, chunk_size: int, chunk_overlap: int) -> List[TextChunk]:
+    """Parse and split a whole PDF into text chunks in a worker process."""
+    return split_pdf_pages(file_path, 0, None, chunk_size, chunk_overlap)
+
+
+class FileProcessor:
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        pages_per_task: int = 0,
+        max_parallel_tasks: int = 0,
+    ):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        # Minimum pages per process-pool task; 0 parses in a worker thread
+        self.pages_per_task = pages_per_task
+        # Page ranges parsed at the same time; 0 uses one per CPU
+        self.max_parallel_tasks = max_parallel_tasks or os.cpu_count()
+        self.text_splitter = _get_text_splitter(chunk_size, chunk_overlap)
+
+    def _validate_file_type(self, file_path: str):
         if not file_path.endswith(".pdf"):
             raise ValueError("Unsupported file type. Only PDF files are allowed.")
 
-        loader = PyPDFLoader(file_path)
-        documents = loader.load()
-        chunks = self.text_splitter.create_documents(
-            [doc.page_content for doc in documents],
-            metadatas=[doc.metadata for doc in documents],
+    async def generate_chunks(self, file_path: str) -> List[TextChunk]:
+        self._validate_file_type(file_path)
+        if self.pages_per_task <= 0:
+            return await run_blocking(list, self.iter_chunks(file_path))
+        return [
+            chunk
+            async for chunks in self._stream_page_ranges(file_path)
+            for chunk in chunks
+        ]
+
+    async def _stream_page_ranges(
+        self, file_path: str
+    ) -> AsyncIterator[List[TextChunk]]:
+        """
+        Parse page ranges across the process pool and yield their chunks in
+        page order. At most `max_parallel_tasks` ranges are submitted or
+        waiting to be consumed at a time.
+        """
+        num_pages = await run_blocking(count_pdf_pages, file_path)
+        # Every task re-reads the PDF's page tree, so large documents are cut
+        # into about two ranges per worker rather than many small ones
+        step = max(
+            self.pages_per_task, math.ceil(num_pages / (2 * self.max_parallel_tasks))
+        )
+        starts = iter(range(0, num_pages, step))
+        running: Deque[asyncio.Future] = deque()
+
+        def submit_next():
+            start = next(starts, None)
+            if start is not None:
+                running.append(
+                    asyncio.ensure_future(
+                        run_in_process(
+                            split_pdf_pages,
+                            file_path,
+                            start,
+                            start + step,
+                            self.chunk_size,
+                            self.chunk_overlap,
+                        )
+                    )
+                )
+
+        try:
+            for _ in range(self.max_parallel_tasks):
+                submit_next()
+            while running:
+                chunks = await running.popleft()
+                submit_next()
+                yield chunks
+        finally:
+            for future in running:
+                future.cancel()
+
+    async def parse_in_process(self, file_path: str) -> List[TextChunk]:
+        """Parse and split a PDF in the shared process pool."""
+        self._validate_file_type(file_path)
+        return await run_in_process(
+            split_pdf, file_path, self.chunk_size, self.chunk_overlap
         )
-        list_of_chunks = [chunk.page_content for chunk in chunks]
-        return list_of_chunks
+
+    def iter_pages(self, file_path: str) -> Iterator["Document"]:
+        """Yield the pages of a PDF one at a time instead of loading them all."""
+        from langchain_community.document_loaders import PyPDFLoader
+
+        self._validate_file_type(file_path)
+        yield from PyPDFLoader(file_path).lazy_load()
+
+    def iter_chunks(self, file_path: str) -> Iterator[TextChunk]:
+        """Yield text chunks page by page."""
+        for number, page in enumerate(self.iter_pages(file_path)):
+            yield from split_page(self.text_splitter, page.page_content, number)
+
+    def iter_chunk_batches(
+        self, file_path: str, batch_size: int = 64
+    ) -> Iterator[List[TextChunk]]:
+        """Group the chunk stream into lists of at most `batch_size` chunks."""
+        batch = []
+        for chunk in self.iter_chunks(file_path):
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def stream_chunk_batches(
+        self, file_path: str, batch_size: int = 64, max_buffered: int = 4
+    ) -> AsyncIterator[List[TextChunk]]:
+        """
+        Parse and split the PDF, yielding chunk batches as they become ready.
+
+        With `pages_per_task` set, page ranges are parsed in parallel in the
+        process pool; otherwise the PDF is parsed in a worker thread and at
+        most `max_buffered` batches are held in memory.
+        """
+        self._validate_file_type(file_path)
+        if self.pages_per_task <= 0:
+            async for batch in stream_blocking(
+                self.iter_chunk_batches,
+                file_path,
+                batch_size,
+                max_buffered=max_buffered,
+            ):
+                yield batch
+            return
+
+        batch = []
+        page_ranges = self._stream_page_ranges(file_path)
+        try:
+            async for chunks in page_ranges:
+                for chunk in chunks:
+                    batch.append(chunk)
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+        finally:
+            await page_ranges.aclose()
+        if batch:
+            yield batch
@@ -1,6 +1,9 @@
+import hashlib
+import os
+import zipfile
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 
 import aiofiles
@@ -14,6 +17,9 @@ class FileMetadata(BaseModel):
 
     filename: str
     filepath: Path
+    # Name the file was submitted under: the upload name, or the path inside
+    # the import directory or archive
+    source_name: str
     experiment_id: str
     size: int
     content_type: str
@@ -54,11 +60,14 @@ class FileHandler:
                 f"File exceeds max size of {self.settings.MAX_FILE_SIZE / (1024 * 1024):.2f} MB"
             )
 
-    def _generate_unique_filename(self, original_filename: str) -> str:
-        """Generates a unique filename while preserving the extension."""
+    def _content_filename(self, original_filename: str, content_hash: str) -> str:
+        """
+        Filename derived from the file contents, so that re-uploading the same
+        file reuses its stored copy instead of adding another one.
+        """
         stem = Path(original_filename).stem.lower().replace(" ", "_")
         suffix = Path(original_filename).suffix.lower()
-        return f"{stem}_{uuid4().hex}{suffix}"
+        return f"{stem}_{content_hash[:16]}{suffix}"
 
     async def save_file(self, file: UploadFile, experiment_id: str) -> FileMetadata:
         """
@@ -71,17 +80,25 @@ class FileHandler:
             experiment_path = self.upload_dir / str(experiment_id)
             experiment_path.mkdir(parents=True, exist_ok=True)
 
-            unique_filename = self._generate_unique_filename(file.filename)
-            file_path = experiment_path / unique_filename
-
-            # Save file in chunks to handle large files
-            async with aiofiles.open(file_path, "wb") as f:
-                while chunk := await file.read(8192):  # 8KB chunks
-                    await f.write(chunk)
+            # Save file in chunks to handle large files, hashing it on the way
+            part_path = experiment_path / f".{uuid4().hex}.part"
+            digest = hashlib.sha256()
+            try:
+                async with aiofiles.open(part_path, "wb") as f:
+                    while chunk := await file.read(8192):  # 8KB chunks
+                        digest.update(chunk)
+                        await f.write(chunk)
+
+                filename = self._content_filename(file.filename, digest.hexdigest())
+                file_path = experiment_path / filename
+                os.replace(part_path, file_path)
+            finally:
+                part_path.unlink(missing_ok=True)
 
             return FileMetadata(
-                filename=unique_filename,
+                filename=filename,
                 filepath=file_path,
+                source_name=file.filename,
                 experiment_id=experiment_id,
                 size=file_path.stat().st_size,
                 content_type=file.content_type,
@@ -91,3 +108,115 @@ class FileHandler:
             raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error saving file: {str(e)}")
+
+    def import_path(
+        self, path: str, experiment_id: str, max_files: Optional[int] = None
+    ) -> Tuple[List[FileMetadata], List[Dict[str, str]]]:
+        """
+        Collect the PDFs of a server-side directory or zip archive.
+
+        `path` is resolved inside the import directory. PDFs in a directory are
+        ingested in place; PDFs in a zip archive are extracted to the
+        experiment's upload directory. Sources with more than `max_files`
+        PDFs are rejected before anything is extracted. Returns the accepted
+        files and a list of `{"filename", "error"}` entries for rejected ones.
+        """
+        import_dir = (self.base_dir / self.settings.IMPORT_DIR).resolve()
+        source = (import_dir / path).resolve()
+        if not source.is_relative_to(import_dir):
+            raise FileValidationError("Import path must be inside the import directory")
+        if not source.exists():
+            raise FileValidationError(f"Import path not found: {path}")
+
+        if source.is_dir():
+            accepted, rejected = self._collect_directory(source, experiment_id)
+            self._check_file_count(len(accepted), max_files)
+            return accepted, rejected
+        if zipfile.is_zipfile(source):
+            return self._extract_zip(source, experiment_id, max_files)
+        raise FileValidationError("Import path must be a directory or a zip archive")
+
+    def _collect_directory(
+        self, directory: Path, experiment_id: str
+    ) -> Tuple[List[FileMetadata], List[Dict[str, str]]]:
+        accepted, rejected = [], []
+        for file_path in sorted(directory.rglob("*")):
+            if not file_path.is_file() or file_path.suffix.lower() != ".pdf":
+                continue
+            size = file_path.stat().st_size
+            if size > self.settings.MAX_FILE_SIZE:
+                rejected.append(
+                    {"filename": file_path.name, "error": "File exceeds max size"}
+                )
+                continue
+            accepted.append(
+                FileMetadata(
+                    filename=file_path.name,
+                    filepath=file_path,
+                    source_name=file_path.relative_to(directory).as_posix(),
+                    experiment_id=experiment_id,
+                    size=size,
+                    content_type="application/pdf",
+                )
+            )
+        return accepted, rejected
+
+    @staticmethod
+    def _check_file_count(count: int, max_files: Optional[int]):
+        if max_files is not None and count > max_files:
+            raise FileValidationError(
+                f"At most {max_files} files can be imported at once."
+            )
+
+    def _extract_zip(
+        self, archive: Path, experiment_id: str, max_files: Optional[int] = None
+    ) -> Tuple[List[FileMetadata], List[Dict[str, str]]]:
+        experiment_path = self.upload_dir / str(experiment_id)
+
+        accepted, rejected = [], []
+        with zipfile.ZipFile(archive) as zf:
+            # Only the base name is used, so entries cannot escape the upload
+            # directory
+            members = [
+                (info, Path(info.filename).name)
+                for info in zf.infolist()
+                if not info.is_dir() and Path(info.filename).suffix.lower() == ".pdf"
+            ]
+            self._check_file_count(
+                sum(
+                    info.file_size <= self.settings.MAX_FILE_SIZE for info, _ in members
+                ),
+                max_files,
+            )
+            experiment_path.mkdir(parents=True, exist_ok=True)
+            for info, name in members:
+                if info.file_size > self.settings.MAX_FILE_SIZE:
+                    rejected.append(
+                        {"filename": name, "error": "File exceeds max size"}
+                    )
+                    continue
+
+                part_path = experiment_path / f".{uuid4().hex}.part"
+                try:
+                    with zf.open(info) as src, open(part_path, "wb") as dst:
+                        digest = hashlib.sha256()
+                        while block := src.read(1024 * 1024):
+                            digest.update(block)
+                            dst.write(block)
+                    file_path = experiment_path / self._content_filename(
+                        name, digest.hexdigest()
+                    )
+                    os.replace(part_path, file_path)
+                finally:
+                    part_path.unlink(missing_ok=True)
+                accepted.append(
+                    FileMetadata(
+                        filename=file_path.name,
+                        filepath=file_path,
+                        source_name=info.filename,
+                        experiment_id=experiment_id,
+                        size=info.file_size,
+                        content_type="application/pdf",
+                    )
+                )
+        return accepted, rejected
@@ -4,3 +4,10 @@ from pydantic import BaseModel
 class FileUploadResponse(BaseModel):
     file_id: str
     file_name: str
+
+
+class ImportRequest(BaseModel):
+    # Directory or zip archive, relative to the configured import directory
+    path: str
+    # Delete the experiment's documents that are not part of this import
+    prune: bool = False
@@ -1,5 +1,7 @@
+from .answer_cache import SemanticAnswerCache
 from .base import TextGeneratorBase
 from .config import GeneratorConfig
+from .context_builder import ContextBuilder
 from .exceptions import (
     ClientNotInitializedException,
     GenerationException,
@@ -17,4 +19,6 @@ __all__ = [
     "ClientNotInitializedException",
     "ModelNotSetException",
     "GenerationException",
+    "SemanticAnswerCache",
+    "ContextBuilder",
 ]
@@ -0,0 +1,105 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class _ExperimentEntries:
+    vectors: List[np.ndarray] = field(default_factory=list)
+    answers: List[str] = field(default_factory=list)
+    created_at: List[float] = field(default_factory=list)
+
+
+class SemanticAnswerCache:
+    """
+    Per-experiment cache of generated answers keyed by question embedding.
+
+    A lookup returns a stored answer when the new question's embedding has a
+    cosine similarity of at least `similarity_threshold` with a cached one.
+    Entries expire after `ttl_seconds`; each experiment keeps at most
+    `max_entries`, dropping the oldest first.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.95,
+        ttl_seconds: float = 3600,
+        max_entries: int = 256,
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, _ExperimentEntries] = {}
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _expire(self, entries: _ExperimentEntries):
+        cutoff = time.monotonic() - self.ttl_seconds
+        keep = next(
+            (i for i, created in enumerate(entries.created_at) if created >= cutoff),
+            len(entries.created_at),
+        )
+        if keep:
+            del entries.vectors[:keep]
+            del entries.answers[:keep]
+            del entries.created_at[:keep]
+
+    def get(self, experiment_id: str, question_embedding) -> Optional[str]:
+        entries = self._entries.get(experiment_id)
+        if entries is not None:
+            self._expire(entries)
+        if not entries or not entries.vectors:
+            self.misses += 1
+            return None
+
+        similarities = np.stack(entries.vectors) @ self._normalize(question_embedding)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entries.answers[best]
+
+    def generation(self, experiment_id: str) -> int:
+        """Counter bumped on every invalidation of the experiment."""
+        return self._generations.get(experiment_id, 0)
+
+    def put(
+        self,
+        experiment_id: str,
+        question_embedding,
+        answer: str,
+        generation: Optional[int] = None,
+    ):
+        """
+        Store an answer. Pass the `generation` read before retrieval so that an
+        answer built from chunks that were invalidated meanwhile is dropped.
+        """
+        if generation is not None and generation != self.generation(experiment_id):
+            return
+
+        entries = self._entries.setdefault(experiment_id, _ExperimentEntries())
+        entries.vectors.append(self._normalize(question_embedding))
+        entries.answers.append(answer)
+        entries.created_at.append(time.monotonic())
+
+        overflow = len(entries.vectors) - self.max_entries
+        if overflow > 0:
+            del entries.vectors[:overflow]
+            del entries.answers[:overflow]
+            del entries.created_at[:overflow]
+
+    def invalidate(self, experiment_id: str):
+        """Drop every cached answer of an experiment, e.g. after new uploads."""
+        self._entries.pop(experiment_id, None)
+        self._generations[experiment_id] = self.generation(experiment_id) + 1
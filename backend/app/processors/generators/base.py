@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.utils.executors import run_blocking
 
 
 class TextGeneratorBase(ABC):
@@ -32,6 +34,48 @@ class TextGeneratorBase(ABC):
         """Generate text based on prompt and parameters."""
         pass
 
+    async def agenerate_text(
+        self,
+        prompt: str,
+        chat_history: List[Dict[str, str]] = [],
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> Optional[str]:
+        """
+        Asynchronous counterpart of `generate_text`.
+
+        Runs `generate_text` in the shared bounded executor; generators backed
+        by a native async client override this.
+        """
+        return await run_blocking(
+            self.generate_text,
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+        )
+
+    async def astream_text(
+        self,
+        prompt: str,
+        chat_history: List[Dict[str, str]] = [],
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Generate text and yield it in pieces as it is produced.
+
+        Generators without a streaming API yield the full completion at once.
+        """
+        text = await self.agenerate_text(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+        )
+        if text:
+            yield text
+
     def construct_prompt(self, prompt: str, role: str = "user") -> Dict[str, str]:
         """Construct a message dictionary for chat models."""
         return {"role": role, "content": prompt}
@@ -0,0 +1,156 @@
+import logging
+import math
+from typing import List, Optional
+
+from app.utils.prompts import RAG_PROMPT
+
+# Context window (in tokens) per model family, matched by model id prefix.
+# Longer prefixes are checked first so e.g. "gpt-4o" wins over "gpt-4".
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4o": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4.1": 1047576,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "o1": 128000,
+    "o3": 200000,
+    "llama-3.1": 131072,
+    "llama-3.2": 131072,
+    "llama-3.3": 131072,
+    "llama3": 8192,
+    "mixtral-8x7b": 32768,
+    "gemma": 8192,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+
+class ContextBuilder:
+    """
+    Packs retrieved chunks into `RAG_PROMPT` within a token budget.
+
+    The budget is the model's context window minus `max_output_tokens` and the
+    tokens of the prompt itself, optionally capped by `max_context_tokens`.
+    Chunks are taken in relevance order; text repeated by the splitter's chunk
+    overlap is trimmed, and chunks that no longer fit are skipped.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        max_output_tokens: int = 1024,
+        context_window: int = 0,
+        max_context_tokens: int = 0,
+        min_overlap: int = 20,
+        max_overlap: int = 400,
+        reserved_tokens: int = 64,
+    ):
+        self.model_id = model_id
+        self.max_output_tokens = max_output_tokens
+        self.context_window = context_window or self._lookup_context_window(model_id)
+        self.max_context_tokens = max_context_tokens
+        self.min_overlap = min_overlap
+        self.max_overlap = max_overlap
+        self.reserved_tokens = reserved_tokens
+        self.logger = logging.getLogger(__name__)
+        self._encoding = self._load_encoding(model_id)
+
+    @staticmethod
+    def _lookup_context_window(model_id: str) -> int:
+        model_id = (model_id or "").lower()
+        for prefix in sorted(MODEL_CONTEXT_WINDOWS, key=len, reverse=True):
+            if model_id.startswith(prefix):
+                return MODEL_CONTEXT_WINDOWS[prefix]
+        return DEFAULT_CONTEXT_WINDOW
+
+    def _load_encoding(self, model_id: str):
+        try:
+            import tiktoken
+        except ImportError:
+            self.logger.warning("tiktoken is not installed; estimating token counts")
+            return None
+
+        try:
+            try:
+                return tiktoken.encoding_for_model(model_id)
+            except KeyError:
+                return tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            self.logger.warning(f"Failed to load tokenizer, estimating counts: {e}")
+            return None
+
+    def count_tokens(self, text: str) -> int:
+        if self._encoding is None:
+            return math.ceil(len(text) / 4)
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        if self._encoding is None:
+            return text[: max_tokens * 4]
+        tokens = self._encoding.encode(text, disallowed_special=())
+        return self._encoding.decode(tokens[:max_tokens])
+
+    def _overlap(self, left: str, right: str) -> int:
+        """Length of the longest suffix of `left` that is a prefix of `right`."""
+        longest = min(len(left), len(right), self.max_overlap)
+        for size in range(longest, self.min_overlap - 1, -1):
+            if left.endswith(right[:size]):
+                return size
+        return 0
+
+    def _dedupe(self, text: str, packed: List[str]) -> Optional[str]:
+        """Trim the parts of `text` already present in the packed chunks."""
+        for other in packed:
+            if text in other:
+                return None
+            overlap = self._overlap(other, text)
+            if overlap:
+                text = text[overlap:]
+            overlap = self._overlap(text, other)
+            if overlap:
+                text = text[:-overlap]
+        text = text.strip()
+        return text or None
+
+    @property
+    def chunk_budget(self) -> int:
+        return self.context_window - self.max_output_tokens - self.reserved_tokens
+
+    def pack(self, question: str, chunks: List[str]) -> List[str]:
+        """Select and trim `chunks` so that the formatted prompt fits the budget."""
+        budget = self.chunk_budget - self.count_tokens(
+            RAG_PROMPT.format(question=question, chunks="")
+        )
+        if self.max_context_tokens:
+            budget = min(budget, self.max_context_tokens)
+
+        packed: List[str] = []
+        for chunk in chunks:
+            if budget <= 0:
+                break
+            text = self._dedupe(chunk, packed)
+            if text is None:
+                continue
+            # Separator and numbering added by `format_chunks`
+            tokens = self.count_tokens(text) + 4
+            if tokens > budget:
+                # Only the first chunk is truncated, and only if some of its
+                # text fits next to the separator
+                if packed or budget <= 4:
+                    continue
+                text = self._truncate(text, budget - 4).strip()
+                if not text:
+                    continue
+                tokens = budget
+            packed.append(text)
+            budget -= tokens
+        return packed
+
+    @staticmethod
+    def format_chunks(chunks: List[str]) -> str:
+        return "\n\n" + "\n\n".join(
+            f"[{i}] {chunk}" for i, chunk in enumerate(chunks, start=1)
+        )
+
+    def build_prompt(self, question: str, chunks: List[str]) -> str:
+        packed = self.pack(question, chunks)
+        return RAG_PROMPT.format(question=question, chunks=self.format_chunks(packed))
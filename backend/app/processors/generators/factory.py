@@ -2,13 +2,12 @@ from enum import Enum
 from typing import Any, Dict, Optional
 
 from .base import TextGeneratorBase
-from .groq_generator import GroqTextGenerator
-from .openai_generator import OpenAITextGenerator
 
 
 class GeneratorType(Enum):
     OPENAI = "OPENAI"
     GROQ = "GROQ"
+    FAKE = "FAKE"
 
 
 class TextGeneratorFactory:
@@ -17,6 +16,7 @@ class TextGeneratorFactory:
     DEFAULT_MODELS = {
         GeneratorType.OPENAI.value: "gpt-4o-mini",
         GeneratorType.GROQ.value: "mixtral-8x7b-32768",
+        GeneratorType.FAKE.value: "fake",
     }
 
     @staticmethod
@@ -28,15 +28,29 @@ class TextGeneratorFactory:
         default_input_max_characters: int = 1000,
         default_generation_max_output_tokens: int = 1000,
         default_generation_temperature: float = 0.1,
+        **kwargs,
     ) -> TextGeneratorBase:
-        """Create a text generator instance based on the specified type."""
-
-        generators = {
-            GeneratorType.OPENAI.value: OpenAITextGenerator,
-            GeneratorType.GROQ.value: GroqTextGenerator,
-        }
-        generator_class = generators.get(generator_type)
-        if not generator_class:
+        """
+        Create a text generator instance based on the specified type.
+
+        Extra keyword arguments are passed to the generator class, e.g. the
+        simulated latencies of the fake generator.
+        """
+
+        # SDKs are imported only for the selected provider
+        if generator_type == GeneratorType.OPENAI.value:
+            from .openai_generator import OpenAITextGenerator
+
+            generator_class = OpenAITextGenerator
+        elif generator_type == GeneratorType.GROQ.value:
+            from .groq_generator import GroqTextGenerator
+
+            generator_class = GroqTextGenerator
+        elif generator_type == GeneratorType.FAKE.value:
+            from .fake_generator import FakeTextGenerator
+
+            generator_class = FakeTextGenerator
+        else:
             raise ValueError(f"Unsupported generator type: {generator_type}")
 
         # Use default model if none provided
@@ -50,4 +64,5 @@ class TextGeneratorFactory:
             default_input_max_characters=default_input_max_characters,
             default_generation_max_output_tokens=default_generation_max_output_tokens,
             default_generation_temperature=default_generation_temperature,
+            **kwargs,
         )
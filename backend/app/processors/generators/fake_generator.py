@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+from .base import TextGeneratorBase
+from .config import GeneratorConfig
+
+
+class FakeTextGenerator(TextGeneratorBase):
+    """
+    Deterministic offline text generator for benchmarks and evaluation.
+
+    Answers with the first words of the prompt after waiting
+    `first_token_latency_ms`, then `token_latency_ms` per word, to simulate
+    a provider's time to first token and decoding speed.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        generation_model_id: str = "fake",
+        api_url: Optional[str] = None,
+        default_input_max_characters: int = 1000,
+        default_generation_max_output_tokens: int = 1000,
+        default_generation_temperature: float = 0.1,
+        first_token_latency_ms: float = 0.0,
+        token_latency_ms: float = 0.0,
+        answer_tokens: int = 64,
+    ):
+        self.config = GeneratorConfig(
+            api_key=api_key,
+            generation_model_id=generation_model_id,
+            api_url=api_url,
+            default_input_max_characters=default_input_max_characters,
+            default_generation_max_output_tokens=default_generation_max_output_tokens,
+            default_generation_temperature=default_generation_temperature,
+        )
+        self.first_token_latency = first_token_latency_ms / 1000
+        self.token_latency = token_latency_ms / 1000
+        self.answer_tokens = answer_tokens
+        self.logger = logging.getLogger(__name__)
+
+    def process_text(self, text: str) -> str:
+        """Process input text by truncating to maximum length."""
+        return text[: self.config.default_input_max_characters].strip()
+
+    def _answer_words(self, prompt: str, max_output_tokens: Optional[int]) -> List[str]:
+        limit = min(
+            self.answer_tokens,
+            max_output_tokens or self.config.default_generation_max_output_tokens,
+        )
+        words = prompt.split()[:limit]
+        return [word if i == 0 else f" {word}" for i, word in enumerate(words)]
+
+    def generate_text(
+        self,
+        prompt: str,
+        chat_history: List[Dict[str, str]] = [],
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> Optional[str]:
+        """Return the deterministic answer after the full simulated latency."""
+        words = self._answer_words(prompt, max_output_tokens)
+        time.sleep(self.first_token_latency + self.token_latency * len(words))
+        return "".join(words)
+
+    async def agenerate_text(
+        self,
+        prompt: str,
+        chat_history: List[Dict[str, str]] = [],
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> Optional[str]:
+        """Async counterpart of `generate_text` that does not block the loop."""
+        words = self._answer_words(prompt, max_output_tokens)
+        await asyncio.sleep(self.first_token_latency + self.token_latency * len(words))
+        return "".join(words)
+
+    async def astream_text(
+        self,
+        prompt: str,
+        chat_history: List[Dict[str, str]] = [],
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """Yield the answer word by word at the simulated decoding speed."""
+        await asyncio.sleep(self.first_token_latency)
+        for word in self._answer_words(prompt, max_output_tokens):
+            if self.token_latency:
+                await asyncio.sleep(self.token_latency)
+            yield word
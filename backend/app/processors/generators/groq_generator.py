@@ -1,7 +1,7 @@
 import logging
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 
-from groq import Groq
+from groq import AsyncGroq, Groq
 
 from .base import TextGeneratorBase
 from .config import GeneratorConfig
@@ -36,6 +36,9 @@ class GroqTextGenerator(TextGeneratorBase):
         self.client = Groq(
             api_key=self.config.api_key,
         )
+        self.async_client = AsyncGroq(
+            api_key=self.config.api_key,
+        )
 
         self.logger = logging.getLogger(__name__)
 
@@ -81,3 +84,84 @@ class GroqTextGenerator(TextGeneratorBase):
         except Exception as e:
             self.logger.error(f"Error generating text with Groq: {str(e)}")
             raise GenerationException(f"Failed to generate text: {str(e)}")
+
+    async def agenerate_text(
+        self,
+        prompt: str,
+        chat_history: List[Dict[str, str]] = [],
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> Optional[str]:
+        """Generate text using Groq's API through the async client."""
+        if not self.async_client:
+            raise ClientNotInitializedException("Groq client was not initialized")
+
+        if not self.config.generation_model_id:
+            raise ModelNotSetException("Generation model for Groq was not set")
+
+        max_tokens = (
+            max_output_tokens or self.config.default_generation_max_output_tokens
+        )
+        temp = temperature or self.config.default_generation_temperature
+
+        messages = list(chat_history)
+        messages.append(self.construct_prompt(prompt=prompt))
+
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=self.config.generation_model_id,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temp,
+            )
+
+            if not response or not response.choices or not response.choices[0].message:
+                raise GenerationException("Invalid response from Groq")
+
+            return response.choices[0].message.content
+
+        except Exception as e:
+            self.logger.error(f"Error generating text with Groq: {str(e)}")
+            raise GenerationException(f"Failed to generate text: {str(e)}")
+
+    async def astream_text(
+        self,
+        prompt: str,
+        chat_history: List[Dict[str, str]] = [],
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """Stream generated text from Groq's API as tokens arrive."""
+        if not self.async_client:
+            raise ClientNotInitializedException("Groq client was not initialized")
+
+        if not self.config.generation_model_id:
+            raise ModelNotSetException("Generation model for Groq was not set")
+
+        max_tokens = (
+            max_output_tokens or self.config.default_generation_max_output_tokens
+        )
+        temp = temperature or self.config.default_generation_temperature
+
+        messages = list(chat_history)
+        messages.append(self.construct_prompt(prompt=prompt))
+
+        try:
+            stream = await self.async_client.chat.completions.create(
+                model=self.config.generation_model_id,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temp,
+                stream=True,
+            )
+
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
+        except Exception as e:
+            self.logger.error(f"Error streaming text with Groq: {str(e)}")
+            raise GenerationException(f"Failed to generate text: {str(e)}")
@@ -1,7 +1,7 @@
 import logging
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from .base import TextGeneratorBase
 from .config import GeneratorConfig
@@ -37,6 +37,10 @@ class OpenAITextGenerator(TextGeneratorBase):
             api_key=self.config.api_key,
             base_url=self.config.api_url if self.config.api_url else None,
         )
+        self.async_client = AsyncOpenAI(
+            api_key=self.config.api_key,
+            base_url=self.config.api_url if self.config.api_url else None,
+        )
 
         self.logger = logging.getLogger(__name__)
 
@@ -82,3 +86,84 @@ class OpenAITextGenerator(TextGeneratorBase):
         except Exception as e:
             self.logger.error(f"Error generating text with OpenAI: {str(e)}")
             raise GenerationException(f"Failed to generate text: {str(e)}")
+
+    async def agenerate_text(
+        self,
+        prompt: str,
+        chat_history: List[Dict[str, str]] = [],
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> Optional[str]:
+        """Generate text using OpenAI's API through the async client."""
+        if not self.async_client:
+            raise ClientNotInitializedException("OpenAI client was not initialized")
+
+        if not self.config.generation_model_id:
+            raise ModelNotSetException("Generation model for OpenAI was not set")
+
+        max_tokens = (
+            max_output_tokens or self.config.default_generation_max_output_tokens
+        )
+        temp = temperature or self.config.default_generation_temperature
+
+        messages = list(chat_history)
+        messages.append(self.construct_prompt(prompt=prompt))
+
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=self.config.generation_model_id,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temp,
+            )
+
+            if not response or not response.choices or not response.choices[0].message:
+                raise GenerationException("Invalid response from OpenAI")
+
+            return response.choices[0].message.content
+
+        except Exception as e:
+            self.logger.error(f"Error generating text with OpenAI: {str(e)}")
+            raise GenerationException(f"Failed to generate text: {str(e)}")
+
+    async def astream_text(
+        self,
+        prompt: str,
+        chat_history: List[Dict[str, str]] = [],
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """Stream generated text from OpenAI's API as tokens arrive."""
+        if not self.async_client:
+            raise ClientNotInitializedException("OpenAI client was not initialized")
+
+        if not self.config.generation_model_id:
+            raise ModelNotSetException("Generation model for OpenAI was not set")
+
+        max_tokens = (
+            max_output_tokens or self.config.default_generation_max_output_tokens
+        )
+        temp = temperature or self.config.default_generation_temperature
+
+        messages = list(chat_history)
+        messages.append(self.construct_prompt(prompt=prompt))
+
+        try:
+            stream = await self.async_client.chat.completions.create(
+                model=self.config.generation_model_id,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temp,
+                stream=True,
+            )
+
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
+        except Exception as e:
+            self.logger.error(f"Error streaming text with OpenAI: {str(e)}")
+            raise GenerationException(f"Failed to generate text: {str(e)}")
@@ -0,0 +1,16 @@
+from .document_registry import DocumentRegistry
+from .job_store import IngestionJobStore
+from .models import DocumentRecord, IngestionJob, JobStage, JobStatus
+from .pipeline import IngestionPipeline
+from .job_queue import IngestionQueue
+
+__all__ = [
+    "DocumentRecord",
+    "DocumentRegistry",
+    "IngestionJob",
+    "IngestionJobStore",
+    "IngestionPipeline",
+    "IngestionQueue",
+    "JobStage",
+    "JobStatus",
+]
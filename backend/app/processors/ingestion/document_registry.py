@@ -0,0 +1,123 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Optional, Set
+
+from .models import DocumentRecord, _utcnow
+
+_COLUMNS = list(DocumentRecord.model_fields)
+
+
+class DocumentRegistry:
+    """
+    SQLite record of the ingested documents of each experiment.
+
+    Stores every document's content hash and the record ids of its chunks, so
+    that re-ingesting a document can skip unchanged files, embed only new
+    chunks and delete the chunks that disappeared.
+    """
+
+    def __init__(self, db_path: Path):
+        self.base_dir = Path(__file__).parent.parent.parent
+        self.db_path = self.base_dir / db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                experiment_id TEXT NOT NULL,
+                document_key TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                chunk_count INTEGER NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (experiment_id, document_key)
+            );
+            CREATE TABLE IF NOT EXISTS document_chunks (
+                experiment_id TEXT NOT NULL,
+                document_key TEXT NOT NULL,
+                record_id TEXT NOT NULL,
+                PRIMARY KEY (experiment_id, document_key, record_id)
+            ) WITHOUT ROWID;
+            """
+        )
+        self._conn.commit()
+
+    def get(self, experiment_id: str, document_key: str) -> Optional[DocumentRecord]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM documents "
+                "WHERE experiment_id = ? AND document_key = ?",
+                (experiment_id, document_key),
+            ).fetchone()
+        return DocumentRecord(**dict(zip(_COLUMNS, row))) if row else None
+
+    def list(self, experiment_id: str) -> List[DocumentRecord]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM documents "
+                "WHERE experiment_id = ? ORDER BY document_key",
+                (experiment_id,),
+            ).fetchall()
+        return [DocumentRecord(**dict(zip(_COLUMNS, row))) for row in rows]
+
+    def chunk_ids(self, experiment_id: str, document_key: str) -> Set[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record_id FROM document_chunks "
+                "WHERE experiment_id = ? AND document_key = ?",
+                (experiment_id, document_key),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def replace(
+        self,
+        experiment_id: str,
+        document_key: str,
+        filename: str,
+        content_hash: str,
+        record_ids: List[str],
+    ):
+        """Record the current version of a document and its chunk ids."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM document_chunks "
+                "WHERE experiment_id = ? AND document_key = ?",
+                (experiment_id, document_key),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO document_chunks "
+                "(experiment_id, document_key, record_id) VALUES (?, ?, ?)",
+                [(experiment_id, document_key, record_id) for record_id in record_ids],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents "
+                f"({', '.join(_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    experiment_id,
+                    document_key,
+                    filename,
+                    content_hash,
+                    len(record_ids),
+                    _utcnow(),
+                ),
+            )
+
+    def delete(self, experiment_id: str, document_key: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM document_chunks "
+                "WHERE experiment_id = ? AND document_key = ?",
+                (experiment_id, document_key),
+            )
+            self._conn.execute(
+                "DELETE FROM documents WHERE experiment_id = ? AND document_key = ?",
+                (experiment_id, document_key),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,25 @@
+import hashlib
+import uuid
+
+# Namespace for chunk record ids; changing it would re-key every stored chunk
+CHUNK_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "document-chatbot/chunks")
+
+
+def file_fingerprint(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_record_id(experiment_id: str, document_key: str, text: str) -> str:
+    """
+    Deterministic record id of a chunk: a UUID derived from the chunk's content
+    hash, scoped to its document so documents never share vectors.
+    """
+    content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return str(
+        uuid.uuid5(CHUNK_NAMESPACE, f"{experiment_id}/{document_key}/{content_hash}")
+    )
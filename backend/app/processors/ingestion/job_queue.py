@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from pathlib import Path
+from typing import List, Optional, Tuple
+from uuid import uuid4
+
+from app.utils.metrics import INGESTION_JOBS, INGESTION_QUEUE_DEPTH, span
+
+from .job_store import IngestionJobStore
+from .models import DocumentRecord, IngestionJob, JobStage, JobStatus
+from .pipeline import IngestionPipeline
+
+
+class IngestionQueue:
+    """
+    In-process ingestion job queue served by a fixed pool of asyncio workers.
+
+    Jobs are persisted in an `IngestionJobStore` before being queued, so jobs
+    that were queued or running when the process stopped are resumed on start.
+    Files submitted together with `submit_batch` share a batch id and are
+    ingested by one worker as a single stream.
+    """
+
+    def __init__(
+        self,
+        store: IngestionJobStore,
+        pipeline: IngestionPipeline,
+        num_workers: int = 2,
+    ):
+        self.store = store
+        self.pipeline = pipeline
+        self.num_workers = num_workers
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        self.logger = logging.getLogger(__name__)
+        INGESTION_QUEUE_DEPTH.set_function(lambda: self.depth)
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    async def start(self):
+        batch_ids = []
+        for job in self.store.list_unfinished():
+            self.store.update(job.job_id, status=JobStatus.QUEUED)
+            if job.batch_id is None:
+                await self._queue.put((self._process, job.job_id))
+            elif job.batch_id not in batch_ids:
+                batch_ids.append(job.batch_id)
+        for batch_id in batch_ids:
+            await self._queue.put((self._process_batch, batch_id))
+
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"ingestion-worker-{i}")
+            for i in range(self.num_workers)
+        ]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(
+        self,
+        experiment_id: str,
+        file_path: Path,
+        filename: str,
+        document_key: Optional[str] = None,
+    ) -> IngestionJob:
+        job = self.store.create(
+            IngestionJob(
+                job_id=uuid4().hex,
+                experiment_id=experiment_id,
+                file_path=str(file_path),
+                filename=filename,
+                document_key=document_key,
+            )
+        )
+        await self._queue.put((self._process, job.job_id))
+        return job
+
+    async def submit_batch(
+        self, experiment_id: str, files: List[Tuple[Path, str, Optional[str]]]
+    ) -> Tuple[str, List[IngestionJob]]:
+        """
+        Queue `(file_path, filename, document_key)` tuples to be ingested as
+        one batch.
+        """
+        batch_id = uuid4().hex
+        jobs = self.store.create_many(
+            [
+                IngestionJob(
+                    job_id=uuid4().hex,
+                    experiment_id=experiment_id,
+                    file_path=str(file_path),
+                    filename=filename,
+                    batch_id=batch_id,
+                    document_key=document_key,
+                )
+                for file_path, filename, document_key in files
+            ]
+        )
+        await self._queue.put((self._process_batch, batch_id))
+        return batch_id, jobs
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        return self.store.get(job_id)
+
+    def get_batch(self, batch_id: str) -> List[IngestionJob]:
+        return self.store.list_batch(batch_id)
+
+    def list_documents(self, experiment_id: str) -> List[DocumentRecord]:
+        registry = self.pipeline.document_registry
+        return registry.list(experiment_id) if registry is not None else []
+
+    async def delete_document(
+        self, experiment_id: str, document_key: str
+    ) -> Optional[int]:
+        return await self.pipeline.delete_document(experiment_id, document_key)
+
+    async def _worker(self):
+        while True:
+            process, key = await self._queue.get()
+            try:
+                await process(key)
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, job_id: str):
+        job = self.store.get(job_id)
+        if job is None:
+            return
+
+        def report(**fields):
+            self.store.update(job_id, **fields)
+
+        self.store.update(job_id, status=JobStatus.RUNNING)
+        try:
+            with span("ingestion_job"):
+                await self.pipeline.run(job, report)
+            self.store.update(job_id, status=JobStatus.COMPLETED, stage=JobStage.DONE)
+            INGESTION_JOBS.inc(status=JobStatus.COMPLETED.value)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Ingestion job {job_id} failed: {e}")
+            self.store.update(job_id, status=JobStatus.FAILED, error=str(e))
+            INGESTION_JOBS.inc(status=JobStatus.FAILED.value)
+
+    async def _process_batch(self, batch_id: str):
+        jobs = [
+            job
+            for job in self.store.list_batch(batch_id)
+            if job.status in (JobStatus.QUEUED, JobStatus.RUNNING)
+        ]
+        if not jobs:
+            return
+
+        def report(job_id: str, **fields):
+            self.store.update(job_id, **fields)
+            if fields.get("status") in (JobStatus.COMPLETED, JobStatus.FAILED):
+                INGESTION_JOBS.inc(status=fields["status"].value)
+
+        for job in jobs:
+            self.store.update(job.job_id, status=JobStatus.RUNNING)
+        try:
+            with span("ingestion_batch"):
+                await self.pipeline.run_batch(jobs, report)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Ingestion batch {batch_id} failed: {e}")
+            for job in self.store.list_batch(batch_id):
+                if job.status == JobStatus.RUNNING:
+                    report(job.job_id, status=JobStatus.FAILED, error=str(e))
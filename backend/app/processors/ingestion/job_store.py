@@ -0,0 +1,138 @@
+import sqlite3
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import List, Optional
+
+from .models import IngestionJob, JobStatus, _utcnow
+
+_COLUMNS = list(IngestionJob.model_fields)
+
+# Columns added after the table was first created, with their definitions
+_ADDED_COLUMNS = {
+    "batch_id": "TEXT",
+    "document_key": "TEXT",
+    "reused_chunks": "INTEGER NOT NULL DEFAULT 0",
+    "deleted_chunks": "INTEGER NOT NULL DEFAULT 0",
+}
+
+
+class IngestionJobStore:
+    """SQLite-backed table of ingestion jobs, so job state survives restarts."""
+
+    def __init__(self, db_path: Path):
+        self.base_dir = Path(__file__).parent.parent.parent
+        self.db_path = self.base_dir / db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ingestion_jobs (
+                job_id TEXT PRIMARY KEY,
+                experiment_id TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                batch_id TEXT,
+                document_key TEXT,
+                status TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                total_chunks INTEGER NOT NULL DEFAULT 0,
+                embedded_chunks INTEGER NOT NULL DEFAULT 0,
+                indexed_chunks INTEGER NOT NULL DEFAULT 0,
+                reused_chunks INTEGER NOT NULL DEFAULT 0,
+                deleted_chunks INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        columns = {
+            row[1] for row in self._conn.execute("PRAGMA table_info(ingestion_jobs)")
+        }
+        for column, definition in _ADDED_COLUMNS.items():
+            if column not in columns:
+                self._conn.execute(
+                    f"ALTER TABLE ingestion_jobs ADD COLUMN {column} {definition}"
+                )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_status "
+            "ON ingestion_jobs (status)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_batch "
+            "ON ingestion_jobs (batch_id)"
+        )
+        self._conn.commit()
+
+    def _to_row(self, job: IngestionJob) -> tuple:
+        data = job.model_dump(mode="json")
+        return tuple(data[column] for column in _COLUMNS)
+
+    def _from_row(self, row: tuple) -> IngestionJob:
+        return IngestionJob(**dict(zip(_COLUMNS, row)))
+
+    def create(self, job: IngestionJob) -> IngestionJob:
+        self.create_many([job])
+        return job
+
+    def create_many(self, jobs: List[IngestionJob]) -> List[IngestionJob]:
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT INTO ingestion_jobs ({', '.join(_COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                [self._to_row(job) for job in jobs],
+            )
+            self._conn.commit()
+        return jobs
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM ingestion_jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    def update(self, job_id: str, **fields) -> None:
+        """Update the given fields of a job; enum values are stored by value."""
+        fields["updated_at"] = _utcnow()
+        values = [
+            value.value if isinstance(value, Enum) else value
+            for value in fields.values()
+        ]
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE ingestion_jobs SET {assignments} WHERE job_id = ?",
+                (*values, job_id),
+            )
+            self._conn.commit()
+
+    def list_batch(self, batch_id: str) -> List[IngestionJob]:
+        """Return the jobs of a batch in submission order."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM ingestion_jobs "
+                "WHERE batch_id = ? ORDER BY rowid",
+                (batch_id,),
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def list_unfinished(self) -> List[IngestionJob]:
+        """Return queued and running jobs, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM ingestion_jobs "
+                "WHERE status IN (?, ?) ORDER BY created_at",
+                (JobStatus.QUEUED.value, JobStatus.RUNNING.value),
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
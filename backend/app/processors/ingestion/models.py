@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class JobStage(Enum):
+    QUEUED = "queued"
+    PARSING = "parsing"
+    EMBEDDING = "embedding"
+    INDEXING = "indexing"
+    DONE = "done"
+
+
+def _utcnow() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class IngestionJob(BaseModel):
+    """State of a single file ingestion job."""
+
+    job_id: str
+    experiment_id: str
+    file_path: str
+    filename: str
+    # Set for files submitted together and ingested as one batch
+    batch_id: Optional[str] = None
+    # Stable name of the document (upload name or import path); re-ingesting
+    # the same key updates the document instead of adding a copy
+    document_key: Optional[str] = None
+    status: JobStatus = JobStatus.QUEUED
+    stage: JobStage = JobStage.QUEUED
+    total_chunks: int = 0
+    embedded_chunks: int = 0
+    indexed_chunks: int = 0
+    # Chunks already indexed from a previous version of the document
+    reused_chunks: int = 0
+    # Chunks of the previous version that are gone and were deleted
+    deleted_chunks: int = 0
+    error: Optional[str] = None
+    created_at: str = Field(default_factory=_utcnow)
+    updated_at: str = Field(default_factory=_utcnow)
+
+
+class DocumentRecord(BaseModel):
+    """Fingerprint of an ingested document and the number of chunks it holds."""
+
+    experiment_id: str
+    document_key: str
+    filename: str
+    content_hash: str
+    chunk_count: int
+    updated_at: str = Field(default_factory=_utcnow)
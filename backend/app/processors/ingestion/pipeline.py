@@ -0,0 +1,650 @@
+import asyncio
+import logging
+import os
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.processors.embedders import EmbeddingBase
+from app.processors.file_manager import FileProcessor, TextChunk
+from app.processors.retrieval import BM25Index
+from app.processors.vectordb import BaseVectorDB
+from app.utils.executors import run_blocking
+from app.utils.metrics import INGESTED_CHUNKS, span, timed_iter
+
+from .document_registry import DocumentRegistry
+from .fingerprints import chunk_record_id, file_fingerprint
+from .models import IngestionJob, JobStage, JobStatus
+
+ProgressCallback = Callable[..., None]
+# Called as report(job_id, **fields) for the files of a batch
+BatchProgressCallback = Callable[..., None]
+
+# (text, record id, metadata) of a chunk to embed and insert
+_NewChunk = Tuple[str, str, dict]
+
+_DONE = object()
+
+# (experiment id, document key) of a document
+_DocumentId = Tuple[str, str]
+
+
+def _document_id(job: IngestionJob) -> _DocumentId:
+    return job.experiment_id, job.document_key or job.filename
+
+
+class _DocumentLocks:
+    """
+    One asyncio lock per document, so versions of a document and its deletion
+    never overlap. Locks are dropped once no task holds or waits for them.
+    """
+
+    def __init__(self):
+        self._locks: Dict[_DocumentId, asyncio.Lock] = {}
+        self._users: Counter = Counter()
+
+    async def acquire(self, document_id: _DocumentId):
+        lock = self._locks.setdefault(document_id, asyncio.Lock())
+        self._users[document_id] += 1
+        try:
+            await lock.acquire()
+        except BaseException:
+            self._forget(document_id)
+            raise
+
+    def release(self, document_id: _DocumentId):
+        self._locks[document_id].release()
+        self._forget(document_id)
+
+    def _forget(self, document_id: _DocumentId):
+        self._users[document_id] -= 1
+        if not self._users[document_id]:
+            del self._users[document_id]
+            del self._locks[document_id]
+
+    @asynccontextmanager
+    async def hold(self, document_id: _DocumentId):
+        await self.acquire(document_id)
+        try:
+            yield
+        finally:
+            self.release(document_id)
+
+
+@dataclass
+class _Document:
+    """Ingestion state of one version of a document."""
+
+    key: str
+    content_hash: str
+    # Chunk ids of the previously ingested version
+    known_ids: Set[str] = field(default_factory=set)
+    # Chunk ids of this version, in document order
+    record_ids: Dict[str, None] = field(default_factory=dict)
+    unchanged: bool = False
+    parsed: int = 0
+    # Chunks that need embedding; only known once the whole file is parsed
+    total: int = 0
+    embedded: int = 0
+    indexed: int = 0
+    reused: int = 0
+
+
+class IngestionPipeline:
+    """
+    Streams a saved file into its experiment collection.
+
+    Pages are parsed and split in a worker thread, embedded batch by batch and
+    inserted as soon as each batch is embedded. Stages are connected by
+    bounded queues, so memory stays flat regardless of the document size and
+    embedding of early pages overlaps with parsing of later ones.
+
+    Batches of files are parsed in parallel in the shared process pool and
+    their chunks are pooled into shared embedding and insert batches.
+
+    Chunk record ids are derived from the chunk contents. With a
+    `DocumentRegistry`, re-ingesting a document is incremental: an unchanged
+    file is skipped, only new chunks are embedded and chunks that are no
+    longer in the document are deleted. A document is locked from the lookup
+    of its previous version until the new one is recorded, so concurrent jobs
+    and deletions of the same document run one after another.
+    """
+
+    def __init__(
+        self,
+        embedder: EmbeddingBase,
+        vector_db: BaseVectorDB,
+        file_processor: FileProcessor,
+        distance_method: str,
+        batch_size: int = 64,
+        max_buffered_batches: int = 4,
+        on_indexed: Optional[Callable[[str], None]] = None,
+        lexical_index: Optional[BM25Index] = None,
+        parse_concurrency: int = 0,
+        document_registry: Optional[DocumentRegistry] = None,
+    ):
+        self.embedder = embedder
+        self.vector_db = vector_db
+        self.file_processor = file_processor
+        self.distance_method = distance_method
+        self.batch_size = batch_size
+        self.max_buffered_batches = max_buffered_batches
+        # Called with the experiment id whenever the searchable chunks change
+        self.on_indexed = on_indexed
+        # Optional BM25 index updated alongside the vector store
+        self.lexical_index = lexical_index
+        # Files of a batch parsed at the same time; 0 uses one per CPU
+        self.parse_concurrency = parse_concurrency or os.cpu_count()
+        # Optional record of ingested documents used to skip unchanged chunks
+        self.document_registry = document_registry
+        self._document_locks = _DocumentLocks()
+        self.logger = logging.getLogger(__name__)
+
+    async def run(self, job: IngestionJob, report: ProgressCallback) -> int:
+        """Ingest the job's file, reporting per-stage progress through `report`."""
+        async with self._document_locks.hold(_document_id(job)):
+            return await self._run(job, report)
+
+    async def _run(self, job: IngestionJob, report: ProgressCallback) -> int:
+        report(stage=JobStage.PARSING)
+        document = await self._open_document(job)
+        if document.unchanged:
+            report(stage=JobStage.DONE, reused_chunks=document.reused)
+            return 0
+
+        embedded_batches: asyncio.Queue = asyncio.Queue(
+            maxsize=self.max_buffered_batches
+        )
+        producer = asyncio.create_task(
+            self._embed_stage(job, document, embedded_batches, report)
+        )
+        try:
+            indexed = await self._index_stage(job, document, embedded_batches, report)
+            await producer
+        except BaseException:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            raise
+
+        if not document.record_ids:
+            raise ValueError("No text could be extracted from the file.")
+
+        deleted = await self._finalize_document(job, document)
+        report(stage=JobStage.DONE, deleted_chunks=deleted)
+        return indexed
+
+    async def _open_document(self, job: IngestionJob) -> _Document:
+        """Fingerprint the job's file and look up its previously ingested version."""
+        _, key = _document_id(job)
+        content_hash = await run_blocking(file_fingerprint, job.file_path)
+        if self.document_registry is None:
+            return _Document(key=key, content_hash=content_hash)
+
+        record = await run_blocking(self.document_registry.get, job.experiment_id, key)
+        if record is None:
+            return _Document(key=key, content_hash=content_hash)
+        if record.content_hash == content_hash:
+            INGESTED_CHUNKS.inc(record.chunk_count, stage="reused")
+            return _Document(
+                key=key,
+                content_hash=content_hash,
+                unchanged=True,
+                reused=record.chunk_count,
+            )
+
+        known_ids = await run_blocking(
+            self.document_registry.chunk_ids, job.experiment_id, key
+        )
+        return _Document(key=key, content_hash=content_hash, known_ids=known_ids)
+
+    def _select_new_chunks(
+        self, job: IngestionJob, document: _Document, chunks: List[TextChunk]
+    ) -> List[_NewChunk]:
+        """
+        Assign record ids to `chunks` and return the ones that need embedding,
+        skipping repeated and previously indexed chunks.
+        """
+        new_chunks = []
+        reused = document.reused
+        for chunk in chunks:
+            record_id = chunk_record_id(job.experiment_id, document.key, chunk.text)
+            if record_id in document.record_ids:
+                continue
+            document.record_ids[record_id] = None
+            if record_id in document.known_ids:
+                document.reused += 1
+                continue
+            metadata = {
+                "document_key": document.key,
+                "filename": job.filename,
+                "page": chunk.page,
+                "offset": chunk.offset,
+            }
+            new_chunks.append((chunk.text, record_id, metadata))
+        INGESTED_CHUNKS.inc(len(chunks), stage="parsed")
+        INGESTED_CHUNKS.inc(document.reused - reused, stage="reused")
+        return new_chunks
+
+    async def _finalize_document(self, job: IngestionJob, document: _Document) -> int:
+        """
+        Delete the chunks of the previous version that are gone and record the
+        new version. Returns the number of deleted chunks.
+        """
+        known_ids = document.known_ids
+        if self.document_registry is not None:
+            # Read again rather than trusting the lookup made when the
+            # document was opened
+            known_ids = await run_blocking(
+                self.document_registry.chunk_ids, job.experiment_id, document.key
+            )
+        stale = [
+            record_id for record_id in known_ids if record_id not in document.record_ids
+        ]
+        if stale:
+            await self._delete(f"collection_{job.experiment_id}", stale)
+            if self.on_indexed is not None:
+                self.on_indexed(job.experiment_id)
+
+        if self.document_registry is not None:
+            await run_blocking(
+                self.document_registry.replace,
+                job.experiment_id,
+                document.key,
+                job.filename,
+                document.content_hash,
+                list(document.record_ids),
+            )
+        return len(stale)
+
+    async def _embed_stage(
+        self,
+        job: IngestionJob,
+        document: _Document,
+        out: asyncio.Queue,
+        report: ProgressCallback,
+    ):
+        pending: List[_NewChunk] = []
+        # Parsing overlaps embedding, so "parse" is the time spent waiting on it
+        batches = timed_iter(
+            "parse",
+            self.file_processor.stream_chunk_batches(
+                job.file_path,
+                batch_size=self.batch_size,
+                max_buffered=self.max_buffered_batches,
+            ),
+        )
+
+        async def embed(new_chunks: List[_NewChunk]):
+            with span("embed"):
+                embeddings = await self.embedder.aembed_text(
+                    chunks=[text for text, _, _ in new_chunks], as_array=True
+                )
+            INGESTED_CHUNKS.inc(len(new_chunks), stage="embedded")
+            document.embedded += len(new_chunks)
+            report(embedded_chunks=document.embedded)
+            await out.put((new_chunks, embeddings))
+
+        try:
+            async for batch in batches:
+                document.parsed += len(batch)
+                # Reused chunks are dropped, so new ones are regrouped into
+                # full batches before embedding
+                pending += self._select_new_chunks(job, document, batch)
+                report(
+                    stage=JobStage.EMBEDDING,
+                    total_chunks=document.parsed,
+                    reused_chunks=document.reused,
+                )
+                if len(pending) >= self.batch_size:
+                    await embed(pending)
+                    pending = []
+            if pending:
+                await embed(pending)
+        except Exception as e:
+            await out.put(e)
+        else:
+            await out.put(_DONE)
+        finally:
+            await batches.aclose()
+
+    async def _index_stage(
+        self,
+        job: IngestionJob,
+        document: _Document,
+        source: asyncio.Queue,
+        report: ProgressCallback,
+    ) -> int:
+        collection_name = f"collection_{job.experiment_id}"
+        async for new_chunks, embeddings in self._embedded_batches(
+            source, collection_name
+        ):
+            if document.indexed == 0:
+                report(stage=JobStage.INDEXING)
+            await self._insert(
+                collection_name, new_chunks, embeddings, create=document.indexed == 0
+            )
+            document.indexed += len(new_chunks)
+            report(indexed_chunks=document.indexed)
+            if self.on_indexed is not None:
+                self.on_indexed(job.experiment_id)
+        return document.indexed
+
+    async def _embedded_batches(self, source: asyncio.Queue, collection_name: str):
+        """
+        Yield the (chunks, embeddings) batches put on `source` until it is done.
+
+        While a new collection needs a larger first insert (see
+        `BaseVectorDB.initial_batch_size`), batches are held back and merged.
+        """
+        initial_size = await run_blocking(
+            self.vector_db.initial_batch_size, collection_name
+        )
+        held = []
+        while True:
+            item = await source.get()
+            if isinstance(item, Exception):
+                raise item
+            if item is not _DONE:
+                held.append(item)
+                if sum(len(chunks) for chunks, _ in held) < initial_size:
+                    continue
+            if len(held) == 1:
+                yield held[0]
+            elif held:
+                yield (
+                    [chunk for chunks, _ in held for chunk in chunks],
+                    np.concatenate([embeddings for _, embeddings in held]),
+                )
+            held, initial_size = [], 0
+            if item is _DONE:
+                return
+
+    async def _insert(
+        self,
+        collection_name: str,
+        new_chunks: List[_NewChunk],
+        embeddings: np.ndarray,
+        create: bool = False,
+    ):
+        if create:
+            await self.vector_db.acreate_collection(
+                collection_name=collection_name,
+                embedding_size=embeddings.shape[1],
+                distance_method=self.distance_method,
+            )
+
+        texts, record_ids, metadata = (list(field) for field in zip(*new_chunks))
+        with span("vector_insert"):
+            inserted = await self.vector_db.ainsert_many(
+                collection_name=collection_name,
+                texts=texts,
+                vectors=embeddings,
+                metadata=metadata,
+                record_ids=record_ids,
+            )
+        if inserted is False:
+            raise RuntimeError(f"Failed to insert chunks into {collection_name}")
+        if self.lexical_index is not None:
+            with span("lexical_insert"):
+                await run_blocking(
+                    self.lexical_index.add, collection_name, record_ids, texts, metadata
+                )
+        INGESTED_CHUNKS.inc(len(texts), stage="indexed")
+
+    async def _delete(self, collection_name: str, record_ids: List[str]):
+        deleted = await self.vector_db.adelete_by_ids(
+            collection_name=collection_name, record_ids=record_ids
+        )
+        # Providers return False for a missing collection too, which leaves
+        # nothing to delete
+        if deleted is False and await run_blocking(
+            self.vector_db.is_collection_exist, collection_name
+        ):
+            raise RuntimeError(f"Failed to delete chunks from {collection_name}")
+        if self.lexical_index is not None:
+            await run_blocking(self.lexical_index.delete, collection_name, record_ids)
+
+    async def delete_document(
+        self, experiment_id: str, document_key: str
+    ) -> Optional[int]:
+        """
+        Delete a document's chunks and forget the document. Returns the number
+        of deleted chunks, or None if the document is not registered.
+        """
+        if self.document_registry is None:
+            return None
+
+        async with self._document_locks.hold((experiment_id, document_key)):
+            record = await run_blocking(
+                self.document_registry.get, experiment_id, document_key
+            )
+            if record is None:
+                return None
+
+            record_ids = await run_blocking(
+                self.document_registry.chunk_ids, experiment_id, document_key
+            )
+            if record_ids:
+                await self._delete(f"collection_{experiment_id}", list(record_ids))
+            await run_blocking(
+                self.document_registry.delete, experiment_id, document_key
+            )
+        if self.on_indexed is not None:
+            self.on_indexed(experiment_id)
+        return len(record_ids)
+
+    async def run_batch(
+        self, jobs: List[IngestionJob], report: BatchProgressCallback
+    ) -> int:
+        """
+        Ingest the files of one experiment as a single stream.
+
+        Progress and the final status of every file are reported through
+        `report(job_id, **fields)`. A file that cannot be parsed is marked as
+        failed without stopping the rest of the batch; errors while embedding
+        or inserting are raised.
+
+        The documents of the batch stay locked until it ends. Files with the
+        same document key as an earlier file of the batch are ingested after
+        it, in a second stream.
+        """
+        stream, repeated, document_ids = [], [], set()
+        for job in jobs:
+            if _document_id(job) in document_ids:
+                repeated.append(job)
+            else:
+                stream.append(job)
+                document_ids.add(_document_id(job))
+
+        # Locks are taken in a fixed order, so two batches sharing documents
+        # cannot each hold one the other waits for
+        locked = []
+        try:
+            for document_id in sorted(document_ids):
+                await self._document_locks.acquire(document_id)
+                locked.append(document_id)
+            indexed = await self._run_stream(stream, report)
+        finally:
+            for document_id in locked:
+                self._document_locks.release(document_id)
+
+        if repeated:
+            indexed += await self.run_batch(repeated, report)
+        return indexed
+
+    async def _run_stream(
+        self, jobs: List[IngestionJob], report: BatchProgressCallback
+    ) -> int:
+        documents: Dict[str, _Document] = {}
+        embedded_batches: asyncio.Queue = asyncio.Queue(
+            maxsize=self.max_buffered_batches
+        )
+        producer = asyncio.create_task(
+            self._embed_files_stage(jobs, documents, embedded_batches, report)
+        )
+        try:
+            indexed = await self._index_files_stage(
+                jobs, documents, embedded_batches, report
+            )
+            await producer
+        except BaseException:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            raise
+        return indexed
+
+    async def _parse_document(
+        self, job: IngestionJob
+    ) -> Tuple[_Document, Optional[List[TextChunk]]]:
+        """Open a document of a batch and parse it unless it is unchanged."""
+        document = await self._open_document(job)
+        if document.unchanged:
+            return document, None
+        with span("parse"):
+            chunks = await self.file_processor.parse_in_process(job.file_path)
+        return document, chunks
+
+    async def _complete_document(
+        self, job: IngestionJob, document: _Document, report: BatchProgressCallback
+    ):
+        deleted = await self._finalize_document(job, document)
+        report(
+            job.job_id,
+            status=JobStatus.COMPLETED,
+            stage=JobStage.DONE,
+            indexed_chunks=document.indexed,
+            deleted_chunks=deleted,
+        )
+
+    async def _embed_files_stage(
+        self,
+        jobs: List[IngestionJob],
+        documents: Dict[str, _Document],
+        out: asyncio.Queue,
+        report: BatchProgressCallback,
+    ):
+        remaining = iter(jobs)
+        parsing: Dict[asyncio.Task, IngestionJob] = {}
+        # (job id, chunk) of chunks waiting to be embedded
+        pending: List[Tuple[str, _NewChunk]] = []
+
+        def parse_next():
+            job = next(remaining, None)
+            if job is not None:
+                report(job.job_id, stage=JobStage.PARSING)
+                parsing[asyncio.create_task(self._parse_document(job))] = job
+
+        async def embed(batch: List[Tuple[str, _NewChunk]]):
+            with span("embed"):
+                embeddings = await self.embedder.aembed_text(
+                    chunks=[text for _, (text, _, _) in batch], as_array=True
+                )
+            INGESTED_CHUNKS.inc(len(batch), stage="embedded")
+            for job_id, count in Counter(job_id for job_id, _ in batch).items():
+                documents[job_id].embedded += count
+                report(job_id, embedded_chunks=documents[job_id].embedded)
+            await out.put((batch, embeddings))
+
+        try:
+            for _ in range(self.parse_concurrency):
+                parse_next()
+
+            # Files are consumed in the order they finish parsing; a new file
+            # is only started once a parsed one has been taken, so at most
+            # `parse_concurrency` parsed files are held in memory
+            while parsing:
+                done, _ = await asyncio.wait(
+                    parsing, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    job = parsing.pop(task)
+                    parse_next()
+                    try:
+                        document, chunks = task.result()
+                    except Exception as e:
+                        self.logger.error(f"Failed to parse {job.filename}: {e}")
+                        report(job.job_id, status=JobStatus.FAILED, error=str(e))
+                        continue
+
+                    if document.unchanged:
+                        report(
+                            job.job_id,
+                            status=JobStatus.COMPLETED,
+                            stage=JobStage.DONE,
+                            reused_chunks=document.reused,
+                        )
+                        continue
+                    if not chunks:
+                        report(
+                            job.job_id,
+                            status=JobStatus.FAILED,
+                            error="No text could be extracted from the file.",
+                        )
+                        continue
+
+                    new_chunks = self._select_new_chunks(job, document, chunks)
+                    document.parsed = len(chunks)
+                    document.total = len(new_chunks)
+                    documents[job.job_id] = document
+                    report(
+                        job.job_id,
+                        stage=JobStage.EMBEDDING,
+                        total_chunks=document.parsed,
+                        reused_chunks=document.reused,
+                    )
+                    if not new_chunks:
+                        await self._complete_document(job, document, report)
+                        continue
+
+                    for new_chunk in new_chunks:
+                        pending.append((job.job_id, new_chunk))
+                        if len(pending) >= self.batch_size:
+                            await embed(pending)
+                            pending = []
+            if pending:
+                await embed(pending)
+        except Exception as e:
+            await out.put(e)
+        else:
+            await out.put(_DONE)
+        finally:
+            for task in parsing:
+                task.cancel()
+
+    async def _index_files_stage(
+        self,
+        jobs: List[IngestionJob],
+        documents: Dict[str, _Document],
+        source: asyncio.Queue,
+        report: BatchProgressCallback,
+    ) -> int:
+        jobs_by_id = {job.job_id: job for job in jobs}
+        experiment_id = jobs[0].experiment_id
+        collection_name = f"collection_{experiment_id}"
+        indexed = 0
+        async for batch, embeddings in self._embedded_batches(source, collection_name):
+            await self._insert(
+                collection_name,
+                [new_chunk for _, new_chunk in batch],
+                embeddings,
+                create=indexed == 0,
+            )
+            indexed += len(batch)
+            if self.on_indexed is not None:
+                self.on_indexed(experiment_id)
+
+            for job_id, count in Counter(job_id for job_id, _ in batch).items():
+                document = documents[job_id]
+                document.indexed += count
+                if document.indexed >= document.total:
+                    await self._complete_document(jobs_by_id[job_id], document, report)
+                else:
+                    report(
+                        job_id,
+                        stage=JobStage.INDEXING,
+                        indexed_chunks=document.indexed,
+                    )
+        return indexed
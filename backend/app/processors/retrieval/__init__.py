@@ -0,0 +1,11 @@
+from .bm25_index import BM25Index, tokenize
+from .reranker import CrossEncoderReranker
+from .retriever import Retriever, reciprocal_rank_fusion
+
+__all__ = [
+    "BM25Index",
+    "CrossEncoderReranker",
+    "Retriever",
+    "reciprocal_rank_fusion",
+    "tokenize",
+]
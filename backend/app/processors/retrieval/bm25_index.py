@@ -0,0 +1,311 @@
+import heapq
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.processors.vectordb.models import RetrievedDocument, SearchFilter
+from app.utils.locks import ReadWriteLock
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-_./][a-z0-9]+)*")
+_PART_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Chunk metadata columns added to existing indexes, used to filter searches
+_ADDED_COLUMNS = {
+    "document_key": "TEXT",
+    "page": "INTEGER",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase word tokens. Compound tokens such as part numbers, error codes or
+    versions ("E-1234", "v2.3.1") are kept whole and also split into parts.
+    """
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        parts = _PART_PATTERN.findall(token)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+class _CollectionIndex:
+    """
+    Inverted index of one collection stored in SQLite.
+
+    Postings are kept in a WITHOUT ROWID table clustered by term id, so the
+    postings of a query term are read with a single range scan. Documents keep
+    the `document_key` and `page` of their chunk metadata for filtering.
+    """
+
+    def __init__(self, db_path: str):
+        # Searches share the connection; adds and deletes are exclusive
+        self.lock = ReadWriteLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS docs (
+                doc INTEGER PRIMARY KEY,
+                record_id TEXT NOT NULL UNIQUE,
+                text TEXT NOT NULL,
+                length INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS terms (
+                term_id INTEGER PRIMARY KEY,
+                term TEXT NOT NULL UNIQUE,
+                df INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term_id INTEGER NOT NULL,
+                doc INTEGER NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term_id, doc)
+            ) WITHOUT ROWID;
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(docs)")}
+        for column, definition in _ADDED_COLUMNS.items():
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE docs ADD COLUMN {column} {definition}")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_docs_document_page "
+            "ON docs (document_key, page)"
+        )
+        self._conn.commit()
+        self.doc_count, self.total_length = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs"
+        ).fetchone()
+
+    def _term_ids(self, terms) -> Dict[str, int]:
+        term_ids = {}
+        terms = list(terms)
+        for i in range(0, len(terms), 500):
+            batch = terms[i : i + 500]
+            placeholders = ", ".join("?" for _ in batch)
+            term_ids.update(
+                self._conn.execute(
+                    f"SELECT term, term_id FROM terms WHERE term IN ({placeholders})",
+                    batch,
+                ).fetchall()
+            )
+        return term_ids
+
+    def _remove(self, record_id: str):
+        row = self._conn.execute(
+            "SELECT doc, length FROM docs WHERE record_id = ?", (record_id,)
+        ).fetchone()
+        if row is None:
+            return
+        doc, length = row
+        self._conn.execute(
+            "UPDATE terms SET df = df - 1 WHERE term_id IN "
+            "(SELECT term_id FROM postings WHERE doc = ?)",
+            (doc,),
+        )
+        self._conn.execute("DELETE FROM postings WHERE doc = ?", (doc,))
+        self._conn.execute("DELETE FROM docs WHERE doc = ?", (doc,))
+        self.doc_count -= 1
+        self.total_length -= length
+
+    def add(
+        self,
+        record_ids: List[str],
+        texts: List[str],
+        metadata: Optional[List[Optional[dict]]] = None,
+    ):
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        for record_id, text, meta in zip(record_ids, texts, metadata):
+            self._remove(record_id)
+
+            meta = meta or {}
+            counts = Counter(tokenize(text))
+            length = sum(counts.values())
+            doc = self._conn.execute(
+                "INSERT INTO docs (record_id, text, length, document_key, page) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (record_id, text, length, meta.get("document_key"), meta.get("page")),
+            ).lastrowid
+
+            self._conn.executemany(
+                "INSERT INTO terms (term, df) VALUES (?, 1) "
+                "ON CONFLICT(term) DO UPDATE SET df = df + 1",
+                [(term,) for term in counts],
+            )
+            term_ids = self._term_ids(counts)
+            self._conn.executemany(
+                "INSERT INTO postings (term_id, doc, tf) VALUES (?, ?, ?)",
+                [(term_ids[term], doc, tf) for term, tf in counts.items()],
+            )
+            self.doc_count += 1
+            self.total_length += length
+        self._conn.commit()
+
+    def delete(self, record_ids: List[str]):
+        for record_id in record_ids:
+            self._remove(record_id)
+        self._conn.commit()
+
+    def _filter_clause(self, filters: Optional[SearchFilter]):
+        """SQL conditions on the `docs` table (aliased `d`) and their params."""
+        if filters is None or filters.is_empty:
+            return "", []
+
+        conditions, params = [], []
+        if filters.document_keys:
+            placeholders = ", ".join("?" for _ in filters.document_keys)
+            conditions.append(f"d.document_key IN ({placeholders})")
+            params.extend(filters.document_keys)
+        if filters.page_from is not None:
+            conditions.append("d.page >= ?")
+            params.append(filters.page_from)
+        if filters.page_to is not None:
+            conditions.append("d.page <= ?")
+            params.append(filters.page_to)
+        return " AND " + " AND ".join(conditions), params
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        k1: float = 1.5,
+        b: float = 0.75,
+        filters: Optional[SearchFilter] = None,
+    ) -> List[RetrievedDocument]:
+        terms = set(tokenize(query))
+        if not terms or self.doc_count == 0:
+            return []
+
+        average_length = self.total_length / self.doc_count
+        filter_clause, filter_params = self._filter_clause(filters)
+        scores: Dict[int, float] = {}
+        placeholders = ", ".join("?" for _ in terms)
+        term_stats = self._conn.execute(
+            f"SELECT term_id, df FROM terms WHERE term IN ({placeholders})",
+            list(terms),
+        ).fetchall()
+        for term_id, df in term_stats:
+            if df <= 0:
+                continue
+            idf = math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+            postings = self._conn.execute(
+                "SELECT p.doc, p.tf, d.length FROM postings p "
+                f"JOIN docs d ON d.doc = p.doc WHERE p.term_id = ?{filter_clause}",
+                [term_id, *filter_params],
+            )
+            for doc, tf, length in postings:
+                norm = k1 * (1 - b + b * length / average_length)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        if not top:
+            return []
+
+        placeholders = ", ".join("?" for _ in top)
+        docs = {
+            doc: (record_id, text, document_key, page)
+            for doc, record_id, text, document_key, page in self._conn.execute(
+                "SELECT doc, record_id, text, document_key, page FROM docs "
+                f"WHERE doc IN ({placeholders})",
+                [doc for doc, _ in top],
+            )
+        }
+        return [
+            RetrievedDocument(
+                score=score,
+                text=docs[doc][1],
+                record_id=docs[doc][0],
+                metadata=(
+                    {"document_key": docs[doc][2], "page": docs[doc][3]}
+                    if docs[doc][2] is not None
+                    else None
+                ),
+            )
+            for doc, score in top
+        ]
+
+    def close(self):
+        self._conn.close()
+
+
+class BM25Index:
+    """
+    Lexical BM25 index with one on-disk inverted index per collection.
+
+    Documents are added incrementally at ingestion time, keyed by the same
+    record ids as the vector store, so both rankings can be fused.
+    """
+
+    def __init__(self, index_path: Path):
+        self.base_dir = Path(__file__).parent.parent.parent
+        self.index_path = self.base_dir / index_path
+        self.index_path.mkdir(parents=True, exist_ok=True)
+        self._collections: Dict[str, _CollectionIndex] = {}
+        # Guards `_collections` only; each collection has its own lock
+        self._lock = threading.Lock()
+
+    def _get(self, collection_name: str) -> _CollectionIndex:
+        with self._lock:
+            collection = self._collections.get(collection_name)
+            if collection is None:
+                collection = _CollectionIndex(
+                    str(self.index_path / f"{collection_name}.sqlite3")
+                )
+                self._collections[collection_name] = collection
+            return collection
+
+    def add(
+        self,
+        collection_name: str,
+        record_ids: List[str],
+        texts: List[str],
+        metadata: Optional[List[Optional[dict]]] = None,
+    ):
+        collection = self._get(collection_name)
+        with collection.lock.write():
+            collection.add([str(i) for i in record_ids], texts, metadata)
+
+    def delete(self, collection_name: str, record_ids: List[str]):
+        collection = self._get(collection_name)
+        with collection.lock.write():
+            collection.delete([str(i) for i in record_ids])
+
+    def search(
+        self,
+        collection_name: str,
+        query: str,
+        limit: int,
+        filters: Optional[SearchFilter] = None,
+    ) -> List[RetrievedDocument]:
+        if not os.path.exists(self.index_path / f"{collection_name}.sqlite3"):
+            return []
+        collection = self._get(collection_name)
+        with collection.lock.read():
+            return collection.search(query, limit, filters=filters)
+
+    def delete_collection(self, collection_name: str):
+        with self._lock:
+            collection = self._collections.pop(collection_name, None)
+            if collection is not None:
+                with collection.lock.write():
+                    collection.close()
+            path = self.index_path / f"{collection_name}.sqlite3"
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(f"{path}{suffix}"):
+                    os.remove(f"{path}{suffix}")
+
+    def close(self):
+        with self._lock:
+            for collection in self._collections.values():
+                with collection.lock.write():
+                    collection.close()
+            self._collections = {}
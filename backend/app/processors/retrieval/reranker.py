@@ -0,0 +1,105 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Tuple
+
+from app.processors.vectordb.models import RetrievedDocument
+from app.utils.metrics import CACHE_REQUESTS
+
+
+class CrossEncoderReranker:
+    """
+    Rescores retrieved chunks with a local cross-encoder.
+
+    Every (question, chunk) pair is scored jointly by the model, which ranks
+    far better than embedding similarity but costs a forward pass per pair.
+    Pairs are scored in batches of `batch_size` and the scores are kept in an
+    LRU cache of `cache_size` entries keyed by (question, chunk id), so
+    repeated questions only pay for chunks they have not seen before.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        batch_size: int = 32,
+        cache_size: int = 10000,
+        max_length: int = 512,
+        device: str = "cpu",
+    ):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.max_length = max_length
+        self.device = device
+        self.model = None
+        self._cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.logger = logging.getLogger(__name__)
+        self.connect()
+
+    def connect(self):
+        """Load the cross-encoder model."""
+        try:
+            from sentence_transformers import CrossEncoder
+        except ImportError:
+            raise ImportError("Please install the sentence-transformers package")
+
+        self.model = CrossEncoder(
+            self.model_name, max_length=self.max_length, device=self.device
+        )
+        self.logger.info(f"Loaded cross-encoder {self.model_name} on {self.device}")
+
+    @staticmethod
+    def _chunk_key(document: RetrievedDocument) -> str:
+        if document.record_id:
+            return document.record_id
+        return hashlib.sha1(document.text.encode("utf-8")).hexdigest()
+
+    def rerank(
+        self, question: str, documents: List[RetrievedDocument], limit: int
+    ) -> List[RetrievedDocument]:
+        """Return the `limit` documents the cross-encoder scores highest."""
+        if not documents:
+            return []
+
+        keys = [(question, self._chunk_key(document)) for document in documents]
+        scores = [None] * len(documents)
+        with self._lock:
+            for i, key in enumerate(keys):
+                score = self._cache.get(key)
+                if score is not None:
+                    self._cache.move_to_end(key)
+                    scores[i] = score
+        missing = [i for i, score in enumerate(scores) if score is None]
+        self.cache_hits += len(documents) - len(missing)
+        self.cache_misses += len(missing)
+        CACHE_REQUESTS.inc(len(documents) - len(missing), cache="rerank", result="hit")
+        CACHE_REQUESTS.inc(len(missing), cache="rerank", result="miss")
+
+        if missing:
+            predicted = self.model.predict(
+                [(question, documents[i].text) for i in missing],
+                batch_size=self.batch_size,
+                show_progress_bar=False,
+            )
+            with self._lock:
+                for i, score in zip(missing, predicted):
+                    scores[i] = float(score)
+                    self._cache[keys[i]] = scores[i]
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        order = sorted(range(len(documents)), key=scores.__getitem__, reverse=True)
+        ranked = [(scores[i], documents[i]) for i in order[:limit]]
+        return [
+            RetrievedDocument(
+                score=score,
+                text=document.text,
+                record_id=document.record_id,
+                metadata=document.metadata,
+            )
+            for score, document in ranked
+        ]
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from app.processors.vectordb import BaseVectorDB
+from app.processors.vectordb.models import RetrievedDocument, SearchFilter
+from app.utils.executors import run_blocking
+from app.utils.metrics import span, timed
+
+from .bm25_index import BM25Index
+from .reranker import CrossEncoderReranker
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[RetrievedDocument]], limit: int, k: int = 60
+) -> List[RetrievedDocument]:
+    """
+    Fuse several rankings with reciprocal rank fusion.
+
+    Each document scores sum(1 / (k + rank)) over the rankings it appears in;
+    documents are matched by record id, falling back to their text.
+    """
+    scores: Dict[str, float] = {}
+    documents: Dict[str, RetrievedDocument] = {}
+    for ranking in rankings:
+        for rank, document in enumerate(ranking, start=1):
+            key = document.record_id or document.text
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            documents.setdefault(key, document)
+
+    fused = sorted(scores, key=scores.get, reverse=True)[:limit]
+    return [
+        RetrievedDocument(
+            score=scores[key],
+            text=documents[key].text,
+            record_id=documents[key].record_id,
+            metadata=documents[key].metadata,
+        )
+        for key in fused
+    ]
+
+
+class Retriever:
+    """
+    Retrieves the chunks most relevant to a question.
+
+    Uses vector search alone, or, when a `BM25Index` is given, fuses the top
+    `candidates` of vector and BM25 search with reciprocal rank fusion so that
+    exact identifiers (part numbers, error codes, acronyms) are not missed.
+
+    With a `CrossEncoderReranker`, the top `rerank_candidates` hits are
+    over-fetched first and the reranker picks the final `limit` chunks.
+
+    A `SearchFilter` restricts both vector and BM25 search to the chunks of
+    some documents or pages.
+    """
+
+    def __init__(
+        self,
+        vector_db: BaseVectorDB,
+        lexical_index: Optional[BM25Index] = None,
+        candidates: int = 20,
+        rrf_k: int = 60,
+        reranker: Optional[CrossEncoderReranker] = None,
+        rerank_candidates: int = 50,
+    ):
+        self.vector_db = vector_db
+        self.lexical_index = lexical_index
+        self.candidates = candidates
+        self.rrf_k = rrf_k
+        self.reranker = reranker
+        self.rerank_candidates = rerank_candidates
+        self.logger = logging.getLogger(__name__)
+
+    async def asearch(
+        self,
+        collection_name: str,
+        query: str,
+        vector: list,
+        limit: int,
+        filters: Optional[SearchFilter] = None,
+    ) -> List[RetrievedDocument]:
+        if self.reranker is None:
+            return await self._retrieve(collection_name, query, vector, limit, filters)
+
+        candidates = await self._retrieve(
+            collection_name, query, vector, max(self.rerank_candidates, limit), filters
+        )
+        with span("rerank"):
+            return await run_blocking(self.reranker.rerank, query, candidates, limit)
+
+    async def _retrieve(
+        self,
+        collection_name: str,
+        query: str,
+        vector: list,
+        limit: int,
+        filters: Optional[SearchFilter] = None,
+    ) -> List[RetrievedDocument]:
+        if self.lexical_index is None:
+            with span("vector_search"):
+                return await self.vector_db.asearch_by_vector(
+                    collection_name=collection_name,
+                    vector=vector,
+                    limit=limit,
+                    filters=filters,
+                )
+
+        candidates = max(self.candidates, limit)
+        vector_hits, lexical_hits = await asyncio.gather(
+            timed(
+                "vector_search",
+                self.vector_db.asearch_by_vector(
+                    collection_name=collection_name,
+                    vector=vector,
+                    limit=candidates,
+                    filters=filters,
+                ),
+            ),
+            timed(
+                "lexical_search",
+                run_blocking(
+                    self.lexical_index.search,
+                    collection_name,
+                    query,
+                    candidates,
+                    filters=filters,
+                ),
+            ),
+        )
+        return reciprocal_rank_fusion(
+            [vector_hits, lexical_hits], limit=limit, k=self.rrf_k
+        )
@@ -1,15 +1,30 @@
-from .enums import VectorDBType
+from .enums import EmbeddingProjectionMethod, VectorDBType, VectorQuantization
 from .factory import VectorDBFactory
-from .models import VectorDBConfig
-from .providers.base import BaseVectorDB
-from .providers.chroma_vecdb import ChromaVectorDB
-from .providers.qdrant_vecdb import QdrantVectorDB
+from .models import RetrievedDocument, SearchFilter, VectorDBConfig
+from .projection import EmbeddingProjection, ProjectedVectorDB
+from .providers import BaseVectorDB
 
 __all__ = [
     "BaseVectorDB",
     "ChromaVectorDB",
+    "EmbeddingProjection",
+    "EmbeddingProjectionMethod",
+    "NumpyVectorDB",
+    "ProjectedVectorDB",
     "QdrantVectorDB",
+    "RetrievedDocument",
+    "SearchFilter",
     "VectorDBConfig",
     "VectorDBType",
+    "VectorQuantization",
     "VectorDBFactory",
 ]
+
+
+def __getattr__(name: str):
+    # Providers are loaded on first access, see `providers/__init__.py`
+    if name in ("ChromaVectorDB", "NumpyVectorDB", "QdrantVectorDB"):
+        from . import providers
+
+        return getattr(providers, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
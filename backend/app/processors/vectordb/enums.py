@@ -6,8 +6,27 @@ class VectorDBType(Enum):
     MILVUS = "milvus"
     FAISS = "faiss"
     CHROMA = "chroma"
+    NUMPY = "numpy"
 
 
 class DistanceMethod(Enum):
     COSINE = "cosine"
     DOT = "dot"
+
+
+class FaissIndexType(Enum):
+    FLAT = "flat"
+    IVF_PQ = "ivfpq"
+    HNSW = "hnsw"
+
+
+class VectorQuantization(Enum):
+    NONE = "none"
+    INT8 = "int8"
+    BINARY = "binary"
+
+
+class EmbeddingProjectionMethod(Enum):
+    NONE = "none"
+    TRUNCATE = "truncate"
+    PCA = "pca"
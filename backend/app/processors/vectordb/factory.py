@@ -1,6 +1,8 @@
+import logging
 import os
 
-from .enums import VectorDBType
+from .enums import EmbeddingProjectionMethod, VectorDBType, VectorQuantization
+from .projection import ProjectedVectorDB
 from .providers import BaseVectorDB
 
 
@@ -10,6 +12,19 @@ class VectorDBFactory:
     def create(
         vector_db_type: str,
         db_path: str,
+        qdrant_url: str = None,
+        qdrant_api_key: str = None,
+        faiss_index_type: str = "flat",
+        faiss_nlist: int = 1024,
+        faiss_nprobe: int = 16,
+        faiss_pq_m: int = 16,
+        faiss_hnsw_m: int = 32,
+        faiss_hnsw_ef_search: int = 64,
+        quantization: str = VectorQuantization.NONE.value,
+        quantization_oversampling: float = 4.0,
+        projection: str = EmbeddingProjectionMethod.NONE.value,
+        projection_dimension: int = 256,
+        projection_fit_samples: int = 2048,
     ) -> BaseVectorDB:
         db_path = os.path.join(
             os.path.dirname(
@@ -19,17 +34,66 @@ class VectorDBFactory:
             ),
             db_path,
         )
+        # Chroma has no quantization; FAISS compresses with FAISS_INDEX_TYPE=ivfpq
+        if quantization != VectorQuantization.NONE.value and vector_db_type in (
+            VectorDBType.CHROMA.value,
+            VectorDBType.FAISS.value,
+        ):
+            logging.getLogger(__name__).warning(
+                f"Vector quantization is not supported by {vector_db_type}; "
+                "vectors are stored at full precision."
+            )
+
         if vector_db_type == VectorDBType.QDRANT.value:
             from .providers import QdrantVectorDB
 
-            return QdrantVectorDB(
+            vector_db = QdrantVectorDB(
                 db_path=db_path,
+                url=qdrant_url or None,
+                api_key=qdrant_api_key or None,
+                quantization=quantization,
+                oversampling=quantization_oversampling,
             )
         elif vector_db_type == VectorDBType.CHROMA.value:
             from .providers import ChromaVectorDB
 
-            return ChromaVectorDB(
+            vector_db = ChromaVectorDB(
+                db_path=db_path,
+            )
+        elif vector_db_type == VectorDBType.NUMPY.value:
+            from .providers import NumpyVectorDB
+
+            vector_db = NumpyVectorDB(
                 db_path=db_path,
+                quantization=quantization,
+                oversampling=quantization_oversampling,
+            )
+        elif vector_db_type == VectorDBType.FAISS.value:
+            from .providers.faiss_vecdb import FaissVectorDB
+
+            vector_db = FaissVectorDB(
+                db_path=db_path,
+                index_type=faiss_index_type,
+                nlist=faiss_nlist,
+                nprobe=faiss_nprobe,
+                pq_m=faiss_pq_m,
+                hnsw_m=faiss_hnsw_m,
+                hnsw_ef_search=faiss_hnsw_ef_search,
             )
         else:
             raise ValueError(f"Invalid vector DB provider type: {vector_db_type}")
+
+        # Projections are saved next to the collections; the wrapper is also
+        # needed with projection "none" to search collections projected before
+        projections_dir = os.path.join(db_path, "projections")
+        if projection == EmbeddingProjectionMethod.NONE.value and not os.path.isdir(
+            projections_dir
+        ):
+            return vector_db
+        return ProjectedVectorDB(
+            vector_db,
+            projections_dir=projections_dir,
+            method=projection,
+            output_dim=projection_dimension,
+            fit_samples=projection_fit_samples,
+        )
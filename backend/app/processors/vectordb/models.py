@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -7,6 +8,43 @@ from pydantic import BaseModel
 class RetrievedDocument:
     score: float
     text: str
+    record_id: Optional[str] = None
+    metadata: Optional[dict] = None
+
+
+@dataclass
+class SearchFilter:
+    """
+    Restricts a search to the chunks of some documents and/or a page range.
+
+    Matches the `document_key` and `page` fields of chunk metadata; pages are
+    0-based and the range is inclusive. Unset fields do not restrict.
+    """
+
+    document_keys: Optional[List[str]] = None
+    page_from: Optional[int] = None
+    page_to: Optional[int] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return (
+            not self.document_keys and self.page_from is None and self.page_to is None
+        )
+
+    def matches(self, metadata: Optional[dict]) -> bool:
+        metadata = metadata or {}
+        document_key = metadata.get("document_key")
+        if self.document_keys and document_key not in self.document_keys:
+            return False
+        if self.page_from is None and self.page_to is None:
+            return True
+
+        page = metadata.get("page")
+        if page is None:
+            return False
+        if self.page_from is not None and page < self.page_from:
+            return False
+        return self.page_to is None or page <= self.page_to
 
 
 class VectorDBConfig(BaseModel):
@@ -0,0 +1,372 @@
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.executors import run_blocking
+
+from .enums import EmbeddingProjectionMethod
+from .models import RetrievedDocument, SearchFilter
+from .providers.base import BaseVectorDB
+
+
+class EmbeddingProjection:
+    """
+    Maps embeddings to fewer dimensions before they are stored or searched.
+
+    `truncate` keeps the first `output_dim` dimensions, which is how
+    Matryoshka-trained models (OpenAI text-embedding-3, Nomic, ...) are meant
+    to be shortened. `pca` projects onto the top principal components of a
+    sample of the collection's own vectors. Projected vectors are
+    L2-normalized, so cosine and dot similarities stay comparable.
+    """
+
+    def __init__(
+        self,
+        method: str,
+        input_dim: int,
+        output_dim: int,
+        mean: Optional[np.ndarray] = None,
+        components: Optional[np.ndarray] = None,
+    ):
+        self.method = method
+        self.input_dim = input_dim
+        self.output_dim = output_dim
+        # PCA only: the sample mean and the (output_dim, input_dim) components
+        self.mean = mean
+        self.components = components
+
+    @classmethod
+    def fit_pca(cls, vectors, output_dim: int) -> "EmbeddingProjection":
+        matrix = np.asarray(vectors, dtype=np.float32)
+        mean = matrix.mean(axis=0)
+        _, _, components = np.linalg.svd(matrix - mean, full_matrices=False)
+        return cls(
+            method=EmbeddingProjectionMethod.PCA.value,
+            input_dim=matrix.shape[1],
+            output_dim=output_dim,
+            mean=mean,
+            components=np.ascontiguousarray(components[:output_dim]),
+        )
+
+    def transform(self, vectors) -> np.ndarray:
+        """Project a (n, input_dim) matrix, or a single vector, to `output_dim`."""
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.shape[-1] != self.input_dim:
+            raise ValueError(
+                f"Expected {self.input_dim}-dimensional vectors, "
+                f"got {matrix.shape[-1]} dimensions"
+            )
+        if self.method == EmbeddingProjectionMethod.PCA.value:
+            projected = (matrix - self.mean) @ self.components.T
+        else:
+            projected = matrix[..., : self.output_dim]
+        norms = np.linalg.norm(projected, axis=-1, keepdims=True)
+        return projected / np.where(norms == 0, 1, norms)
+
+    def describe(self) -> dict:
+        return {
+            "method": self.method,
+            "input_dim": self.input_dim,
+            "output_dim": self.output_dim,
+        }
+
+    def save(self, path: str):
+        arrays = {
+            "method": np.array(self.method),
+            "dims": np.array([self.input_dim, self.output_dim]),
+        }
+        if self.components is not None:
+            arrays.update(mean=self.mean, components=self.components)
+        # Written to a temporary file first so a crash never leaves half a file
+        with open(f"{path}.tmp", "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(f"{path}.tmp", path)
+
+    @classmethod
+    def load(cls, path: str) -> "EmbeddingProjection":
+        with np.load(path) as data:
+            input_dim, output_dim = (int(dim) for dim in data["dims"])
+            return cls(
+                method=str(data["method"]),
+                input_dim=input_dim,
+                output_dim=output_dim,
+                mean=data["mean"] if "mean" in data else None,
+                components=data["components"] if "components" in data else None,
+            )
+
+
+class ProjectedVectorDB(BaseVectorDB):
+    """
+    Stores the collections of another vector DB at a reduced dimension.
+
+    The projection of a collection is chosen when it is created, from
+    `method` and `output_dim`, and saved as `<collection>.npz` in
+    `projections_dir`. Inserted vectors and query vectors of the collection
+    are transformed with the saved projection, so changing the settings only
+    affects new collections. Collections without a saved projection are
+    passed through unchanged.
+
+    PCA collections are created on their first insert: the projection is
+    fitted on the vectors of that insert, so callers should make it at least
+    `initial_batch_size()` vectors. A first insert with fewer vectors than
+    `output_dim` leaves the collection at full size.
+    """
+
+    def __init__(
+        self,
+        vector_db: BaseVectorDB,
+        projections_dir: str,
+        method: str = EmbeddingProjectionMethod.NONE.value,
+        output_dim: int = 256,
+        fit_samples: int = 2048,
+    ):
+        if method not in (m.value for m in EmbeddingProjectionMethod):
+            raise ValueError(f"Invalid embedding projection method: {method}")
+        self.vector_db = vector_db
+        self.projections_dir = projections_dir
+        self.method = method
+        self.output_dim = output_dim
+        self.fit_samples = max(fit_samples, output_dim)
+        self._projections: Dict[str, Optional[EmbeddingProjection]] = {}
+        # PCA collections awaiting their first insert: (embedding size, distance)
+        self._pending: Dict[str, Tuple[int, str]] = {}
+        self._lock = threading.Lock()
+        self._fit_lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def __getattr__(self, name: str):
+        # Provider-specific attributes (clients, options, ...) of the wrapped DB
+        if name == "vector_db":
+            raise AttributeError(name)
+        return getattr(self.vector_db, name)
+
+    def _projection_path(self, collection_name: str) -> str:
+        return os.path.join(self.projections_dir, f"{collection_name}.npz")
+
+    def _projection(self, collection_name: str) -> Optional[EmbeddingProjection]:
+        with self._lock:
+            if collection_name not in self._projections:
+                path = self._projection_path(collection_name)
+                self._projections[collection_name] = (
+                    EmbeddingProjection.load(path) if os.path.exists(path) else None
+                )
+            return self._projections[collection_name]
+
+    def _save_projection(
+        self, collection_name: str, projection: Optional[EmbeddingProjection]
+    ):
+        if projection is not None:
+            os.makedirs(self.projections_dir, exist_ok=True)
+            projection.save(self._projection_path(collection_name))
+        self._projections[collection_name] = projection
+
+    def _forget_projection(self, collection_name: str):
+        with self._lock:
+            self._pending.pop(collection_name, None)
+            self._projections.pop(collection_name, None)
+            path = self._projection_path(collection_name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def connect(self):
+        self.vector_db.connect()
+
+    def disconnect(self):
+        self.vector_db.disconnect()
+
+    def is_collection_exist(self, collection_name: str) -> bool:
+        return self.vector_db.is_collection_exist(collection_name)
+
+    def list_all_collections(self) -> List[str]:
+        return self.vector_db.list_all_collections()
+
+    def get_collection_info(self, collection_name: str) -> dict:
+        info = self.vector_db.get_collection_info(collection_name)
+        if isinstance(info, dict):
+            projection = self._projection(collection_name)
+            info["projection"] = projection.describe() if projection else None
+        return info
+
+    def delete_collection(self, collection_name: str):
+        self._forget_projection(collection_name)
+        self.vector_db.delete_collection(collection_name)
+
+    def initial_batch_size(self, collection_name: str) -> int:
+        if self.method != EmbeddingProjectionMethod.PCA.value:
+            return 0
+        if self._projection(collection_name) is not None:
+            return 0
+        if self.vector_db.is_collection_exist(collection_name):
+            return 0
+        return self.fit_samples
+
+    def create_collection(
+        self,
+        collection_name: str,
+        embedding_size: int,
+        distance_method: str,
+        reset: bool = False,
+    ):
+        if reset:
+            self.delete_collection(collection_name)
+        elif self.vector_db.is_collection_exist(collection_name):
+            return False
+
+        if self.method == EmbeddingProjectionMethod.NONE.value:
+            return self.vector_db.create_collection(
+                collection_name, embedding_size, distance_method
+            )
+        if embedding_size <= self.output_dim:
+            self.logger.warning(
+                f"{collection_name} embeddings have {embedding_size} dimensions, "
+                f"not more than {self.output_dim}; they are stored unprojected."
+            )
+            return self.vector_db.create_collection(
+                collection_name, embedding_size, distance_method
+            )
+        if self.method == EmbeddingProjectionMethod.PCA.value:
+            with self._lock:
+                self._pending[collection_name] = (embedding_size, distance_method)
+            return True
+
+        with self._lock:
+            self._save_projection(
+                collection_name,
+                EmbeddingProjection(
+                    method=self.method,
+                    input_dim=embedding_size,
+                    output_dim=self.output_dim,
+                ),
+            )
+        return self.vector_db.create_collection(
+            collection_name, self.output_dim, distance_method
+        )
+
+    def _fit_pending(self, collection_name: str, vectors):
+        """Fit the projection of a pending PCA collection and create it."""
+        # Concurrent first inserts wait here for the fit; searches do not
+        with self._fit_lock:
+            pending = self._pending.get(collection_name)
+            if pending is None:
+                return
+            embedding_size, distance_method = pending
+            if len(vectors) < self.output_dim:
+                self.logger.warning(
+                    f"{len(vectors)} vectors are too few to fit a "
+                    f"{self.output_dim}-dimensional PCA projection; "
+                    f"{collection_name} is stored unprojected."
+                )
+                projection, dim = None, embedding_size
+            else:
+                projection = EmbeddingProjection.fit_pca(vectors, self.output_dim)
+                dim = self.output_dim
+            with self._lock:
+                self._save_projection(collection_name, projection)
+            self.vector_db.create_collection(collection_name, dim, distance_method)
+            with self._lock:
+                self._pending.pop(collection_name, None)
+
+    def _project(self, collection_name: str, vectors):
+        projection = self._projection(collection_name)
+        return vectors if projection is None else projection.transform(vectors)
+
+    def insert_one(
+        self,
+        collection_name: str,
+        text: str,
+        vector: list,
+        metadata: dict = None,
+        record_id: str = None,
+    ):
+        if collection_name in self._pending:
+            self._fit_pending(collection_name, [vector])
+        return self.vector_db.insert_one(
+            collection_name,
+            text,
+            self._project(collection_name, vector),
+            metadata=metadata,
+            record_id=record_id,
+        )
+
+    def insert_many(
+        self,
+        collection_name: str,
+        texts: list,
+        vectors: list,
+        metadata: list = None,
+        record_ids: list = None,
+        batch_size: int = 50,
+    ):
+        if collection_name in self._pending:
+            self._fit_pending(collection_name, vectors)
+        return self.vector_db.insert_many(
+            collection_name,
+            texts,
+            self._project(collection_name, vectors),
+            metadata=metadata,
+            record_ids=record_ids,
+            batch_size=batch_size,
+        )
+
+    def delete_by_ids(self, collection_name: str, record_ids: list):
+        return self.vector_db.delete_by_ids(collection_name, record_ids)
+
+    def search_by_vector(
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int,
+        filters: Optional[SearchFilter] = None,
+    ) -> List[RetrievedDocument]:
+        if collection_name in self._pending:
+            return []
+        return self.vector_db.search_by_vector(
+            collection_name,
+            self._project(collection_name, vector),
+            limit=limit,
+            filters=filters,
+        )
+
+    # Async calls go to the wrapped DB, keeping its native async client if any
+
+    async def ainsert_many(
+        self,
+        collection_name: str,
+        texts: list,
+        vectors: list,
+        metadata: list = None,
+        record_ids: list = None,
+        batch_size: int = 50,
+    ):
+        if collection_name in self._pending:
+            await run_blocking(self._fit_pending, collection_name, vectors)
+        return await self.vector_db.ainsert_many(
+            collection_name=collection_name,
+            texts=texts,
+            vectors=self._project(collection_name, vectors),
+            metadata=metadata,
+            record_ids=record_ids,
+            batch_size=batch_size,
+        )
+
+    async def adelete_by_ids(self, collection_name: str, record_ids: list):
+        return await self.vector_db.adelete_by_ids(collection_name, record_ids)
+
+    async def asearch_by_vector(
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int,
+        filters: Optional[SearchFilter] = None,
+    ) -> List[RetrievedDocument]:
+        if collection_name in self._pending:
+            return []
+        return await self.vector_db.asearch_by_vector(
+            collection_name=collection_name,
+            vector=self._project(collection_name, vector),
+            limit=limit,
+            filters=filters,
+        )
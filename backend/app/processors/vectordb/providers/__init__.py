@@ -1,3 +1,17 @@
+import importlib
+
 from .base import BaseVectorDB
-from .chroma_vecdb import ChromaVectorDB
-from .qdrant_vecdb import QdrantVectorDB
+
+# Provider clients are slow to import, so providers are loaded on first access
+_PROVIDERS = {
+    "ChromaVectorDB": ".chroma_vecdb",
+    "QdrantVectorDB": ".qdrant_vecdb",
+    "NumpyVectorDB": ".numpy_vecdb",
+}
+
+
+def __getattr__(name: str):
+    module = _PROVIDERS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
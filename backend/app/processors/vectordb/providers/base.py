@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 
-from ..models import RetrievedDocument
+from app.utils.executors import run_blocking
+
+from ..models import RetrievedDocument, SearchFilter
 
 
 class BaseVectorDB(ABC):
@@ -60,10 +62,93 @@ class BaseVectorDB(ABC):
         record_ids: list = None,
         batch_size: int = 50,
     ):
+        """
+        Insert `texts` with their `vectors`.
+
+        `vectors` is a list of vectors or a (n, dim) float32 numpy array, as
+        returned by `embed_text(..., as_array=True)`; providers take either
+        without converting the array element by element.
+        """
+        pass
+
+    @abstractmethod
+    def delete_by_ids(self, collection_name: str, record_ids: list):
         pass
 
     @abstractmethod
     def search_by_vector(
-        self, collection_name: str, vector: list, limit: int
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int,
+        filters: Optional[SearchFilter] = None,
     ) -> List[RetrievedDocument]:
+        """
+        Top `limit` records by similarity, restricted to `filters` if given.
+
+        `vector` is a list of floats or a 1-D float32 numpy array.
+        """
         pass
+
+    def initial_batch_size(self, collection_name: str) -> int:
+        """
+        Vectors the first insert into a new collection should hold, e.g. to
+        fit a projection on; 0 when batches can be inserted as they come.
+        """
+        return 0
+
+    async def acreate_collection(
+        self,
+        collection_name: str,
+        embedding_size: int,
+        distance_method: str,
+        reset: bool = False,
+    ):
+        return await run_blocking(
+            self.create_collection,
+            collection_name=collection_name,
+            embedding_size=embedding_size,
+            distance_method=distance_method,
+            reset=reset,
+        )
+
+    async def ainsert_many(
+        self,
+        collection_name: str,
+        texts: list,
+        vectors: list,
+        metadata: list = None,
+        record_ids: list = None,
+        batch_size: int = 50,
+    ):
+        return await run_blocking(
+            self.insert_many,
+            collection_name=collection_name,
+            texts=texts,
+            vectors=vectors,
+            metadata=metadata,
+            record_ids=record_ids,
+            batch_size=batch_size,
+        )
+
+    async def adelete_by_ids(self, collection_name: str, record_ids: list):
+        return await run_blocking(
+            self.delete_by_ids,
+            collection_name=collection_name,
+            record_ids=record_ids,
+        )
+
+    async def asearch_by_vector(
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int,
+        filters: Optional[SearchFilter] = None,
+    ) -> List[RetrievedDocument]:
+        return await run_blocking(
+            self.search_by_vector,
+            collection_name=collection_name,
+            vector=vector,
+            limit=limit,
+            filters=filters,
+        )
@@ -1,10 +1,10 @@
 import logging
 import os
-from typing import List
+from typing import List, Optional
 
 from chromadb import Client, PersistentClient
 
-from ..models import RetrievedDocument
+from ..models import RetrievedDocument, SearchFilter
 from ..providers.base import BaseVectorDB
 
 
@@ -14,6 +14,20 @@ class ChromaVectorDB(BaseVectorDB):
         self.metadata_fields = metadata_fields or []
         self.logger = logging.getLogger(__name__)
 
+    def _build_where(self, filters: Optional[SearchFilter]) -> Optional[dict]:
+        if filters is None or filters.is_empty:
+            return None
+
+        conditions = []
+        if filters.document_keys:
+            conditions.append({"document_key": {"$in": list(filters.document_keys)}})
+        if filters.page_from is not None:
+            conditions.append({"page": {"$gte": filters.page_from}})
+        if filters.page_to is not None:
+            conditions.append({"page": {"$lte": filters.page_to}})
+        # Chroma only accepts several conditions wrapped in an explicit $and
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
     def connect(self):
         self.client = PersistentClient(path=self.db_path)
 
@@ -72,7 +86,7 @@ class ChromaVectorDB(BaseVectorDB):
 
         try:
             collection = self.client.get_collection(collection_name)
-            collection.add(
+            collection.upsert(
                 documents=[text],
                 embeddings=[vector],
                 ids=[record_id],
@@ -107,7 +121,7 @@ class ChromaVectorDB(BaseVectorDB):
                 batch_metadata = metadata[i : i + batch_size]
                 batch_record_ids = record_ids[i : i + batch_size]
 
-                collection.add(
+                collection.upsert(
                     documents=batch_texts,
                     embeddings=batch_vectors,
                     ids=[str(i) for i in batch_record_ids],
@@ -119,18 +133,47 @@ class ChromaVectorDB(BaseVectorDB):
 
         return True
 
+    def delete_by_ids(self, collection_name: str, record_ids: list):
+        if not record_ids or not self.is_collection_exist(collection_name):
+            return False
+
+        try:
+            collection = self.client.get_collection(collection_name)
+            collection.delete(ids=[str(i) for i in record_ids])
+        except Exception as e:
+            self.logger.error(f"Error while deleting records: {e}")
+            return False
+
+        return True
+
     def search_by_vector(
-        self, collection_name: str, vector: list, limit: int = 5
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int = 5,
+        filters: Optional[SearchFilter] = None,
     ) -> List[RetrievedDocument]:
         try:
             collection = self.client.get_collection(collection_name)
-            results = collection.query(query_embeddings=[vector], n_results=limit)
+            results = collection.query(
+                query_embeddings=[vector],
+                n_results=limit,
+                where=self._build_where(filters),
+            )
 
             # Modify to access results directly as text since 'result' is a string
             return [
-                RetrievedDocument(score=1 - distance, text=document)
-                for distance, document in zip(
-                    results["distances"][0], results["documents"][0]
+                RetrievedDocument(
+                    score=1 - distance,
+                    text=document,
+                    record_id=record_id,
+                    metadata=metadata,
+                )
+                for distance, document, record_id, metadata in zip(
+                    results["distances"][0],
+                    results["documents"][0],
+                    results["ids"][0],
+                    results["metadatas"][0],
                 )
             ]
         except Exception as e:
@@ -0,0 +1,752 @@
+import json
+import logging
+import math
+import os
+import shutil
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+from uuid import uuid4
+
+import numpy as np
+
+try:
+    import faiss
+except ImportError:
+    raise ImportError("Please install the faiss-cpu package")
+
+from app.utils.locks import ReadWriteLock
+
+from ..enums import DistanceMethod, FaissIndexType
+from ..models import RetrievedDocument, SearchFilter
+from ..providers.base import BaseVectorDB
+
+
+class _FaissCollection:
+    """
+    A collection made of a FAISS index plus its on-disk sources of truth.
+
+    Raw float32 vectors are appended to `vectors.f32` and texts/metadata to a
+    SQLite table keyed by FAISS row id. The row count, and the name of the
+    vectors file once it has been compacted, are committed in the same SQLite
+    transactions as the records, so the records and vectors a collection loads
+    always match. The index itself is a derived artifact:
+    on load, rows missing from a stale `index.faiss` are re-added from the raw
+    vectors, and IVF-PQ indexes are retrained from them as the collection grows.
+    Rows orphaned by deletes and re-inserts are dropped from both the index and
+    the raw vectors once they make up a large share of the collection.
+
+    Metadata is stored as JSON with an expression index on its `document_key`
+    and `page` fields, so filtered searches look up the matching rows and
+    only score those.
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    RECORDS_FILE = "records.sqlite3"
+    INDEX_FILE = "index.faiss"
+    META_FILE = "meta.json"
+
+    # Retrain IVF-PQ once the collection has grown this much since training
+    RETRAIN_GROWTH_FACTOR = 4
+    # Cap on the number of vectors used to train IVF-PQ
+    MAX_TRAINING_VECTORS = 100_000
+    # Persist the index after this many rows were added since the last save
+    SAVE_EVERY_ROWS = 10_000
+    # Filtered searches matching at most this many rows score them exactly from
+    # the raw vectors; larger subsets search the index restricted to them
+    EXACT_FILTER_MAX_ROWS = 50_000
+    # Compact once this share of the rows are orphans, in collections of at
+    # least COMPACT_MIN_ROWS rows
+    COMPACT_ORPHAN_RATIO = 0.25
+    COMPACT_MIN_ROWS = 1_000
+
+    def __init__(self, path: str, meta: dict, options: dict):
+        self.path = path
+        self.meta = meta
+        self.options = options
+        self.dim = meta["dim"]
+        self.index = None
+        self.unsaved_rows = 0
+        self.closed = False
+        # Searches share the index and records; appends, deletes and the
+        # swap to a rebuilt index are exclusive
+        self.lock = ReadWriteLock()
+        self._rebuild_lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(path, self.RECORDS_FILE), check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS records (
+                row INTEGER PRIMARY KEY,
+                record_id TEXT NOT NULL UNIQUE,
+                text TEXT NOT NULL,
+                metadata TEXT
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS records_document_page ON records (
+                json_extract(metadata, '$.document_key'),
+                json_extract(metadata, '$.page')
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self._conn.commit()
+
+    @property
+    def count(self) -> int:
+        return self.meta["count"]
+
+    @property
+    def size(self) -> int:
+        """Number of live records, excluding rows orphaned by re-inserts."""
+        return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.path, self.INDEX_FILE)
+
+    @property
+    def vectors_path(self) -> str:
+        return os.path.join(self.path, self.meta.get("vectors_file", self.VECTORS_FILE))
+
+    @classmethod
+    def create(
+        cls, path: str, dim: int, distance_method: str, options: dict
+    ) -> "_FaissCollection":
+        os.makedirs(path, exist_ok=True)
+        open(os.path.join(path, cls.VECTORS_FILE), "wb").close()
+        meta = {
+            "dim": dim,
+            "distance_method": distance_method,
+            "index_type": options["index_type"],
+            "count": 0,
+            "trained_count": 0,
+        }
+        collection = cls(path, meta, options)
+        collection.index = collection._build_index(0)
+        collection._configure_search(collection.index)
+        collection._write_meta()
+        return collection
+
+    @classmethod
+    def load(cls, path: str, options: dict) -> "_FaissCollection":
+        with open(os.path.join(path, cls.META_FILE)) as f:
+            meta = json.load(f)
+        collection = cls(path, meta, options)
+        # Collections written before the state table keep their meta.json values
+        meta.update(
+            (key, json.loads(value))
+            for key, value in collection._conn.execute("SELECT key, value FROM state")
+        )
+
+        # Drop vectors of an append whose records were never committed, and
+        # the vectors file of an interrupted compaction
+        vectors_size = collection.count * collection.dim * 4
+        if os.path.getsize(collection.vectors_path) > vectors_size:
+            with open(collection.vectors_path, "r+b") as f:
+                f.truncate(vectors_size)
+        for name in os.listdir(path):
+            if name.startswith("vectors.") and name != os.path.basename(
+                collection.vectors_path
+            ):
+                os.remove(os.path.join(path, name))
+
+        if os.path.exists(collection.index_path):
+            collection.index = faiss.read_index(collection.index_path)
+        if collection.index is None or collection.index.ntotal > collection.count:
+            collection.index = collection._build_index(meta["trained_count"])
+            if meta["trained_count"]:
+                collection._train(
+                    collection.index,
+                    collection._vectors(collection.count),
+                    np.arange(collection.count),
+                )
+
+        # Catch up on rows that were appended after the index was last saved
+        if collection.index.ntotal < collection.count:
+            start = collection.index.ntotal
+            collection.index.add(collection._raw_vectors(start, collection.count))
+        collection._configure_search(collection.index)
+        return collection
+
+    def _write_meta(self):
+        with open(os.path.join(self.path, self.META_FILE), "w") as f:
+            json.dump(self.meta, f)
+
+    def _write_state(self, **fields):
+        """Store `fields` in the state table, in the caller's transaction."""
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+            [(key, json.dumps(value)) for key, value in fields.items()],
+        )
+
+    def _metric(self) -> int:
+        # Cosine vectors are normalized, so both methods use inner product
+        return faiss.METRIC_INNER_PRODUCT
+
+    def _nlist(self, n: int) -> int:
+        return max(1, min(self.options["nlist"], int(4 * math.sqrt(max(n, 1)))))
+
+    def _pq_m(self) -> int:
+        """Largest number of PQ sub-quantizers <= the setting that divides dim."""
+        m = min(self.options["pq_m"], self.dim)
+        while self.dim % m:
+            m -= 1
+        return m
+
+    def _min_training_size(self, n: int) -> int:
+        # k-means needs ~39 points per centroid; PQ needs 256 per codebook
+        return max(39 * self._nlist(n), 256)
+
+    def _build_index(self, trained_count: int):
+        index_type = self.meta["index_type"]
+        if index_type == FaissIndexType.HNSW.value:
+            index = faiss.IndexHNSWFlat(
+                self.dim, self.options["hnsw_m"], self._metric()
+            )
+            index.hnsw.efConstruction = self.options["hnsw_ef_construction"]
+            return index
+
+        if index_type == FaissIndexType.IVF_PQ.value and trained_count:
+            quantizer = faiss.IndexFlatIP(self.dim)
+            return faiss.IndexIVFPQ(
+                quantizer,
+                self.dim,
+                self._nlist(trained_count),
+                self._pq_m(),
+                8,
+                self._metric(),
+            )
+
+        # Flat index, also used by IVF-PQ until enough vectors exist to train
+        return faiss.IndexFlatIP(self.dim)
+
+    def _configure_search(self, index):
+        if isinstance(index, faiss.IndexIVF):
+            index.nprobe = self.options["nprobe"]
+        elif isinstance(index, faiss.IndexHNSW):
+            index.hnsw.efSearch = self.options["hnsw_ef_search"]
+
+    def _vectors(self, count: int) -> np.memmap:
+        """The first `count` raw vectors, memory-mapped read-only."""
+        return np.memmap(
+            self.vectors_path, dtype=np.float32, mode="r", shape=(count, self.dim)
+        )
+
+    def _raw_vectors(self, start: int, stop: int) -> np.ndarray:
+        return np.ascontiguousarray(self._vectors(self.count)[start:stop])
+
+    def _raw_vectors_at(self, rows: np.ndarray) -> np.ndarray:
+        return self._vectors(self.count)[rows]
+
+    def _train(self, index, vectors: np.ndarray, rows: np.ndarray):
+        if len(rows) > self.MAX_TRAINING_VECTORS:
+            rows = np.sort(
+                np.random.default_rng(0).choice(
+                    rows, self.MAX_TRAINING_VECTORS, replace=False
+                )
+            )
+        index.train(np.ascontiguousarray(vectors[rows]))
+
+    def needs_rebuild(self) -> bool:
+        """Whether the index is due for (re)training or compaction."""
+        if self.meta["index_type"] == FaissIndexType.IVF_PQ.value:
+            trained_count = self.meta["trained_count"]
+            if trained_count == 0:
+                if self.count >= self._min_training_size(self.count):
+                    return True
+            elif self.count >= trained_count * self.RETRAIN_GROWTH_FACTOR:
+                return True
+
+        if self.count < self.COMPACT_MIN_ROWS:
+            return False
+        return self.count - self.size > self.count * self.COMPACT_ORPHAN_RATIO
+
+    def rebuild(self):
+        """
+        Retrain the index and drop orphaned rows, without blocking searches.
+
+        The replacement is built from a snapshot of the live rows outside the
+        lock. Rows appended in the meantime are added to it under the write
+        lock, just before it is swapped in.
+        """
+        # Inserts finishing during a rebuild do not start another one
+        if not self._rebuild_lock.acquire(blocking=False):
+            return
+        compacted_path = None
+        try:
+            with self.lock.read():
+                if self.closed or not self.needs_rebuild():
+                    return
+                snapshot = self.count
+                live = np.array(
+                    [
+                        row
+                        for (row,) in self._conn.execute(
+                            "SELECT row FROM records ORDER BY row"
+                        )
+                    ],
+                    dtype=np.int64,
+                )
+            compact = len(live) < snapshot
+            if not compact:
+                live = np.arange(snapshot)
+            vectors_file = f"vectors.{uuid4().hex}.f32"
+            compacted_path = os.path.join(self.path, vectors_file)
+
+            ivf_pq = self.meta["index_type"] == FaissIndexType.IVF_PQ.value
+            trained = ivf_pq and len(live) >= self._min_training_size(len(live))
+            index = self._build_index(len(live) if trained else 0)
+            vectors = self._vectors(snapshot)
+            if trained:
+                self._train(index, vectors, live)
+            if compact:
+                open(compacted_path, "wb").close()
+            for start in range(0, len(live), self.MAX_TRAINING_VECTORS):
+                chunk = np.ascontiguousarray(
+                    vectors[live[start : start + self.MAX_TRAINING_VECTORS]]
+                )
+                index.add(chunk)
+                if compact:
+                    with open(compacted_path, "ab") as f:
+                        f.write(chunk.tobytes())
+            self._configure_search(index)
+
+            with self.lock.write():
+                if self.closed:
+                    return
+                appended = self._raw_vectors(snapshot, self.count)
+                if len(appended):
+                    index.add(appended)
+                state = {}
+                if ivf_pq:
+                    count = self.count - (snapshot - len(live))
+                    state["trained_count"] = count if trained else 0
+                if compact:
+                    with open(compacted_path, "ab") as f:
+                        f.write(appended.tobytes())
+                        f.flush()
+                        os.fsync(f.fileno())
+                    self._swap_compacted(index, vectors_file, live, snapshot, state)
+                else:
+                    with self._conn:
+                        self._write_state(**state)
+                    self.meta.update(state)
+                    self.index = index
+                self._write_meta()
+                self.save()
+        finally:
+            # The compacted file is only kept if it was swapped in
+            if (
+                compacted_path is not None
+                and compacted_path != self.vectors_path
+                and os.path.exists(compacted_path)
+            ):
+                os.remove(compacted_path)
+            self._rebuild_lock.release()
+
+    def _swap_compacted(
+        self, index, vectors_file: str, live: np.ndarray, snapshot: int, state: dict
+    ):
+        """
+        Switch to the compacted vectors file and its index. Called under the
+        write lock.
+
+        The renumbered records, the name of the new vectors file and the count
+        are committed in one transaction, so a failure at any step leaves the
+        old layout in place, both on disk and in memory.
+        """
+        # Without a saved index, a crash from here on rebuilds it on load
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+
+        # Rows only move down and are renumbered in ascending order, so a
+        # record never moves onto a row that is still taken
+        shift = snapshot - len(live)
+        moves = [(row, int(old)) for row, old in enumerate(live) if row != old]
+        moves += [(old - shift, old) for old in range(snapshot, self.count)]
+        state.update(vectors_file=vectors_file, count=self.count - shift)
+        with self._conn:
+            self._conn.executemany("UPDATE records SET row = ? WHERE row = ?", moves)
+            self._write_state(**state)
+
+        old_path = self.vectors_path
+        self.meta.update(state)
+        self.index = index
+        os.remove(old_path)
+
+    def prepare(self, vectors) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if self.meta["distance_method"] == DistanceMethod.COSINE.value:
+            # normalize_L2 works in place; float32 arrays from the embedder
+            # arrive uncopied and must not be modified
+            matrix = np.array(matrix, order="C")
+            faiss.normalize_L2(matrix)
+        return np.ascontiguousarray(matrix)
+
+    def append(self, texts: list, vectors, metadata: list, record_ids: list):
+        matrix = self.prepare(vectors)
+        start = self.count
+
+        with open(self.vectors_path, "ab") as f:
+            f.write(matrix.tobytes())
+        # Re-inserting a record id replaces its row; the old FAISS row becomes
+        # an orphan that search skips.
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO records (row, record_id, text, metadata) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (start + i, str(record_id), text, json.dumps(meta))
+                    for i, (record_id, text, meta) in enumerate(
+                        zip(record_ids, texts, metadata)
+                    )
+                ],
+            )
+            self._write_state(count=start + len(matrix))
+
+        self.index.add(matrix)
+        self.meta["count"] = start + len(matrix)
+        self.unsaved_rows += len(matrix)
+        self._write_meta()
+
+        if self.unsaved_rows >= self.SAVE_EVERY_ROWS:
+            self.save()
+
+    def _lookup(self, hits: List[Tuple[int, float]]) -> List[RetrievedDocument]:
+        """Resolve `(row, score)` hits to documents, skipping orphaned rows."""
+        placeholders = ", ".join("?" for _ in hits)
+        records: Dict[int, tuple] = {
+            row: (record_id, text, metadata)
+            for row, record_id, text, metadata in self._conn.execute(
+                "SELECT row, record_id, text, metadata FROM records "
+                f"WHERE row IN ({placeholders})",
+                [row for row, _ in hits],
+            )
+        }
+        return [
+            RetrievedDocument(
+                score=score,
+                text=records[row][1],
+                record_id=records[row][0],
+                metadata=json.loads(records[row][2]) if records[row][2] else None,
+            )
+            for row, score in hits
+            if row in records
+        ]
+
+    def search(
+        self, vector, limit: int, filters: Optional[SearchFilter] = None
+    ) -> List[RetrievedDocument]:
+        if self.count == 0:
+            return []
+
+        query = self.prepare(vector)
+        if filters is not None and not filters.is_empty:
+            return self._search_filtered(query, limit, filters)
+
+        # Over-fetch so rows orphaned by re-inserts and deletes don't shrink
+        # results, widening the search while orphans crowd out live rows
+        fetch = limit * 2
+        while True:
+            scores, rows = self.index.search(query, fetch)
+            hits = [(int(row), float(score)) for row, score in zip(rows[0], scores[0])]
+            hits = [(row, score) for row, score in hits if row >= 0]
+            if not hits:
+                return []
+
+            documents = self._lookup(hits)
+            if len(documents) >= limit or fetch >= self.index.ntotal:
+                return documents[:limit]
+            fetch *= 4
+
+    def filter_rows(self, filters: SearchFilter) -> np.ndarray:
+        """Live rows whose metadata matches `filters`, in ascending order."""
+        conditions, params = [], []
+        if filters.document_keys:
+            placeholders = ", ".join("?" for _ in filters.document_keys)
+            conditions.append(
+                f"json_extract(metadata, '$.document_key') IN ({placeholders})"
+            )
+            params.extend(filters.document_keys)
+        if filters.page_from is not None:
+            conditions.append("json_extract(metadata, '$.page') >= ?")
+            params.append(filters.page_from)
+        if filters.page_to is not None:
+            conditions.append("json_extract(metadata, '$.page') <= ?")
+            params.append(filters.page_to)
+
+        rows = self._conn.execute(
+            f"SELECT row FROM records WHERE {' AND '.join(conditions)} ORDER BY row",
+            params,
+        ).fetchall()
+        return np.array([row for (row,) in rows], dtype=np.int64)
+
+    def _search_parameters(self, selector) -> "faiss.SearchParameters":
+        if isinstance(self.index, faiss.IndexIVF):
+            return faiss.SearchParametersIVF(sel=selector, nprobe=self.index.nprobe)
+        if isinstance(self.index, faiss.IndexHNSW):
+            return faiss.SearchParametersHNSW(
+                sel=selector, efSearch=self.index.hnsw.efSearch
+            )
+        return faiss.SearchParameters(sel=selector)
+
+    def _search_filtered(
+        self, query: np.ndarray, limit: int, filters: SearchFilter
+    ) -> List[RetrievedDocument]:
+        rows = self.filter_rows(filters)
+        if len(rows) == 0:
+            return []
+
+        if len(rows) <= self.EXACT_FILTER_MAX_ROWS:
+            # Stored vectors are already normalized for cosine collections
+            scores = self._raw_vectors_at(rows) @ query[0]
+            limit = min(limit, len(rows))
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            top = top[np.argsort(-scores[top])]
+            return self._lookup([(int(rows[i]), float(scores[i])) for i in top])
+
+        selector = faiss.IDSelectorBatch(rows)
+        scores, found = self.index.search(
+            query, limit, params=self._search_parameters(selector)
+        )
+        return self._lookup(
+            [
+                (int(row), float(score))
+                for row, score in zip(found[0], scores[0])
+                if row >= 0
+            ]
+        )
+
+    def delete(self, record_ids: list) -> int:
+        """
+        Delete records. Their FAISS rows stay in the index as orphans that
+        search skips until `rebuild` compacts them away.
+        """
+        cursor = self._conn.executemany(
+            "DELETE FROM records WHERE record_id = ?",
+            [(str(record_id),) for record_id in record_ids],
+        )
+        self._conn.commit()
+        return cursor.rowcount
+
+    def save(self):
+        faiss.write_index(self.index, self.index_path)
+        self.unsaved_rows = 0
+
+    def close(self, save: bool = True):
+        # Waits for a running rebuild, which stops at its swap once closed
+        with self.lock.write():
+            self.closed = True
+        with self._rebuild_lock, self.lock.write():
+            if save and self.unsaved_rows:
+                self.save()
+            self._conn.close()
+
+
+class FaissVectorDB(BaseVectorDB):
+    """
+    FAISS (CPU) vector store with flat, IVF-PQ or HNSW indexes.
+
+    Collections live under `db_path`; see `_FaissCollection` for the layout.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        index_type: str = FaissIndexType.FLAT.value,
+        nlist: int = 1024,
+        nprobe: int = 16,
+        pq_m: int = 16,
+        hnsw_m: int = 32,
+        hnsw_ef_construction: int = 80,
+        hnsw_ef_search: int = 64,
+    ):
+        if index_type not in (t.value for t in FaissIndexType):
+            raise ValueError(f"Invalid FAISS index type: {index_type}")
+
+        self.db_path = db_path
+        self.options = {
+            "index_type": index_type,
+            "nlist": nlist,
+            "nprobe": nprobe,
+            "pq_m": pq_m,
+            "hnsw_m": hnsw_m,
+            "hnsw_ef_construction": hnsw_ef_construction,
+            "hnsw_ef_search": hnsw_ef_search,
+        }
+        self.collections: Dict[str, _FaissCollection] = {}
+        self._lock = threading.RLock()
+        self.logger = logging.getLogger(__name__)
+
+    def connect(self):
+        os.makedirs(self.db_path, exist_ok=True)
+
+    def disconnect(self):
+        with self._lock:
+            for collection in self.collections.values():
+                collection.close()
+            self.collections = {}
+
+    def _collection_path(self, collection_name: str) -> str:
+        return os.path.join(self.db_path, collection_name)
+
+    def _get_collection(self, collection_name: str) -> _FaissCollection:
+        with self._lock:
+            collection = self.collections.get(collection_name)
+            if collection is None:
+                collection = _FaissCollection.load(
+                    self._collection_path(collection_name), self.options
+                )
+                self.collections[collection_name] = collection
+            return collection
+
+    def is_collection_exist(self, collection_name: str) -> bool:
+        return os.path.exists(
+            os.path.join(
+                self._collection_path(collection_name), _FaissCollection.META_FILE
+            )
+        )
+
+    def list_all_collections(self) -> List[str]:
+        if not os.path.isdir(self.db_path):
+            return []
+        return [
+            name for name in os.listdir(self.db_path) if self.is_collection_exist(name)
+        ]
+
+    def get_collection_info(self, collection_name: str) -> dict:
+        collection = self._get_collection(collection_name)
+        with collection.lock.read():
+            return {
+                "name": collection_name,
+                "size": collection.size,
+                "dim": collection.dim,
+                "index_type": collection.meta["index_type"],
+                "index_class": type(collection.index).__name__,
+            }
+
+    def delete_collection(self, collection_name: str):
+        with self._lock:
+            collection = self.collections.pop(collection_name, None)
+            if collection is not None:
+                collection.close(save=False)
+            if self.is_collection_exist(collection_name):
+                shutil.rmtree(self._collection_path(collection_name))
+
+    def create_collection(
+        self,
+        collection_name: str,
+        embedding_size: int,
+        distance_method: str,
+        reset: bool = False,
+    ):
+        if distance_method not in (d.value for d in DistanceMethod):
+            raise ValueError(f"Invalid distance method: {distance_method}")
+
+        with self._lock:
+            if reset:
+                self.delete_collection(collection_name)
+
+            if not self.is_collection_exist(collection_name):
+                self.collections[collection_name] = _FaissCollection.create(
+                    self._collection_path(collection_name),
+                    embedding_size,
+                    distance_method,
+                    self.options,
+                )
+                return True
+            return False
+
+    def insert_one(
+        self,
+        collection_name: str,
+        text: str,
+        vector: list,
+        metadata: dict = None,
+        record_id: str = None,
+    ):
+        return self.insert_many(
+            collection_name=collection_name,
+            texts=[text],
+            vectors=[vector],
+            metadata=[metadata],
+            record_ids=[record_id],
+        )
+
+    def insert_many(
+        self,
+        collection_name: str,
+        texts: list,
+        vectors: list,
+        metadata: list = None,
+        record_ids: list = None,
+        batch_size: int = 50,
+    ):
+        if not self.is_collection_exist(collection_name):
+            self.logger.error(
+                f"Cannot insert records to non-existent collection: {collection_name}"
+            )
+            return False
+
+        try:
+            collection = self._get_collection(collection_name)
+            with collection.lock.write():
+                if metadata is None:
+                    metadata = [None] * len(texts)
+                if record_ids is None:
+                    record_ids = list(
+                        range(collection.count, collection.count + len(texts))
+                    )
+                collection.append(texts, vectors, metadata, record_ids)
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
+
+        self._rebuild(collection)
+        return True
+
+    def delete_by_ids(self, collection_name: str, record_ids: list):
+        if not record_ids or not self.is_collection_exist(collection_name):
+            return False
+
+        try:
+            collection = self._get_collection(collection_name)
+            with collection.lock.write():
+                collection.delete(record_ids)
+        except Exception as e:
+            self.logger.error(f"Error while deleting records: {e}")
+            return False
+
+        self._rebuild(collection)
+        return True
+
+    def _rebuild(self, collection: _FaissCollection):
+        # The records were written; a failed rebuild only leaves the old index
+        try:
+            collection.rebuild()
+        except Exception as e:
+            self.logger.error(f"Error while rebuilding index: {e}")
+
+    def search_by_vector(
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int = 5,
+        filters: Optional[SearchFilter] = None,
+    ) -> List[RetrievedDocument]:
+        try:
+            collection = self._get_collection(collection_name)
+            with collection.lock.read():
+                return collection.search(vector, limit, filters)
+        except Exception as e:
+            self.logger.error(f"Error while searching: {e}")
+            return []
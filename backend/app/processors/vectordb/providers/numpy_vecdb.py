@@ -0,0 +1,592 @@
+import json
+import logging
+import math
+import os
+import shutil
+import threading
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from app.utils.locks import ReadWriteLock
+
+from ..enums import DistanceMethod, VectorQuantization
+from ..models import RetrievedDocument, SearchFilter
+from ..providers.base import BaseVectorDB
+
+# Number of set bits of every byte value, for Hamming distances
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _hamming(codes: np.ndarray, query_bits: np.ndarray) -> np.ndarray:
+    """Hamming distances between packed bit rows and a packed query."""
+    differing = np.bitwise_xor(codes, query_bits)
+    # NumPy 2.0+ counts bits natively; older versions use the lookup table
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(differing).sum(axis=1, dtype=np.int32)
+    return _POPCOUNT[differing].sum(axis=1, dtype=np.int32)
+
+
+class _Collection:
+    """
+    A single collection stored as a memory-mapped float32 matrix.
+
+    Vectors live in `vectors.f32` as a contiguous (capacity, dim) matrix that
+    grows by doubling; texts, ids and metadata are appended to `records.jsonl`
+    and kept in memory. Cosine collections store normalized vectors so that a
+    search is a single matrix-vector product. Rows are also indexed by their
+    `document_key` metadata, so filtered searches only score matching rows.
+
+    Quantized collections also keep a compact copy of every vector in
+    `vectors.codes`: int8 codes with a per-row scale in `vectors.scales`, or
+    sign bits. Searches scan the codes and read float32 rows only to rescore
+    the best candidates, so the data scanned per query, and the working set
+    that must stay in memory, is 4x (int8) or 32x (binary) smaller.
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    CODES_FILE = "vectors.codes"
+    SCALES_FILE = "vectors.scales"
+    RECORDS_FILE = "records.jsonl"
+    META_FILE = "meta.json"
+
+    # Rows of codes decoded at a time while scanning a quantized collection
+    SCAN_BLOCK_ROWS = 1024
+
+    def __init__(
+        self,
+        path: str,
+        dim: int,
+        distance_method: str,
+        quantization: str = VectorQuantization.NONE.value,
+    ):
+        self.path = path
+        self.dim = dim
+        self.distance_method = distance_method
+        self.quantization = quantization
+        self.count = 0
+        self.capacity = 0
+        self.vectors: Optional[np.memmap] = None
+        self.codes: Optional[np.memmap] = None
+        self.scales: Optional[np.memmap] = None
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.metadata: List[Optional[dict]] = []
+        self.row_of: Dict[str, int] = {}
+        self.rows_by_document: Dict[str, Set[int]] = {}
+        # Searches read the matrix and records while appends and deletes
+        # move rows around, so they share this lock
+        self.lock = ReadWriteLock()
+
+    @property
+    def vectors_path(self) -> str:
+        return os.path.join(self.path, self.VECTORS_FILE)
+
+    @property
+    def records_path(self) -> str:
+        return os.path.join(self.path, self.RECORDS_FILE)
+
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(self.path, self.META_FILE)
+
+    @property
+    def quantized(self) -> bool:
+        return self.quantization != VectorQuantization.NONE.value
+
+    @classmethod
+    def create(
+        cls, path: str, dim: int, distance_method: str, quantization: str
+    ) -> "_Collection":
+        os.makedirs(path, exist_ok=True)
+        collection = cls(path, dim, distance_method, quantization)
+        open(collection.records_path, "w").close()
+        collection._resize(1024)
+        collection._write_meta()
+        return collection
+
+    @classmethod
+    def load(cls, path: str) -> "_Collection":
+        with open(os.path.join(path, cls.META_FILE)) as f:
+            meta = json.load(f)
+        collection = cls(
+            path,
+            meta["dim"],
+            meta["distance_method"],
+            meta.get("quantization", VectorQuantization.NONE.value),
+        )
+        collection.capacity = meta["capacity"]
+        collection.vectors = np.memmap(
+            collection.vectors_path,
+            dtype=np.float32,
+            mode="r+",
+            shape=(collection.capacity, collection.dim),
+        )
+        collection._open_codes()
+        with open(collection.records_path) as f:
+            for line in f:
+                record = json.loads(line)
+                collection._set_record(
+                    record["row"], record["id"], record["text"], record["metadata"]
+                )
+        return collection
+
+    def _write_meta(self):
+        with open(self.meta_path, "w") as f:
+            json.dump(
+                {
+                    "dim": self.dim,
+                    "distance_method": self.distance_method,
+                    "quantization": self.quantization,
+                    "count": self.count,
+                    "capacity": self.capacity,
+                },
+                f,
+            )
+
+    def _resize(self, capacity: int):
+        if self.vectors is not None:
+            self._flush()
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(capacity * self.dim * 4)
+        self.vectors = np.memmap(
+            self.vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim)
+        )
+        self.capacity = capacity
+        if self.quantized:
+            for path, row_bytes in self._code_files():
+                with open(path, "ab") as f:
+                    f.truncate(capacity * row_bytes)
+            self._open_codes()
+
+    def _code_files(self) -> List[tuple]:
+        """(path, bytes per row) of the files holding the quantized vectors."""
+        if self.quantization == VectorQuantization.BINARY.value:
+            return [(os.path.join(self.path, self.CODES_FILE), math.ceil(self.dim / 8))]
+        return [
+            (os.path.join(self.path, self.CODES_FILE), self.dim),
+            (os.path.join(self.path, self.SCALES_FILE), 4),
+        ]
+
+    def _open_codes(self):
+        if not self.quantized:
+            return
+        if self.quantization == VectorQuantization.BINARY.value:
+            ((path, row_bytes),) = self._code_files()
+            self.codes = np.memmap(
+                path, dtype=np.uint8, mode="r+", shape=(self.capacity, row_bytes)
+            )
+            return
+        (codes_path, _), (scales_path, _) = self._code_files()
+        self.codes = np.memmap(
+            codes_path, dtype=np.int8, mode="r+", shape=(self.capacity, self.dim)
+        )
+        self.scales = np.memmap(
+            scales_path, dtype=np.float32, mode="r+", shape=(self.capacity,)
+        )
+
+    def _encode(self, rows: list, matrix: np.ndarray):
+        if self.quantization == VectorQuantization.BINARY.value:
+            self.codes[rows] = np.packbits(matrix > 0, axis=1)
+            return
+        # Symmetric per-row scale, so each row uses the full int8 range
+        scales = np.abs(matrix).max(axis=1) / 127
+        scales[scales == 0] = 1
+        self.codes[rows] = np.round(matrix / scales[:, None]).astype(np.int8)
+        self.scales[rows] = scales
+
+    def _flush(self):
+        self.vectors.flush()
+        if self.codes is not None:
+            self.codes.flush()
+        if self.scales is not None:
+            self.scales.flush()
+
+    def _set_record(self, row: int, record_id: str, text: str, metadata):
+        if row == len(self.ids):
+            self.ids.append(record_id)
+            self.texts.append(text)
+            self.metadata.append(metadata)
+        else:
+            self._unindex_row(row)
+            self.ids[row] = record_id
+            self.texts[row] = text
+            self.metadata[row] = metadata
+        self.row_of[record_id] = row
+        self._index_row(row)
+        self.count = len(self.ids)
+
+    def _index_row(self, row: int):
+        document_key = (self.metadata[row] or {}).get("document_key")
+        if document_key is not None:
+            self.rows_by_document.setdefault(document_key, set()).add(row)
+
+    def _unindex_row(self, row: int):
+        document_key = (self.metadata[row] or {}).get("document_key")
+        rows = self.rows_by_document.get(document_key)
+        if rows is not None:
+            rows.discard(row)
+            if not rows:
+                del self.rows_by_document[document_key]
+
+    def prepare(self, vectors) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if self.distance_method == DistanceMethod.COSINE.value:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.where(norms == 0, 1, norms)
+        return matrix
+
+    def append(self, texts: list, vectors, metadata: list, record_ids: list):
+        matrix = self.prepare(vectors)
+        rows = []
+        next_row = self.count
+        for record_id in record_ids:
+            row = self.row_of.get(record_id)
+            if row is None:
+                row = next_row
+                next_row += 1
+            rows.append(row)
+
+        if next_row > self.capacity:
+            capacity = self.capacity
+            while capacity < next_row:
+                capacity *= 2
+            self._resize(capacity)
+
+        self.vectors[rows] = matrix
+        if self.quantized:
+            self._encode(rows, matrix)
+        self._flush()
+
+        with open(self.records_path, "a") as f:
+            for row, record_id, text, meta in zip(rows, record_ids, texts, metadata):
+                self._set_record(row, record_id, text, meta)
+                f.write(
+                    json.dumps(
+                        {"row": row, "id": record_id, "text": text, "metadata": meta}
+                    )
+                    + "\n"
+                )
+        self._write_meta()
+
+    def delete(self, record_ids: list) -> int:
+        """
+        Remove records by moving the last row into each freed slot, keeping
+        the matrix dense, then rewrite the records log.
+        """
+        deleted = 0
+        for record_id in record_ids:
+            row = self.row_of.pop(str(record_id), None)
+            if row is None:
+                continue
+            self._unindex_row(row)
+            last = len(self.ids) - 1
+            if row != last:
+                self._unindex_row(last)
+                self.vectors[row] = self.vectors[last]
+                if self.codes is not None:
+                    self.codes[row] = self.codes[last]
+                if self.scales is not None:
+                    self.scales[row] = self.scales[last]
+                self.ids[row] = self.ids[last]
+                self.texts[row] = self.texts[last]
+                self.metadata[row] = self.metadata[last]
+                self.row_of[self.ids[row]] = row
+                self._index_row(row)
+            self.ids.pop()
+            self.texts.pop()
+            self.metadata.pop()
+            deleted += 1
+
+        if deleted:
+            self.count = len(self.ids)
+            self._flush()
+            self._rewrite_records()
+            self._write_meta()
+        return deleted
+
+    def _rewrite_records(self):
+        tmp_path = self.records_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for row, (record_id, text, meta) in enumerate(
+                zip(self.ids, self.texts, self.metadata)
+            ):
+                f.write(
+                    json.dumps(
+                        {"row": row, "id": record_id, "text": text, "metadata": meta}
+                    )
+                    + "\n"
+                )
+        os.replace(tmp_path, self.records_path)
+
+    def filter_rows(self, filters: SearchFilter) -> np.ndarray:
+        """Rows whose metadata matches `filters`, in ascending order."""
+        if filters.document_keys:
+            rows = set().union(
+                *(self.rows_by_document.get(key, ()) for key in filters.document_keys)
+            )
+        else:
+            rows = range(self.count)
+        if filters.page_from is not None or filters.page_to is not None:
+            rows = [row for row in rows if filters.matches(self.metadata[row])]
+        return np.array(sorted(rows), dtype=np.int64)
+
+    def _approximate_scores(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Scores of `rows` (ascending) from the quantized vectors, higher is closer."""
+        binary = self.quantization == VectorQuantization.BINARY.value
+        if binary:
+            query_bits = np.packbits(query > 0)
+        else:
+            # Blocks are small enough for the float32 copy to stay in cache
+            decoded = np.empty((self.SCAN_BLOCK_ROWS, self.dim), dtype=np.float32)
+        scores = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), self.SCAN_BLOCK_ROWS):
+            block = rows[start : start + self.SCAN_BLOCK_ROWS]
+            # Contiguous ranges are sliced rather than gathered
+            if block[-1] - block[0] + 1 == len(block):
+                block = slice(block[0], block[-1] + 1)
+            out = scores[start : start + self.SCAN_BLOCK_ROWS]
+            if binary:
+                np.negative(_hamming(self.codes[block], query_bits), out=out)
+            else:
+                codes = decoded[: len(out)]
+                np.copyto(codes, self.codes[block], casting="unsafe")
+                np.dot(codes, query, out=out)
+                out *= self.scales[block]
+        return scores
+
+    def _rescore(
+        self, query: np.ndarray, rows: np.ndarray, limit: int, oversampling: float
+    ) -> tuple:
+        """Exact scores of the best approximate candidates among `rows`."""
+        candidates = min(len(rows), max(limit, math.ceil(limit * oversampling)))
+        if candidates < len(rows):
+            scores = self._approximate_scores(query, rows)
+            top = np.argpartition(-scores, candidates - 1)[:candidates]
+            rows = np.sort(rows[top])
+        return rows, self.vectors[rows] @ query
+
+    def search(
+        self,
+        vector,
+        limit: int,
+        filters: Optional[SearchFilter] = None,
+        oversampling: float = 4.0,
+    ) -> List[RetrievedDocument]:
+        count = self.count
+        if count == 0:
+            return []
+
+        query = self.prepare(vector)[0]
+        if filters is None or filters.is_empty:
+            rows = np.arange(count)
+        else:
+            rows = self.filter_rows(filters)
+            if len(rows) == 0:
+                return []
+
+        if self.quantized:
+            rows, scores = self._rescore(query, rows, limit, oversampling)
+        elif len(rows) == count:
+            scores = self.vectors[:count] @ query
+        else:
+            scores = self.vectors[rows] @ query
+
+        limit = min(limit, len(rows))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [
+            RetrievedDocument(
+                score=float(scores[i]),
+                text=self.texts[rows[i]],
+                record_id=self.ids[rows[i]],
+                metadata=self.metadata[rows[i]],
+            )
+            for i in top
+        ]
+
+
+class NumpyVectorDB(BaseVectorDB):
+    """
+    In-process vector store doing exact top-k search with NumPy.
+
+    Each collection is a memory-mapped float32 matrix, so search is one
+    vectorized matrix-vector product plus `argpartition`, with no client or
+    serialization layer in between. Suited to small and mid-sized collections.
+
+    With `quantization` set to "int8" or "binary", new collections keep 4x or
+    32x smaller codes that are scanned first, and `oversampling` times the
+    requested number of results are rescored at full precision.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        quantization: str = VectorQuantization.NONE.value,
+        oversampling: float = 4.0,
+    ):
+        if quantization not in (q.value for q in VectorQuantization):
+            raise ValueError(f"Invalid vector quantization: {quantization}")
+
+        self.db_path = db_path
+        self.quantization = quantization
+        self.oversampling = oversampling
+        self.collections: Dict[str, _Collection] = {}
+        self._lock = threading.RLock()
+        self.logger = logging.getLogger(__name__)
+
+    def connect(self):
+        os.makedirs(self.db_path, exist_ok=True)
+
+    def disconnect(self):
+        with self._lock:
+            for collection in self.collections.values():
+                if collection.vectors is not None:
+                    collection._flush()
+            self.collections = {}
+
+    def _collection_path(self, collection_name: str) -> str:
+        return os.path.join(self.db_path, collection_name)
+
+    def _get_collection(self, collection_name: str) -> _Collection:
+        with self._lock:
+            collection = self.collections.get(collection_name)
+            if collection is None:
+                collection = _Collection.load(self._collection_path(collection_name))
+                self.collections[collection_name] = collection
+            return collection
+
+    def is_collection_exist(self, collection_name: str) -> bool:
+        return os.path.exists(
+            os.path.join(self._collection_path(collection_name), _Collection.META_FILE)
+        )
+
+    def list_all_collections(self) -> List[str]:
+        if not os.path.isdir(self.db_path):
+            return []
+        return [
+            name for name in os.listdir(self.db_path) if self.is_collection_exist(name)
+        ]
+
+    def get_collection_info(self, collection_name: str) -> dict:
+        collection = self._get_collection(collection_name)
+        return {
+            "name": collection_name,
+            "size": collection.count,
+            "dim": collection.dim,
+            "distance_method": collection.distance_method,
+            "quantization": collection.quantization,
+        }
+
+    def delete_collection(self, collection_name: str):
+        with self._lock:
+            self.collections.pop(collection_name, None)
+            if self.is_collection_exist(collection_name):
+                shutil.rmtree(self._collection_path(collection_name))
+
+    def create_collection(
+        self,
+        collection_name: str,
+        embedding_size: int,
+        distance_method: str,
+        reset: bool = False,
+    ):
+        if distance_method not in (d.value for d in DistanceMethod):
+            raise ValueError(f"Invalid distance method: {distance_method}")
+
+        with self._lock:
+            if reset:
+                self.delete_collection(collection_name)
+
+            if not self.is_collection_exist(collection_name):
+                self.collections[collection_name] = _Collection.create(
+                    self._collection_path(collection_name),
+                    embedding_size,
+                    distance_method,
+                    self.quantization,
+                )
+                return True
+            return False
+
+    def insert_one(
+        self,
+        collection_name: str,
+        text: str,
+        vector: list,
+        metadata: dict = None,
+        record_id: str = None,
+    ):
+        return self.insert_many(
+            collection_name=collection_name,
+            texts=[text],
+            vectors=[vector],
+            metadata=[metadata],
+            record_ids=[record_id],
+        )
+
+    def insert_many(
+        self,
+        collection_name: str,
+        texts: list,
+        vectors: list,
+        metadata: list = None,
+        record_ids: list = None,
+        batch_size: int = 50,
+    ):
+        if not self.is_collection_exist(collection_name):
+            self.logger.error(
+                f"Cannot insert records to non-existent collection: {collection_name}"
+            )
+            return False
+
+        try:
+            with self._lock:
+                collection = self._get_collection(collection_name)
+                if metadata is None:
+                    metadata = [None] * len(texts)
+                if record_ids is None:
+                    record_ids = [
+                        str(i)
+                        for i in range(collection.count, collection.count + len(texts))
+                    ]
+                # Vectors are written in one contiguous block; batch_size is
+                # accepted for interface compatibility only.
+                with collection.lock.write():
+                    collection.append(
+                        texts, vectors, metadata, [str(i) for i in record_ids]
+                    )
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
+
+        return True
+
+    def delete_by_ids(self, collection_name: str, record_ids: list):
+        if not record_ids or not self.is_collection_exist(collection_name):
+            return False
+
+        try:
+            with self._lock:
+                collection = self._get_collection(collection_name)
+                with collection.lock.write():
+                    collection.delete(record_ids)
+        except Exception as e:
+            self.logger.error(f"Error while deleting records: {e}")
+            return False
+
+        return True
+
+    def search_by_vector(
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int = 5,
+        filters: Optional[SearchFilter] = None,
+    ) -> List[RetrievedDocument]:
+        try:
+            collection = self._get_collection(collection_name)
+            with collection.lock.read():
+                return collection.search(vector, limit, filters, self.oversampling)
+        except Exception as e:
+            self.logger.error(f"Error while searching: {e}")
+            return []
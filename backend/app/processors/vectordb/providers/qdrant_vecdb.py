@@ -1,17 +1,39 @@
 import logging
-from typing import List
+from typing import List, Optional
 
-from qdrant_client import QdrantClient, models
+import numpy as np
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
 
-from ..enums import DistanceMethod
-from ..models import RetrievedDocument
+from ..enums import DistanceMethod, VectorQuantization
+from ..models import RetrievedDocument, SearchFilter
 from ..providers.base import BaseVectorDB
 
 
 class QdrantVectorDB(BaseVectorDB):
-    def __init__(self, db_path: str):
+    # Chunk metadata fields that searches filter on, indexed for fast filtering
+    PAYLOAD_INDEXES = {
+        "metadata.document_key": models.PayloadSchemaType.KEYWORD,
+        "metadata.page": models.PayloadSchemaType.INTEGER,
+    }
+
+    def __init__(
+        self,
+        db_path: str,
+        url: str = None,
+        api_key: str = None,
+        quantization: str = VectorQuantization.NONE.value,
+        oversampling: float = 4.0,
+    ):
+        if quantization not in (q.value for q in VectorQuantization):
+            raise ValueError(f"Invalid vector quantization: {quantization}")
+
         self.client = None
+        self.async_client = None
         self.db_path = db_path
+        self.url = url
+        self.api_key = api_key
+        self.quantization = quantization
+        self.oversampling = oversampling
         self.logger = logging.getLogger(__name__)
 
     def _get_distance_method(self, method: str):
@@ -22,11 +44,72 @@ class QdrantVectorDB(BaseVectorDB):
         else:
             raise ValueError(f"Invalid distance method: {method}")
 
+    def _vector_params(self, embedding_size: int, distance_method: str):
+        # Quantized vectors are kept in RAM and the originals, only read to
+        # rescore candidates, on disk
+        return models.VectorParams(
+            size=embedding_size,
+            distance=self._get_distance_method(distance_method),
+            on_disk=self.quantization != VectorQuantization.NONE.value,
+        )
+
+    def _quantization_config(self):
+        if self.quantization == VectorQuantization.INT8.value:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8, quantile=0.99, always_ram=True
+                )
+            )
+        if self.quantization == VectorQuantization.BINARY.value:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            )
+        return None
+
+    def _search_params(self) -> Optional[models.SearchParams]:
+        # Collections created without quantization ignore these parameters, and
+        # the embedded store always searches exactly
+        if self.quantization == VectorQuantization.NONE.value or not self.url:
+            return None
+        return models.SearchParams(
+            quantization=models.QuantizationSearchParams(
+                rescore=True, oversampling=self.oversampling
+            )
+        )
+
+    def _build_filter(self, filters: Optional[SearchFilter]) -> Optional[models.Filter]:
+        if filters is None or filters.is_empty:
+            return None
+
+        conditions = []
+        if filters.document_keys:
+            conditions.append(
+                models.FieldCondition(
+                    key="metadata.document_key",
+                    match=models.MatchAny(any=list(filters.document_keys)),
+                )
+            )
+        if filters.page_from is not None or filters.page_to is not None:
+            conditions.append(
+                models.FieldCondition(
+                    key="metadata.page",
+                    range=models.Range(gte=filters.page_from, lte=filters.page_to),
+                )
+            )
+        return models.Filter(must=conditions)
+
     def connect(self):
-        self.client = QdrantClient(path=self.db_path)
+        if self.url:
+            self.client = QdrantClient(url=self.url, api_key=self.api_key)
+            self.async_client = AsyncQdrantClient(url=self.url, api_key=self.api_key)
+        else:
+            # The embedded (on-disk) mode locks its storage folder, so only a
+            # single client may be opened; async calls go through the executor.
+            self.client = QdrantClient(path=self.db_path)
 
     def disconnect(self):
         self.client = None
+        self.async_client = None
 
     def is_collection_exist(self, collection_name: str) -> bool:
         return self.client.collection_exists(collection_name=collection_name)
@@ -51,15 +134,25 @@ class QdrantVectorDB(BaseVectorDB):
         if reset:
             self.delete_collection(collection_name)
 
+        created = False
         if not self.is_collection_exist(collection_name):
             self.client.create_collection(
                 collection_name=collection_name,
-                vectors_config=models.VectorParams(
-                    size=embedding_size, distance=distance_method
-                ),
+                vectors_config=self._vector_params(embedding_size, distance_method),
+                quantization_config=self._quantization_config(),
             )
-            return True
-        return False
+            created = True
+
+        # Payload indexes only exist on a Qdrant server; creating an existing
+        # one is a no-op, so collections created before are indexed as well
+        if self.url:
+            for field_name, field_schema in self.PAYLOAD_INDEXES.items():
+                self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema,
+                )
+        return created
 
     def insert_one(
         self,
@@ -76,15 +169,9 @@ class QdrantVectorDB(BaseVectorDB):
             return False
 
         try:
-            self.client.upload_records(
+            self.client.upsert(
                 collection_name=collection_name,
-                records=[
-                    models.Record(
-                        id=record_id,
-                        vector=vector,
-                        payload={"text": text, "metadata": metadata},
-                    )
-                ],
+                points=self._build_points([text], [vector], [metadata], [record_id]),
             )
         except Exception as e:
             self.logger.error(f"Error while inserting record: {e}")
@@ -108,24 +195,17 @@ class QdrantVectorDB(BaseVectorDB):
             record_ids = list(range(len(texts)))
 
         for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i : i + batch_size]
-            batch_vectors = vectors[i : i + batch_size]
-            batch_metadata = metadata[i : i + batch_size]
-            batch_record_ids = record_ids[i : i + batch_size]
-
-            batch_records = [
-                models.Record(
-                    id=batch_record_ids[x],
-                    vector=batch_vectors[x],
-                    payload={"text": batch_texts[x], "metadata": batch_metadata[x]},
-                )
-                for x in range(len(batch_texts))
-            ]
+            batch_points = self._build_points(
+                texts[i : i + batch_size],
+                vectors[i : i + batch_size],
+                metadata[i : i + batch_size],
+                record_ids[i : i + batch_size],
+            )
 
             try:
-                self.client.upload_records(
+                self.client.upsert(
                     collection_name=collection_name,
-                    records=batch_records,
+                    points=batch_points,
                 )
             except Exception as e:
                 self.logger.error(f"Error while inserting batch: {e}")
@@ -133,13 +213,54 @@ class QdrantVectorDB(BaseVectorDB):
 
         return True
 
+    def delete_by_ids(self, collection_name: str, record_ids: list):
+        if not record_ids or not self.is_collection_exist(collection_name):
+            return False
+
+        try:
+            self.client.delete(
+                collection_name=collection_name,
+                points_selector=models.PointIdsList(points=list(record_ids)),
+            )
+        except Exception as e:
+            self.logger.error(f"Error while deleting records: {e}")
+            return False
+
+        return True
+
     def search_by_vector(
-        self, collection_name: str, vector: list, limit: int = 5
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int = 5,
+        filters: Optional[SearchFilter] = None,
     ) -> List[RetrievedDocument]:
-        results = self.client.search(
-            collection_name=collection_name, query_vector=vector, limit=limit
-        )
+        results = self.client.query_points(
+            collection_name=collection_name,
+            query=vector,
+            limit=limit,
+            query_filter=self._build_filter(filters),
+            search_params=self._search_params(),
+        ).points
+
+        return self._to_documents(results)
 
+    def _build_points(
+        self, texts: list, vectors, metadata: list, record_ids: list
+    ) -> List[models.PointStruct]:
+        # Points are serialized with float lists; converting the whole batch
+        # at once avoids per-element validation of numpy rows
+        vectors = np.asarray(vectors, dtype=np.float32).tolist()
+        return [
+            models.PointStruct(
+                id=record_ids[x],
+                vector=vectors[x],
+                payload={"text": texts[x], "metadata": metadata[x]},
+            )
+            for x in range(len(texts))
+        ]
+
+    def _to_documents(self, results) -> List[RetrievedDocument]:
         if not results or len(results) == 0:
             return []
 
@@ -147,6 +268,121 @@ class QdrantVectorDB(BaseVectorDB):
             RetrievedDocument(
                 score=result.score,
                 text=result.payload["text"],
+                record_id=str(result.id),
+                metadata=result.payload.get("metadata"),
             )
             for result in results
         ]
+
+    async def acreate_collection(
+        self,
+        collection_name: str,
+        embedding_size: int,
+        distance_method: str,
+        reset: bool = False,
+    ):
+        if not self.async_client:
+            return await super().acreate_collection(
+                collection_name, embedding_size, distance_method, reset
+            )
+
+        if reset and await self.async_client.collection_exists(collection_name):
+            await self.async_client.delete_collection(collection_name=collection_name)
+
+        created = False
+        if not await self.async_client.collection_exists(collection_name):
+            await self.async_client.create_collection(
+                collection_name=collection_name,
+                vectors_config=self._vector_params(embedding_size, distance_method),
+                quantization_config=self._quantization_config(),
+            )
+            created = True
+
+        for field_name, field_schema in self.PAYLOAD_INDEXES.items():
+            await self.async_client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=field_schema,
+            )
+        return created
+
+    async def ainsert_many(
+        self,
+        collection_name: str,
+        texts: list,
+        vectors: list,
+        metadata: list = None,
+        record_ids: list = None,
+        batch_size: int = 50,
+    ):
+        if not self.async_client:
+            return await super().ainsert_many(
+                collection_name, texts, vectors, metadata, record_ids, batch_size
+            )
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        if record_ids is None:
+            record_ids = list(range(len(texts)))
+
+        for i in range(0, len(texts), batch_size):
+            batch_points = self._build_points(
+                texts[i : i + batch_size],
+                vectors[i : i + batch_size],
+                metadata[i : i + batch_size],
+                record_ids[i : i + batch_size],
+            )
+
+            try:
+                await self.async_client.upsert(
+                    collection_name=collection_name,
+                    points=batch_points,
+                )
+            except Exception as e:
+                self.logger.error(f"Error while inserting batch: {e}")
+                return False
+
+        return True
+
+    async def adelete_by_ids(self, collection_name: str, record_ids: list):
+        if not self.async_client:
+            return await super().adelete_by_ids(collection_name, record_ids)
+
+        if not record_ids or not await self.async_client.collection_exists(
+            collection_name
+        ):
+            return False
+
+        try:
+            await self.async_client.delete(
+                collection_name=collection_name,
+                points_selector=models.PointIdsList(points=list(record_ids)),
+            )
+        except Exception as e:
+            self.logger.error(f"Error while deleting records: {e}")
+            return False
+
+        return True
+
+    async def asearch_by_vector(
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int = 5,
+        filters: Optional[SearchFilter] = None,
+    ) -> List[RetrievedDocument]:
+        if not self.async_client:
+            return await super().asearch_by_vector(
+                collection_name, vector, limit, filters
+            )
+
+        response = await self.async_client.query_points(
+            collection_name=collection_name,
+            query=vector,
+            limit=limit,
+            query_filter=self._build_filter(filters),
+            search_params=self._search_params(),
+        )
+
+        return self._to_documents(response.points)
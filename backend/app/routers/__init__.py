@@ -1,2 +1,4 @@
 from .endpoints.files import router as files_router
+from .endpoints.health import router as health_router
+from .endpoints.metrics import router as metrics_router
 from .endpoints.search import router as search_router
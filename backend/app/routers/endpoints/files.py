@@ -2,13 +2,17 @@ import json
 import logging
 import os
 from pathlib import Path
-from uuid import uuid4
+from typing import Dict, List
 
-from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, UploadFile
 from fastapi.responses import JSONResponse
 
-from app.config import get_settings
-from app.processors.file_manager import FileHandler, FileProcessor
+from app.config import Settings
+from app.dependencies import get_app_settings, get_file_handler, get_ingestion_queue
+from app.processors.file_manager import FileHandler, ImportRequest
+from app.processors.file_manager.file_handler import FileMetadata, FileValidationError
+from app.processors.ingestion import IngestionJob, IngestionQueue, JobStatus
+from app.utils.executors import run_blocking
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/files", tags=["files"])
@@ -18,42 +22,210 @@ router = APIRouter(prefix="/files", tags=["files"])
 async def upload_file(
     experiment_id: str,
     file: UploadFile,
-    request: Request,
+    file_handler: FileHandler = Depends(get_file_handler),
+    ingestion_queue: IngestionQueue = Depends(get_ingestion_queue),
 ) -> JSONResponse:
-    """Upload and validate a file."""
+    """Save and validate a file, then queue it for background ingestion."""
     try:
-        file_handler = FileHandler(settings=get_settings())
         metadata = await file_handler.save_file(file=file, experiment_id=experiment_id)
         file_path = metadata.filepath
 
         if not file_path.exists():
             return JSONResponse(status_code=404, content={"error": "File not found"})
 
-        processor = FileProcessor()
-        chunks = await processor.generate_chunks(str(file_path))
-        embeddings = request.app.embedder.embed_text(chunks=chunks)
+        job = await ingestion_queue.submit(
+            experiment_id=experiment_id,
+            file_path=file_path,
+            filename=metadata.filename,
+            document_key=metadata.source_name,
+        )
+
+        return JSONResponse(
+            status_code=202,
+            content={"job_id": job.job_id, "status": job.status.value},
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing file: {e}")
+        return JSONResponse(status_code=500, content={"error": str(e)})
 
-        # Create and populate vector database collection
-        vector_db = request.app.vector_db
-        collection_name = f"collection_{experiment_id}"
 
-        vector_db.create_collection(
-            collection_name=collection_name,
-            embedding_size=len(embeddings[0]),
-            distance_method=request.app.state.settings.VECTOR_DB_DISTANCE_METHOD,
+async def _submit_batch(
+    ingestion_queue: IngestionQueue,
+    experiment_id: str,
+    accepted: List[FileMetadata],
+    rejected: List[Dict[str, str]],
+) -> JSONResponse:
+    """Queue the accepted files as one batch and report a result per file."""
+    if not accepted:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "No valid PDF files to ingest", "rejected": rejected},
         )
 
-        vector_db.insert_many(
-            collection_name=collection_name,
-            texts=chunks,
-            vectors=embeddings,
-            record_ids=[str(uuid4()) for _ in range(len(chunks))],
+    batch_id, jobs = await ingestion_queue.submit_batch(
+        experiment_id=experiment_id,
+        files=[
+            (metadata.filepath, metadata.filename, metadata.source_name)
+            for metadata in accepted
+        ],
+    )
+    return JSONResponse(
+        status_code=202,
+        content={
+            "batch_id": batch_id,
+            "files": [
+                {
+                    "filename": job.filename,
+                    "job_id": job.job_id,
+                    "status": job.status.value,
+                }
+                for job in jobs
+            ],
+            "rejected": rejected,
+        },
+    )
+
+
+@router.post("/upload/batch/{experiment_id}")
+async def upload_files(
+    experiment_id: str,
+    files: List[UploadFile],
+    settings: Settings = Depends(get_app_settings),
+    file_handler: FileHandler = Depends(get_file_handler),
+    ingestion_queue: IngestionQueue = Depends(get_ingestion_queue),
+) -> JSONResponse:
+    """Save several files and queue them for ingestion as one batch."""
+    if len(files) > settings.MAX_BATCH_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.MAX_BATCH_FILES} files can be uploaded at once.",
         )
 
-        return JSONResponse(
-            status_code=200, content={"embeddings_count": len(embeddings)}
+    try:
+        accepted, rejected = [], []
+        for file in files:
+            try:
+                accepted.append(
+                    await file_handler.save_file(file=file, experiment_id=experiment_id)
+                )
+            except HTTPException as e:
+                rejected.append({"filename": file.filename, "error": e.detail})
+
+        return await _submit_batch(ingestion_queue, experiment_id, accepted, rejected)
+
+    except Exception as e:
+        logger.error(f"Error processing batch upload: {e}")
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+
+@router.post("/import/{experiment_id}")
+async def import_files(
+    experiment_id: str,
+    body: ImportRequest,
+    settings: Settings = Depends(get_app_settings),
+    file_handler: FileHandler = Depends(get_file_handler),
+    ingestion_queue: IngestionQueue = Depends(get_ingestion_queue),
+) -> JSONResponse:
+    """Queue the PDFs of a server-side directory or zip archive as one batch."""
+    try:
+        accepted, rejected = await run_blocking(
+            file_handler.import_path,
+            body.path,
+            experiment_id,
+            settings.MAX_BATCH_FILES,
+        )
+
+        response = await _submit_batch(
+            ingestion_queue, experiment_id, accepted, rejected
         )
+        if body.prune and accepted:
+            imported = {metadata.source_name for metadata in accepted}
+            documents = await run_blocking(
+                ingestion_queue.list_documents, experiment_id
+            )
+            for document in documents:
+                if document.document_key not in imported:
+                    await ingestion_queue.delete_document(
+                        experiment_id, document.document_key
+                    )
+        return response
 
+    except FileValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error processing file: {e}")
+        logger.error(f"Error importing files: {e}")
         return JSONResponse(status_code=500, content={"error": str(e)})
+
+
+@router.get("/batches/{batch_id}")
+async def get_batch(
+    batch_id: str, ingestion_queue: IngestionQueue = Depends(get_ingestion_queue)
+) -> JSONResponse:
+    """Return the per-file results of a batch ingestion."""
+    jobs: List[IngestionJob] = ingestion_queue.get_batch(batch_id)
+    if not jobs:
+        raise HTTPException(status_code=404, detail="Batch not found.")
+
+    counts = {status.value: 0 for status in JobStatus}
+    for job in jobs:
+        counts[job.status.value] += 1
+    finished = counts[JobStatus.COMPLETED.value] + counts[JobStatus.FAILED.value]
+
+    return JSONResponse(
+        status_code=200,
+        content={
+            "batch_id": batch_id,
+            "status": "finished" if finished == len(jobs) else "running",
+            "counts": counts,
+            "indexed_chunks": sum(job.indexed_chunks for job in jobs),
+            "files": [job.model_dump(mode="json") for job in jobs],
+        },
+    )
+
+
+@router.get("/documents/{experiment_id}")
+async def list_documents(
+    experiment_id: str,
+    ingestion_queue: IngestionQueue = Depends(get_ingestion_queue),
+) -> JSONResponse:
+    """List the ingested documents of an experiment."""
+    documents = await run_blocking(ingestion_queue.list_documents, experiment_id)
+    return JSONResponse(
+        status_code=200,
+        content={
+            "experiment_id": experiment_id,
+            "documents": [document.model_dump(mode="json") for document in documents],
+        },
+    )
+
+
+@router.delete("/documents/{experiment_id}/{document_key:path}")
+async def delete_document(
+    experiment_id: str,
+    document_key: str,
+    ingestion_queue: IngestionQueue = Depends(get_ingestion_queue),
+) -> JSONResponse:
+    """Delete a document's chunks from the experiment collection."""
+    deleted = await ingestion_queue.delete_document(experiment_id, document_key)
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="Document not found.")
+
+    return JSONResponse(
+        status_code=200,
+        content={"document_key": document_key, "deleted_chunks": deleted},
+    )
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(
+    job_id: str, ingestion_queue: IngestionQueue = Depends(get_ingestion_queue)
+) -> JSONResponse:
+    """Return the status and per-stage progress of an ingestion job."""
+    job = ingestion_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+
+    return JSONResponse(status_code=200, content=job.model_dump(mode="json"))
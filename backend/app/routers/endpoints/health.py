@@ -0,0 +1,40 @@
+import logging
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from app.dependencies import ComponentRegistry, get_registry
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live")
+async def live() -> JSONResponse:
+    """Liveness probe: the process is up and serving requests."""
+    return JSONResponse(status_code=200, content={"status": "alive"})
+
+
+@router.get("/ready")
+async def ready(registry: ComponentRegistry = Depends(get_registry)) -> JSONResponse:
+    """
+    Readiness probe: 200 once every component is built and warmed up, 503
+    while starting or after a failed startup.
+    """
+    if registry.startup_error is not None:
+        status, status_code = "failed", 503
+    elif not registry.ready:
+        status, status_code = "starting", 503
+    else:
+        status, status_code = "ready", 200
+
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "status": status,
+            "error": registry.startup_error,
+            "import_seconds": registry.import_seconds,
+            "startup_seconds": registry.startup_seconds,
+            "build_seconds": registry.build_seconds,
+        },
+    )
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.utils.metrics import metrics_enabled, render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics")
+async def metrics() -> PlainTextResponse:
+    """Latency histograms and counters in the Prometheus text format."""
+    if not metrics_enabled():
+        raise HTTPException(status_code=404, detail="Metrics are disabled.")
+
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,58 +1,260 @@
+import json
 import logging
+import time
+from typing import AsyncIterator, List, Optional
 
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import JSONResponse
+import numpy as np
 
-from app.utils.prompts import RAG_PROMPT
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.config import Settings
+from app.dependencies import (
+    get_answer_cache,
+    get_app_settings,
+    get_context_builder,
+    get_generator,
+    get_query_embedder,
+    get_retriever,
+)
+from app.processors.embedders import QueryEmbeddingBatcher
+from app.processors.generators import (
+    ContextBuilder,
+    SemanticAnswerCache,
+    TextGeneratorBase,
+)
+from app.processors.retrieval import Retriever
+from app.processors.vectordb import SearchFilter
+from app.utils.metrics import (
+    CACHE_REQUESTS,
+    GENERATION_TOKENS,
+    STAGE_SECONDS,
+    metrics_enabled,
+    span,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/search", tags=["search"])
 
 
+def _search_filter(
+    document_key: Optional[List[str]] = Query(None),
+    page_from: Optional[int] = Query(None, ge=0),
+    page_to: Optional[int] = Query(None, ge=0),
+) -> Optional[SearchFilter]:
+    """Optional restriction of retrieval to some documents and/or pages."""
+    filters = SearchFilter(
+        document_keys=document_key, page_from=page_from, page_to=page_to
+    )
+    return None if filters.is_empty else filters
+
+
+async def _build_prompt(
+    retriever: Retriever,
+    context_builder: ContextBuilder,
+    candidates: int,
+    experiment_id: str,
+    question: str,
+    question_embedding: np.ndarray,
+    filters: Optional[SearchFilter] = None,
+) -> str:
+    """Retrieve the most relevant chunks and pack them into the RAG prompt."""
+    with span("retrieval"):
+        most_relevant_docs = await retriever.asearch(
+            collection_name=f"collection_{experiment_id}",
+            query=question,
+            vector=question_embedding,
+            limit=candidates,
+            filters=filters,
+        )
+    if not most_relevant_docs:
+        raise HTTPException(status_code=404, detail="No relevant documents found.")
+
+    with span("prompt_build"):
+        return context_builder.build_prompt(
+            question, [doc.text for doc in most_relevant_docs]
+        )
+
+
+def _record_tokens(context_builder: ContextBuilder, prompt: str, answer: str):
+    # Token counting re-encodes the prompt, so it only runs with metrics on
+    if metrics_enabled():
+        GENERATION_TOKENS.inc(context_builder.count_tokens(prompt), direction="input")
+        GENERATION_TOKENS.inc(context_builder.count_tokens(answer), direction="output")
+
+
+def _sse_event(data: dict, event: str = None) -> str:
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data)}\n\n"
+
+
 @router.post("/answer/{experiment_id}/{question}")
 async def answer(
     experiment_id: str,
     question: str,
-    request: Request,
+    filters: Optional[SearchFilter] = Depends(_search_filter),
+    settings: Settings = Depends(get_app_settings),
+    query_embedder: QueryEmbeddingBatcher = Depends(get_query_embedder),
+    retriever: Retriever = Depends(get_retriever),
+    context_builder: ContextBuilder = Depends(get_context_builder),
+    generator: TextGeneratorBase = Depends(get_generator),
+    answer_cache: Optional[SemanticAnswerCache] = Depends(get_answer_cache),
 ) -> JSONResponse:
     """
     Endpoint to find relevant chunks for a given query and file.
     """
     try:
-        settings = request.app.state.settings
-        vector_db = request.app.vector_db
-        embedder = request.app.embedder
-        generator = request.app.generator
+        # Cached answers are per experiment, so filtered questions bypass them
+        if filters is not None:
+            answer_cache = None
 
         # Generate embedding for the question
-        question_embedding = embedder.embed_text([question])
-        if not question_embedding:
+        with span("query_embedding"):
+            question_embedding = await query_embedder.embed(question)
+        if question_embedding is None or not question_embedding.size:
             raise ValueError("Failed to generate question embedding.")
 
-        # Search for relevant documents in the vector database
-        most_relevant_docs = vector_db.search_by_vector(
-            collection_name=f"collection_{experiment_id}",
-            vector=question_embedding[0],
-            limit=2,
-        )
-        if not most_relevant_docs:
-            raise HTTPException(status_code=404, detail="No relevant documents found.")
+        # Serve a previously generated answer for a near-identical question
+        if answer_cache is not None:
+            cache_generation = answer_cache.generation(experiment_id)
+            cached_answer = answer_cache.get(experiment_id, question_embedding)
+            CACHE_REQUESTS.inc(
+                cache="answer", result="miss" if cached_answer is None else "hit"
+            )
+            if cached_answer is not None:
+                return JSONResponse(content={"answer": cached_answer})
 
-        # Format prompt and generate answer
-        prompt = RAG_PROMPT.format(
-            question=question, chunks=[doc.text for doc in most_relevant_docs]
-        )
-        answer = generator.generate_text(
-            prompt=prompt,
-            chat_history=[],
-            max_output_tokens=settings.MAX_OUTPUT_TOKENS,
-            temperature=settings.TEMPERATURE,
+        # Search for relevant documents and format the prompt
+        prompt = await _build_prompt(
+            retriever,
+            context_builder,
+            settings.CONTEXT_CANDIDATES,
+            experiment_id,
+            question,
+            question_embedding,
+            filters,
         )
+        with span("generation"):
+            answer = await generator.agenerate_text(
+                prompt=prompt,
+                chat_history=[],
+                max_output_tokens=settings.MAX_OUTPUT_TOKENS,
+                temperature=settings.TEMPERATURE,
+            )
+        _record_tokens(context_builder, prompt, answer or "")
+
+        if answer_cache is not None and answer:
+            answer_cache.put(
+                experiment_id, question_embedding, answer, cache_generation
+            )
 
         return JSONResponse(content={"answer": answer})
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating answer: {e}")
         raise HTTPException(
             status_code=500, detail="An error occurred while processing the request."
         )
+
+
+@router.api_route("/answer/stream/{experiment_id}/{question}", methods=["GET", "POST"])
+async def answer_stream(
+    experiment_id: str,
+    question: str,
+    filters: Optional[SearchFilter] = Depends(_search_filter),
+    settings: Settings = Depends(get_app_settings),
+    query_embedder: QueryEmbeddingBatcher = Depends(get_query_embedder),
+    retriever: Retriever = Depends(get_retriever),
+    context_builder: ContextBuilder = Depends(get_context_builder),
+    generator: TextGeneratorBase = Depends(get_generator),
+    answer_cache: Optional[SemanticAnswerCache] = Depends(get_answer_cache),
+) -> StreamingResponse:
+    """
+    Server-Sent-Events variant of `answer`.
+
+    Each generated piece of text is sent as a `data: {"token": ...}` event as
+    soon as it arrives, followed by a final `done` event with the full answer.
+    """
+    try:
+        if filters is not None:
+            answer_cache = None
+
+        with span("query_embedding"):
+            question_embedding = await query_embedder.embed(question)
+        if question_embedding is None or not question_embedding.size:
+            raise ValueError("Failed to generate question embedding.")
+
+        cached_answer = None
+        if answer_cache is not None:
+            cache_generation = answer_cache.generation(experiment_id)
+            cached_answer = answer_cache.get(experiment_id, question_embedding)
+            CACHE_REQUESTS.inc(
+                cache="answer", result="miss" if cached_answer is None else "hit"
+            )
+
+        prompt = None
+        if cached_answer is None:
+            prompt = await _build_prompt(
+                retriever,
+                context_builder,
+                settings.CONTEXT_CANDIDATES,
+                experiment_id,
+                question,
+                question_embedding,
+                filters,
+            )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error preparing streamed answer: {e}")
+        raise HTTPException(
+            status_code=500, detail="An error occurred while processing the request."
+        )
+
+    async def events() -> AsyncIterator[str]:
+        if cached_answer is not None:
+            yield _sse_event({"token": cached_answer})
+            yield _sse_event({"answer": cached_answer}, event="done")
+            return
+
+        tokens = []
+        started = time.perf_counter()
+        try:
+            with span("generation"):
+                async for token in generator.astream_text(
+                    prompt=prompt,
+                    chat_history=[],
+                    max_output_tokens=settings.MAX_OUTPUT_TOKENS,
+                    temperature=settings.TEMPERATURE,
+                ):
+                    if not tokens:
+                        STAGE_SECONDS.observe(
+                            time.perf_counter() - started,
+                            stage="generation_first_token",
+                        )
+                    tokens.append(token)
+                    yield _sse_event({"token": token})
+        except Exception as e:
+            logger.error(f"Error streaming answer: {e}")
+            yield _sse_event(
+                {"error": "An error occurred while generating the answer."},
+                event="error",
+            )
+            return
+
+        answer = "".join(tokens)
+        _record_tokens(context_builder, prompt, answer)
+        if answer_cache is not None and answer:
+            answer_cache.put(
+                experiment_id, question_embedding, answer, cache_generation
+            )
+        yield _sse_event({"answer": answer}, event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
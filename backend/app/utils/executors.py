@@ -0,0 +1,173 @@
+import asyncio
+import concurrent.futures
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+DEFAULT_MAX_WORKERS = 8
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_workers: int = 0
+_process_lock = threading.Lock()
+
+
+def configure_executor(max_workers: int = DEFAULT_MAX_WORKERS) -> ThreadPoolExecutor:
+    """(Re)create the shared executor used to offload blocking calls."""
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="blocking"
+        )
+        return _executor
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the shared bounded executor, creating it on first use."""
+    if _executor is None:
+        return configure_executor()
+    return _executor
+
+
+def shutdown_executor():
+    """Shut down the shared executor, waiting for running calls to finish."""
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+def configure_process_pool(max_workers: int = 0):
+    """
+    Set the size of the shared process pool used for CPU-bound work.
+
+    `0` uses one process per CPU. The pool itself is only started on first
+    use, so processes that never parse a file never pay for it.
+    """
+    global _process_pool_workers
+    shutdown_process_pool()
+    _process_pool_workers = max_workers
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool, starting it on first use."""
+    global _process_pool
+    with _process_lock:
+        if _process_pool is None:
+            # "spawn" keeps worker processes clear of the parent's threads and
+            # open database handles, which do not survive a fork safely
+            _process_pool = ProcessPoolExecutor(
+                max_workers=_process_pool_workers or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _process_pool
+
+
+def shutdown_process_pool():
+    """Shut down the shared process pool if it was started."""
+    global _process_pool
+    with _process_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=True, cancel_futures=True)
+            _process_pool = None
+
+
+async def run_in_process(func: Callable[..., Any], *args) -> Any:
+    """
+    Run a picklable, module-level function in the shared process pool.
+
+    Arguments and results cross the process boundary by pickling, so keep both
+    compact (paths, plain strings and lists rather than rich objects).
+    """
+    global _process_pool
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        # A crashed worker (e.g. out of memory) breaks the whole pool; drop it
+        # so the next call starts a fresh one
+        with _process_lock:
+            if _process_pool is pool:
+                _process_pool = None
+        raise
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a synchronous callable in the shared executor without blocking the event loop.
+
+    The executor is bounded, so at most `max_workers` blocking calls (model
+    inference, embedded database access, ...) run at the same time.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+class _StreamStopped(Exception):
+    pass
+
+
+_STREAM_DONE = object()
+
+
+async def stream_blocking(
+    func: Callable[..., Iterable[Any]], *args, max_buffered: int = 4, **kwargs
+) -> AsyncIterator[Any]:
+    """
+    Iterate a blocking generator in the shared executor as an async iterator.
+
+    At most `max_buffered` items are held between the producer thread and the
+    consumer, so a slow consumer pauses the producer instead of letting items
+    pile up in memory. Closing the async iterator early stops the producer.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered)
+    stop = threading.Event()
+
+    def put(item: Any):
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        while True:
+            try:
+                return future.result(timeout=0.1)
+            except concurrent.futures.TimeoutError:
+                if stop.is_set():
+                    future.cancel()
+                    raise _StreamStopped()
+
+    def produce():
+        try:
+            for item in func(*args, **kwargs):
+                if stop.is_set():
+                    return
+                put(item)
+            put(_STREAM_DONE)
+        except _StreamStopped:
+            pass
+        except Exception as e:
+            if not stop.is_set():
+                put(e)
+
+    producer = loop.run_in_executor(get_executor(), produce)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _STREAM_DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        await asyncio.gather(producer, return_exceptions=True)
@@ -0,0 +1,296 @@
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+from .reporting import latency_summary, peak_rss_mb, print_table
+from .synthetic_corpus import build_corpus, facts_to_dicts
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+EXPERIMENT_ID = "benchmark"
+PROVIDERS = ["numpy", "faiss", "chroma", "qdrant"]
+
+# Reported metrics compared against a baseline, and whether higher is better
+REGRESSION_CHECKS = {
+    "chunks_per_second": True,
+    "answer_p95_ms": False,
+    "upload_p95_ms": False,
+}
+RESULT_COLUMNS = [
+    ("provider", "provider"),
+    ("chunks", "chunks"),
+    ("chunks_per_second", "chunks/s"),
+    ("upload_p95_ms", "upload p95"),
+    ("answer_p50_ms", "answer p50"),
+    ("answer_p95_ms", "p95"),
+    ("answer_p99_ms", "p99"),
+    ("answers_per_second", "answers/s"),
+    ("peak_rss_mb", "RSS MB"),
+]
+WORKLOAD_IGNORED_ARGUMENTS = (
+    "providers",
+    "workdir",
+    "output",
+    "baseline",
+    "tolerance",
+    "child",
+)
+
+
+def _provider_environment(args, workdir: Path) -> Dict[str, str]:
+    return {
+        "VECTOR_DB_TYPE": args.child,
+        "VECTOR_DB_PATH": str(workdir / "vector_db"),
+        "EMBEDDER_TYPE": "FAKE",
+        "EMBEDDER_MODEL_ID": "fake",
+        "GENERATOR_TYPE": "FAKE",
+        "MODEL_ID": "fake",
+        "FAKE_EMBEDDER_DIMENSION": str(args.dimension),
+        "FAKE_EMBEDDER_LATENCY_MS": str(args.embed_latency_ms),
+        "FAKE_GENERATOR_FIRST_TOKEN_MS": str(args.first_token_ms),
+        "FAKE_GENERATOR_TOKEN_MS": str(args.token_ms),
+        "HYBRID_SEARCH_ENABLED": str(args.hybrid).lower(),
+        "UPLOAD_DIR": str(workdir / "uploads"),
+        "IMPORT_DIR": str(workdir / "imports"),
+        "INGESTION_JOBS_DB": str(workdir / "jobs.sqlite3"),
+        "DOCUMENT_REGISTRY_DB": str(workdir / "documents.sqlite3"),
+        "LEXICAL_INDEX_PATH": str(workdir / "lexical_index"),
+        # Caches would turn repeated runs into lookups instead of the hot path
+        "EMBEDDING_CACHE_ENABLED": "false",
+        "ANSWER_CACHE_ENABLED": "false",
+        "CONFIG_RELOAD_INTERVAL": "0",
+    }
+
+
+def _wait_for_jobs(client, job_ids: List[str], timeout: float) -> List[dict]:
+    deadline = time.perf_counter() + timeout
+    pending, finished = list(job_ids), {}
+    while pending:
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"{len(pending)} ingestion jobs did not finish")
+        for job_id in list(pending):
+            job = client.get(f"/files/jobs/{job_id}").json()
+            if job["status"] in ("completed", "failed"):
+                finished[job_id] = job
+                pending.remove(job_id)
+        time.sleep(0.01)
+    return [finished[job_id] for job_id in job_ids]
+
+
+def run_provider(args) -> dict:
+    """Benchmark one vector DB provider; runs in its own process."""
+    workdir = Path(args.workdir) / args.child
+    shutil.rmtree(workdir, ignore_errors=True)
+    workdir.mkdir(parents=True)
+    os.environ.update(_provider_environment(args, workdir))
+
+    from fastapi.testclient import TestClient
+
+    import main
+
+    corpus = Path(args.workdir) / "corpus"
+    facts = json.loads((corpus / "facts.json").read_text())
+    questions = [fact["question"] for fact in facts]
+    random.Random(args.seed).shuffle(questions)
+    questions = (questions * (args.questions // max(len(questions), 1) + 1))[
+        : args.questions
+    ]
+
+    with TestClient(main.app) as client:
+        upload_seconds, job_ids = [], []
+        started = time.perf_counter()
+        for path in sorted(corpus.glob("*.pdf")):
+            request_started = time.perf_counter()
+            with open(path, "rb") as file:
+                response = client.post(
+                    f"/files/upload/{EXPERIMENT_ID}",
+                    files={"file": (path.name, file, "application/pdf")},
+                )
+            upload_seconds.append(time.perf_counter() - request_started)
+            response.raise_for_status()
+            job_ids.append(response.json()["job_id"])
+        jobs = _wait_for_jobs(client, job_ids, args.timeout)
+        ingest_seconds = time.perf_counter() - started
+        chunks = sum(job["indexed_chunks"] for job in jobs)
+
+        def ask(question: str) -> float:
+            request_started = time.perf_counter()
+            response = client.post(
+                f"/search/answer/{EXPERIMENT_ID}/{quote(question, safe='')}"
+            )
+            response.raise_for_status()
+            return time.perf_counter() - request_started
+
+        for question in questions[: args.warmup]:
+            ask(question)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            answer_seconds = list(pool.map(ask, questions))
+        answering_seconds = time.perf_counter() - started
+
+    return {
+        "provider": args.child,
+        "documents": len(jobs),
+        "failed_jobs": sum(job["status"] != "completed" for job in jobs),
+        "chunks": chunks,
+        "ingest_seconds": round(ingest_seconds, 3),
+        "chunks_per_second": round(chunks / ingest_seconds, 1),
+        **latency_summary("upload", upload_seconds),
+        "questions": len(answer_seconds),
+        "answers_per_second": round(len(answer_seconds) / answering_seconds, 1),
+        **latency_summary("answer", answer_seconds),
+        "peak_rss_mb": peak_rss_mb(resource.RUSAGE_SELF),
+        "peak_parser_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+    }
+
+
+def _child_arguments(args, provider: str) -> List[str]:
+    arguments = ["--child", provider, "--workdir", str(args.workdir)]
+    for name in (
+        "questions",
+        "warmup",
+        "concurrency",
+        "dimension",
+        "embed_latency_ms",
+        "first_token_ms",
+        "token_ms",
+        "timeout",
+        "seed",
+    ):
+        arguments += [f"--{name.replace('_', '-')}", str(getattr(args, name))]
+    if args.hybrid:
+        arguments.append("--hybrid")
+    return arguments
+
+
+def _regressions(
+    results: List[dict], config: dict, baseline_path: Path, tolerance: float
+) -> List[str]:
+    previous_run = json.loads(baseline_path.read_text())
+    if previous_run.get("config") != config:
+        print(
+            "Warning: the baseline was recorded with a different workload",
+            file=sys.stderr,
+        )
+    baseline = {
+        result["provider"]: result
+        for result in previous_run["results"]
+        if "error" not in result
+    }
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["provider"])
+        if previous is None or "error" in result:
+            continue
+        for metric, higher_is_better in REGRESSION_CHECKS.items():
+            old, new = previous.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(
+                    f"{result['provider']} {metric}: {old} -> {new} ({change:+.0%})"
+                )
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description=(
+            "Upload synthetic PDFs and ask questions through the API with the "
+            "offline FAKE embedder and generator, for each vector DB provider."
+        )
+    )
+    parser.add_argument("--providers", nargs="+", default=PROVIDERS, choices=PROVIDERS)
+    parser.add_argument("--documents", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=20, help="Pages per document")
+    parser.add_argument("--lines", type=int, default=40, help="Text lines per page")
+    parser.add_argument("--questions", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--embed-latency-ms", type=float, default=20.0)
+    parser.add_argument("--first-token-ms", type=float, default=150.0)
+    parser.add_argument("--token-ms", type=float, default=2.0)
+    parser.add_argument("--hybrid", action="store_true", help="Enable BM25 fusion")
+    parser.add_argument("--timeout", type=float, default=600.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", type=Path, help="Defaults to a temp directory")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Results JSON to compare to")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Relative slowdown vs. the baseline reported as a regression",
+    )
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.child:
+        print(json.dumps(run_provider(args)))
+        return 0
+
+    args.workdir = Path(args.workdir or tempfile.mkdtemp(prefix="rag-benchmark-"))
+    corpus = args.workdir / "corpus"
+    facts = build_corpus(
+        corpus,
+        documents=args.documents,
+        pages=args.pages,
+        lines_per_page=args.lines,
+        seed=args.seed,
+    )
+    (corpus / "facts.json").write_text(json.dumps(facts_to_dicts(facts)))
+
+    results = []
+    for provider in args.providers:
+        print(f"Benchmarking {provider}...", file=sys.stderr)
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.rag_benchmark"]
+            + _child_arguments(args, provider),
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            error = (completed.stderr.strip().splitlines() or ["failed"])[-1]
+            results.append({"provider": provider, "error": error})
+            continue
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    print_table(results, RESULT_COLUMNS, name="provider")
+    # The workload parameters; results are only comparable when these match
+    config = {
+        key: value
+        for key, value in vars(args).items()
+        if key not in WORKLOAD_IGNORED_ARGUMENTS
+    }
+    if args.output:
+        args.output.write_text(
+            json.dumps({"config": config, "results": results}, indent=2)
+        )
+
+    if args.baseline:
+        regressions = _regressions(results, config, args.baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+import resource
+import sys
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+def latency_summary(prefix: str, seconds: Sequence[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean of `seconds` in milliseconds, keyed `<prefix>_p50_ms` etc."""
+    if not len(seconds):
+        return {}
+    milliseconds = np.asarray(seconds) * 1000
+    p50, p95, p99 = np.percentile(milliseconds, [50, 95, 99])
+    return {
+        f"{prefix}_p50_ms": round(float(p50), 3),
+        f"{prefix}_p95_ms": round(float(p95), 3),
+        f"{prefix}_p99_ms": round(float(p99), 3),
+        f"{prefix}_mean_ms": round(float(milliseconds.mean()), 3),
+    }
+
+
+def peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(resource.getrusage(who).ru_maxrss / scale, 1)
+
+
+def current_rss_mb() -> float:
+    """Resident set size right now; falls back to the peak where unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return peak_rss_mb()
+    return round(pages * resource.getpagesize() / 1024 / 1024, 1)
+
+
+def print_table(results: List[dict], columns: List[Tuple[str, str]], name: str):
+    """Print one row per result; failed results show their `error`."""
+    rows = [[title for _, title in columns]]
+    for result in results:
+        if "error" in result:
+            rows.append([str(result[name]), f"error: {result['error']}"])
+            continue
+        rows.append([str(result.get(key, "")) for key, _ in columns])
+    # Error messages run past the columns instead of widening them
+    full_rows = [row for row in rows if len(row) == len(columns)]
+    widths = [max(len(row[i]) for row in full_rows) for i in range(len(columns))]
+    for row in rows:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
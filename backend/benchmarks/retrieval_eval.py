@@ -0,0 +1,458 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .reporting import current_rss_mb, latency_summary, peak_rss_mb, print_table
+from .synthetic_corpus import build_retrieval_dataset
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+COLLECTION_NAME = "retrieval_eval"
+RECORD_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "document-chatbot/retrieval-eval")
+INSERT_BATCH_SIZE = 1000
+
+# Provider configs as "<provider>[:<option>=<value>,...]"; options are the
+# FAISS_* settings without their prefix, e.g. "faiss:index_type=hnsw", or the
+# quantization and projection settings below
+DEFAULT_CONFIGS = [
+    "numpy",
+    "faiss:index_type=flat",
+    "faiss:index_type=hnsw,hnsw_ef_search=16",
+    "faiss:index_type=hnsw,hnsw_ef_search=64",
+    "faiss:index_type=hnsw,hnsw_ef_search=256",
+    "faiss:index_type=ivfpq,nprobe=4",
+    "faiss:index_type=ivfpq,nprobe=16",
+    "faiss:index_type=ivfpq,nprobe=64",
+    "numpy:quantization=int8",
+    "numpy:quantization=binary",
+    "numpy:quantization=binary,oversampling=16",
+    "numpy:projection=pca,dimension=128",
+    "chroma",
+    "qdrant",
+]
+FAISS_OPTIONS = ("index_type", "nlist", "nprobe", "pq_m", "hnsw_m", "hnsw_ef_search")
+# VECTOR_QUANTIZATION and QUANTIZATION_OVERSAMPLING, e.g. "numpy:quantization=int8"
+QUANTIZATION_OPTIONS = ("quantization", "oversampling")
+# EMBEDDING_PROJECTION and its dimension, e.g. "numpy:projection=pca,dimension=64"
+PROJECTION_OPTIONS = ("projection", "dimension")
+PROVIDER_OPTIONS = {
+    "faiss": FAISS_OPTIONS + PROJECTION_OPTIONS,
+    "numpy": QUANTIZATION_OPTIONS + PROJECTION_OPTIONS,
+    "qdrant": QUANTIZATION_OPTIONS + PROJECTION_OPTIONS,
+    "chroma": PROJECTION_OPTIONS,
+}
+
+RESULT_COLUMNS = [
+    ("config", "config"),
+    ("recall_at_k", "recall@k"),
+    ("hit_at_k", "hit@k"),
+    ("mrr", "MRR"),
+    ("search_p50_ms", "p50 ms"),
+    ("search_p95_ms", "p95 ms"),
+    ("search_p99_ms", "p99 ms"),
+    ("queries_per_second", "QPS"),
+    ("build_seconds", "build s"),
+    ("build_rss_mb", "build RSS MB"),
+    ("serving_rss_mb", "serving RSS MB"),
+    ("disk_mb", "disk MB"),
+    ("frontier", "frontier"),
+]
+
+
+def load_dataset(path: Path) -> dict:
+    """
+    Read a labeled dataset from a JSON file of the form
+
+        {"chunks": [{"id": "...", "text": "...", "metadata": {...}}, ...],
+         "questions": [{"question": "...", "relevant_ids": ["..."]}, ...]}
+
+    where `metadata` is optional and `relevant_ids` name chunks that answer
+    the question.
+    """
+    dataset = json.loads(Path(path).read_text())
+    chunk_ids = {chunk["id"] for chunk in dataset["chunks"]}
+    if len(chunk_ids) != len(dataset["chunks"]):
+        raise ValueError("Chunk ids must be unique.")
+    for question in dataset["questions"]:
+        unknown = set(question.get("relevant_ids", [])) - chunk_ids
+        if unknown:
+            raise ValueError(f"Unknown relevant chunk ids: {sorted(unknown)[:5]}")
+    return dataset
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def exact_top_k(
+    vectors: np.ndarray, queries: np.ndarray, k: int, distance_method: str
+) -> Tuple[np.ndarray, List[float]]:
+    """Brute-force top-k row indices per query and the time each query took."""
+    if distance_method == "cosine":
+        vectors, queries = _normalize(vectors), _normalize(queries)
+    k = min(k, len(vectors))
+    top_k, seconds = np.empty((len(queries), k), dtype=np.int64), []
+    for i, query in enumerate(queries):
+        started = time.perf_counter()
+        scores = vectors @ query
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        top_k[i] = candidates[np.argsort(-scores[candidates], kind="stable")]
+        seconds.append(time.perf_counter() - started)
+    return top_k, seconds
+
+
+def _label_metrics(
+    ranked: List[List[int]], relevant: List[List[int]]
+) -> Dict[str, float]:
+    """Hit rate and MRR of the labeled relevant chunks within each ranking."""
+    hits, reciprocal_ranks = [], []
+    for ranking, relevant_rows in zip(ranked, relevant):
+        if not relevant_rows:
+            continue
+        rank = next(
+            (i + 1 for i, row in enumerate(ranking) if row in relevant_rows), None
+        )
+        hits.append(rank is not None)
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+    if not hits:
+        return {}
+    return {
+        "hit_at_k": round(float(np.mean(hits)), 4),
+        "mrr": round(float(np.mean(reciprocal_ranks)), 4),
+    }
+
+
+def parse_config(config: str) -> Tuple[str, dict]:
+    """Split "<provider>:<option>=<value>,..." into the provider and options."""
+    provider, _, options_text = config.partition(":")
+    options = {}
+    for option in filter(None, options_text.split(",")):
+        key, _, value = option.partition("=")
+        if key not in PROVIDER_OPTIONS.get(provider, ()):
+            raise ValueError(f"Unsupported option for {provider}: {key}")
+        try:
+            options[key] = int(value) if value.isdigit() else float(value)
+        except ValueError:
+            options[key] = value
+    return provider, options
+
+
+def _disk_mb(path: Path) -> float:
+    size = sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
+    return round(size / 1024 / 1024, 1)
+
+
+def run_config(args) -> dict:
+    """Index the embedded dataset with one provider config and search it."""
+    from app.config import get_settings
+    from app.processors.vectordb import VectorDBFactory
+
+    settings = get_settings()
+    provider, options = parse_config(args.child)
+    workdir = Path(args.workdir)
+    data = np.load(workdir / "embeddings.npz")
+    meta = json.loads((workdir / "dataset.json").read_text())
+    vectors, queries, exact = data["vectors"], data["queries"], data["exact"]
+
+    db_path = workdir / "configs" / str(args.index)
+    shutil.rmtree(db_path, ignore_errors=True)
+    factory_options = {
+        "faiss_index_type": settings.FAISS_INDEX_TYPE,
+        "faiss_nlist": settings.FAISS_NLIST,
+        "faiss_nprobe": settings.FAISS_NPROBE,
+        "faiss_pq_m": settings.FAISS_PQ_M,
+        "faiss_hnsw_m": settings.FAISS_HNSW_M,
+        "faiss_hnsw_ef_search": settings.FAISS_HNSW_EF_SEARCH,
+    }
+    factory_options.update(
+        {
+            f"faiss_{key}": value
+            for key, value in options.items()
+            if key in FAISS_OPTIONS
+        }
+    )
+
+    def open_vector_db():
+        vector_db = VectorDBFactory.create(
+            vector_db_type=provider,
+            db_path=str(db_path),
+            qdrant_url=settings.QDRANT_URL,
+            qdrant_api_key=settings.QDRANT_API_KEY,
+            quantization=options.get("quantization", settings.VECTOR_QUANTIZATION),
+            quantization_oversampling=options.get(
+                "oversampling", settings.QUANTIZATION_OVERSAMPLING
+            ),
+            projection=options.get("projection", settings.EMBEDDING_PROJECTION),
+            projection_dimension=options.get(
+                "dimension", settings.EMBEDDING_PROJECTION_DIMENSION
+            ),
+            projection_fit_samples=settings.EMBEDDING_PROJECTION_FIT_SAMPLES,
+            **factory_options,
+        )
+        vector_db.connect()
+        return vector_db
+
+    vector_db = open_vector_db()
+
+    record_ids = [
+        str(uuid.uuid5(RECORD_NAMESPACE, chunk_id)) for chunk_id in meta["ids"]
+    ]
+    rows = {record_id: row for row, record_id in enumerate(record_ids)}
+    rss_before = current_rss_mb()
+    started = time.perf_counter()
+    vector_db.create_collection(
+        collection_name=COLLECTION_NAME,
+        embedding_size=vectors.shape[1],
+        distance_method=settings.VECTOR_DB_DISTANCE_METHOD,
+        reset=True,
+    )
+    # The first insert may need to be larger, e.g. to fit a PCA projection
+    first_batch = max(INSERT_BATCH_SIZE, vector_db.initial_batch_size(COLLECTION_NAME))
+    for start in [0, *range(first_batch, len(vectors), INSERT_BATCH_SIZE)]:
+        stop = first_batch if start == 0 else start + INSERT_BATCH_SIZE
+        inserted = vector_db.insert_many(
+            collection_name=COLLECTION_NAME,
+            texts=meta["texts"][start:stop],
+            vectors=vectors[start:stop],
+            metadata=meta["metadata"][start:stop],
+            record_ids=record_ids[start:stop],
+        )
+        if inserted is False:
+            raise RuntimeError("Failed to insert the dataset")
+    build_seconds = time.perf_counter() - started
+    build_rss = peak_rss_mb() - rss_before
+    vector_db.disconnect()
+
+    # Reopen the store, as after a restart, so only what searching pages in
+    # counts towards the serving memory
+    del vector_db
+    rss_before = current_rss_mb()
+    vector_db = open_vector_db()
+    for query in queries[: args.warmup]:
+        vector_db.search_by_vector(COLLECTION_NAME, query, limit=args.top_k)
+    ranked, seconds = [], []
+    for query in queries:
+        started = time.perf_counter()
+        results = vector_db.search_by_vector(COLLECTION_NAME, query, limit=args.top_k)
+        seconds.append(time.perf_counter() - started)
+        ranked.append([rows[result.record_id] for result in results])
+    serving_rss = current_rss_mb() - rss_before
+    vector_db.disconnect()
+
+    recall = [
+        len(set(ranking) & set(expected)) / len(expected)
+        for ranking, expected in zip(ranked, exact.tolist())
+    ]
+    return {
+        "config": args.child,
+        "recall_at_k": round(float(np.mean(recall)), 4),
+        **_label_metrics(ranked, meta["relevant_rows"]),
+        **latency_summary("search", seconds),
+        "queries_per_second": round(len(seconds) / sum(seconds), 1),
+        "build_seconds": round(build_seconds, 2),
+        "build_rss_mb": round(build_rss, 1),
+        "serving_rss_mb": round(serving_rss, 1),
+        "disk_mb": _disk_mb(db_path),
+    }
+
+
+def mark_frontier(results: List[dict], latency_key: str = "search_p95_ms"):
+    """Flag the results that no other result beats on both recall and latency."""
+    scored = [result for result in results if "error" not in result]
+    for result in scored:
+        result["frontier"] = not any(
+            other["recall_at_k"] >= result["recall_at_k"]
+            and other[latency_key] <= result[latency_key]
+            and (
+                other["recall_at_k"] > result["recall_at_k"]
+                or other[latency_key] < result[latency_key]
+            )
+            for other in scored
+        )
+
+
+def plot_results(results: List[dict], path: Path, k: int):
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        raise ImportError("Please install the matplotlib package to plot results")
+
+    scored = [result for result in results if "error" not in result]
+    figure, (latency_axis, memory_axis) = plt.subplots(1, 2, figsize=(14, 6))
+    for result in scored:
+        for axis, x in (
+            (latency_axis, result["search_p95_ms"]),
+            (memory_axis, result["serving_rss_mb"]),
+        ):
+            axis.scatter(
+                x, result["recall_at_k"], c="C1" if result["frontier"] else "C0"
+            )
+            axis.annotate(result["config"], (x, result["recall_at_k"]), fontsize=7)
+    frontier = sorted(
+        (result for result in scored if result["frontier"]),
+        key=lambda result: result["search_p95_ms"],
+    )
+    latency_axis.plot(
+        [result["search_p95_ms"] for result in frontier],
+        [result["recall_at_k"] for result in frontier],
+        c="C1",
+    )
+    latency_axis.set_xscale("log")
+    latency_axis.set_xlabel("p95 search latency (ms)")
+    memory_axis.set_xlabel("Serving RSS (MB)")
+    for axis in (latency_axis, memory_axis):
+        axis.set_ylabel(f"recall@{k} vs. exact search")
+        axis.grid(True, alpha=0.3)
+    figure.tight_layout()
+    figure.savefig(path, dpi=150)
+
+
+def _prepare(args) -> dict:
+    """Embed the dataset, compute exact ground truth and save both to workdir."""
+    if args.embedder:
+        os.environ["EMBEDDER_TYPE"] = args.embedder
+    from app.config import get_settings
+    from app.dependencies import ComponentRegistry
+
+    settings = get_settings()
+    if args.dataset:
+        dataset = load_dataset(args.dataset)
+    else:
+        dataset = build_retrieval_dataset(chunks=args.chunks, seed=args.seed)
+    questions = dataset["questions"]
+    if args.questions and args.questions < len(questions):
+        questions = random.Random(args.seed).sample(questions, args.questions)
+
+    chunks = dataset["chunks"]
+    rows = {chunk["id"]: row for row, chunk in enumerate(chunks)}
+    texts = [chunk["text"] for chunk in chunks]
+    embedder = ComponentRegistry(settings).embedder
+    started = time.perf_counter()
+    vectors = embedder.embed_text(texts, as_array=True)
+    queries = embedder.embed_text(
+        [question["question"] for question in questions], as_array=True
+    )
+    embed_seconds = time.perf_counter() - started
+
+    exact, seconds = exact_top_k(
+        vectors, queries, args.top_k, settings.VECTOR_DB_DISTANCE_METHOD
+    )
+    relevant_rows = [
+        [rows[chunk_id] for chunk_id in question.get("relevant_ids", [])]
+        for question in questions
+    ]
+    np.savez(
+        args.workdir / "embeddings.npz", vectors=vectors, queries=queries, exact=exact
+    )
+    (args.workdir / "dataset.json").write_text(
+        json.dumps(
+            {
+                "ids": [chunk["id"] for chunk in chunks],
+                "texts": texts,
+                "metadata": [chunk.get("metadata") or {} for chunk in chunks],
+                "relevant_rows": relevant_rows,
+            }
+        )
+    )
+    print(
+        f"Embedded {len(chunks)} chunks and {len(questions)} questions with "
+        f"{settings.EMBEDDER_TYPE} in {embed_seconds:.1f}s",
+        file=sys.stderr,
+    )
+    # Exact search is the reference every config's recall is measured against
+    return {
+        "config": "exact (brute force)",
+        "recall_at_k": 1.0,
+        **_label_metrics(exact.tolist(), relevant_rows),
+        **latency_summary("search", seconds),
+        "queries_per_second": round(len(seconds) / sum(seconds), 1),
+        "disk_mb": round(vectors.nbytes / 1024 / 1024, 1),
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure recall@k against exact search, label hit rate/MRR, search "
+            "latency and memory for vector DB providers and index settings."
+        )
+    )
+    parser.add_argument(
+        "--configs",
+        nargs="+",
+        default=DEFAULT_CONFIGS,
+        help='Provider configs, e.g. numpy "faiss:index_type=hnsw,hnsw_ef_search=64"',
+    )
+    parser.add_argument("--dataset", type=Path, help="Labeled dataset JSON file")
+    parser.add_argument(
+        "--chunks", type=int, default=20000, help="Synthetic chunks without --dataset"
+    )
+    parser.add_argument("--questions", type=int, default=500, help="0 uses all")
+    parser.add_argument("--embedder", help="Override EMBEDDER_TYPE, e.g. FAKE")
+    parser.add_argument("-k", "--top-k", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", type=Path, help="Defaults to a temp directory")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--plot", type=Path, help="Save a frontier plot (matplotlib)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--index", type=int, default=0, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.child:
+        print(json.dumps(run_config(args)))
+        return 0
+
+    for config in args.configs:
+        parse_config(config)
+    args.workdir = Path(args.workdir or tempfile.mkdtemp(prefix="retrieval-eval-"))
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    results = [_prepare(args)]
+
+    # Each config runs in a fresh process so memory use is not shared
+    for index, config in enumerate(args.configs):
+        print(f"Evaluating {config}...", file=sys.stderr)
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.retrieval_eval", "--child", config]
+            + ["--index", str(index), "--workdir", str(args.workdir)]
+            + ["--top-k", str(args.top_k), "--warmup", str(args.warmup)],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            error = (completed.stderr.strip().splitlines() or ["failed"])[-1]
+            results.append({"config": config, "error": error})
+            continue
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    mark_frontier(results[1:])
+    print_table(results, RESULT_COLUMNS, name="config")
+    if args.output:
+        args.output.write_text(
+            json.dumps({"top_k": args.top_k, "results": results}, indent=2)
+        )
+    if args.plot:
+        plot_results(results[1:], args.plot, args.top_k)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Tuple
+
+_SYLLABLES = [
+    "ka", "lo", "mer", "vin", "to", "sal", "ri", "den", "qua", "bel",
+    "nor", "ti", "gan", "os", "pre", "lu", "zan", "cor", "fi", "mel",
+]  # fmt: skip
+
+_ATTRIBUTES = [
+    "access code",
+    "shipping weight",
+    "serial number",
+    "launch year",
+    "warranty period",
+    "voltage rating",
+    "batch identifier",
+    "storage room",
+    "supplier name",
+    "calibration date",
+]
+
+_FILLER = (
+    "the report notes that the system was reviewed during the quarterly "
+    "inspection and no further action was required by the maintenance team "
+    "while the operators recorded routine measurements for the archive"
+).split()
+
+
+@dataclass
+class Fact:
+    """A question whose answer appears on exactly one page of the corpus."""
+
+    document_key: str
+    page: int
+    question: str
+    answer: str
+
+
+def _pseudo_word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def _filler_line(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(_FILLER) for _ in range(words)).capitalize() + "."
+
+
+def _new_fact(rng: random.Random, entities: set) -> Tuple[str, str, str]:
+    """Return (statement, question, answer) about an entity not used before."""
+    entity = None
+    while entity is None or entity in entities:
+        entity = f"{_pseudo_word(rng)} {_pseudo_word(rng)}".title()
+    entities.add(entity)
+    attribute = rng.choice(_ATTRIBUTES)
+    value = f"{rng.choice('ABCDEFGHJKLMNPRSTUVWXYZ')}{rng.randint(1000, 9999)}"
+    return (
+        f"The {attribute} of {entity} is {value}.",
+        f"What is the {attribute} of {entity}?",
+        value,
+    )
+
+
+def _lines_with(rng: random.Random, statement: str, lines: int) -> List[str]:
+    """Filler lines with `statement` inserted at a random position."""
+    result = [_filler_line(rng) for _ in range(lines - 1)]
+    result.insert(rng.randrange(lines), statement)
+    return result
+
+
+def _pdf_string(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: Path, pages: List[List[str]]):
+    """Write a minimal PDF with one Helvetica text line per list item."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        (
+            "<< /Type /Pages /Kids [%s] /Count %d >>"
+            % (" ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages))), len(pages))
+        ).encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, lines in enumerate(pages):
+        text = " ".join(f"({_pdf_string(line)}) '" for line in lines)
+        stream = f"BT /F1 9 Tf 40 800 Td 11 TL {text} ET".encode("latin-1")
+        objects.append(
+            (
+                "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                "/Resources << /Font << /F1 3 0 R >> >> "
+                f"/Contents {5 + 2 * i} 0 R >>"
+            ).encode()
+        )
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+
+    output = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    output += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    output += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    Path(path).write_bytes(output)
+
+
+def build_corpus(
+    directory: Path,
+    documents: int = 4,
+    pages: int = 20,
+    lines_per_page: int = 40,
+    seed: int = 0,
+) -> List[Fact]:
+    """
+    Write `documents` synthetic PDFs to `directory` and return their facts.
+
+    Every page holds filler text and one fact line ("The <attribute> of
+    <entity> is <value>.") about an entity that appears nowhere else, so each
+    fact's question has a single relevant page. The same seed always produces
+    the same files and facts.
+    """
+    rng = random.Random(seed)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    facts, entities = [], set()
+    for d in range(documents):
+        document_key = f"doc_{d:03d}.pdf"
+        document_pages = []
+        for page in range(pages):
+            statement, question, answer = _new_fact(rng, entities)
+            document_pages.append(_lines_with(rng, statement, lines_per_page))
+            facts.append(
+                Fact(
+                    document_key=document_key,
+                    page=page,
+                    question=question,
+                    answer=answer,
+                )
+            )
+        write_pdf(directory / document_key, document_pages)
+    return facts
+
+
+def facts_to_dicts(facts: List[Fact]) -> List[dict]:
+    return [asdict(fact) for fact in facts]
+
+
+def build_retrieval_dataset(
+    chunks: int = 5000, lines_per_chunk: int = 4, seed: int = 0
+) -> dict:
+    """
+    Return a labeled retrieval dataset of `chunks` synthetic chunks.
+
+    Same format as the datasets read by `retrieval_eval`: each chunk holds one
+    fact, and each question lists the id of the chunk that answers it.
+    """
+    rng = random.Random(seed)
+    entities = set()
+    dataset = {"chunks": [], "questions": []}
+    for i in range(chunks):
+        statement, question, _ = _new_fact(rng, entities)
+        chunk_id = f"chunk_{i:06d}"
+        dataset["chunks"].append(
+            {
+                "id": chunk_id,
+                "text": " ".join(_lines_with(rng, statement, lines_per_chunk)),
+                "metadata": {
+                    "document_key": f"doc_{i // 100:03d}.pdf",
+                    "page": i % 100,
+                },
+            }
+        )
+        dataset["questions"].append({"question": question, "relevant_ids": [chunk_id]})
+    return dataset
@@ -1,14 +1,28 @@
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
-from app.config import get_settings
-from app.processors.embedders import EmbedderFactory
-from app.processors.generators import TextGeneratorFactory
-from app.processors.vectordb import VectorDBFactory
-from app.routers import files_router, search_router
+from app.config import get_settings, settings_file_changed
+from app.dependencies import ComponentRegistry
+from app.routers import files_router, health_router, metrics_router, search_router
+from app.utils.executors import (
+    configure_executor,
+    configure_process_pool,
+    shutdown_executor,
+    shutdown_process_pool,
+)
+from app.utils.metrics import MetricsMiddleware, configure_metrics
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+# Heavy libraries (model runtimes, provider SDKs) are imported when the
+# component using them is built, so this only covers the app's own modules
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
 # Initialize FastAPI application and logger
 app = FastAPI()
 logger = logging.getLogger(__name__)
@@ -21,39 +35,58 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+
+
+async def watch_settings(registry: ComponentRegistry):
+    """Reload the settings whenever the `.env` file changes."""
+    while registry.settings.CONFIG_RELOAD_INTERVAL > 0:
+        await asyncio.sleep(registry.settings.CONFIG_RELOAD_INTERVAL)
+        try:
+            if settings_file_changed():
+                registry.reload()
+        except Exception as e:
+            logger.error(f"Error reloading settings: {e}")
+
+
+async def start_in_background(registry: ComponentRegistry):
+    """Build the components after the app started serving requests."""
+    try:
+        await registry.start()
+    except Exception as e:
+        logger.error(f"Error during background startup: {e}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Context manager for FastAPI app lifespan to handle startup and shutdown tasks."""
+    registry = None
+    watcher = None
+    startup = None
     try:
         # Load settings and initialize components
         settings = get_settings()
-        app.state.settings = settings
-
-        # Initialize embedder
-        app.embedder = EmbedderFactory.create_embedder(
-            embedder_type=settings.EMBEDDER_TYPE,
-            api_key=settings.EMBEDDER_API_KEY,
-            model_id=settings.EMBEDDER_MODEL_ID,
-        )
-        logger.info("Embedder initialized successfully.")
-
-        # Initialize vector database
-        app.vector_db = VectorDBFactory.create(
-            vector_db_type=settings.VECTOR_DB_TYPE,
-            db_path=settings.VECTOR_DB_PATH,
-        )
-        app.vector_db.connect()
-        logger.info("Vector database connected successfully.")
-
-        # Initialize text generator
-        app.generator = TextGeneratorFactory.create_generator(
-            generator_type=settings.GENERATOR_TYPE,
-            api_key=settings.GENERATOR_API_KEY,
-            model_id=settings.MODEL_ID,
-        )
-        logger.info("Text generator initialized successfully.")
+        configure_metrics(settings.METRICS_ENABLED)
+        configure_executor(max_workers=settings.BLOCKING_EXECUTOR_WORKERS)
+        configure_process_pool(max_workers=settings.PARSE_WORKERS)
+
+        if IMPORT_SECONDS > settings.STARTUP_IMPORT_BUDGET:
+            logger.warning(
+                f"Importing the application took {IMPORT_SECONDS:.2f}s, "
+                f"over the {settings.STARTUP_IMPORT_BUDGET:.2f}s budget."
+            )
+        else:
+            logger.info(f"Imported the application in {IMPORT_SECONDS:.2f}s.")
+
+        registry = ComponentRegistry(settings)
+        registry.import_seconds = IMPORT_SECONDS
+        app.state.registry = registry
+        if settings.LAZY_STARTUP:
+            # Readiness is reported by /health/ready once this finishes
+            startup = asyncio.create_task(start_in_background(registry))
+        else:
+            await registry.start()
+        watcher = asyncio.create_task(watch_settings(registry))
 
         yield  # Yield control to the app
 
@@ -63,9 +96,18 @@ async def lifespan(app: FastAPI):
 
     finally:
         # Shutdown tasks
-        if hasattr(app, "vector_db"):
-            app.vector_db.disconnect()
-            logger.info("Vector database disconnected successfully.")
+        if startup is not None:
+            startup.cancel()
+            with suppress(asyncio.CancelledError):
+                await startup
+        if watcher is not None:
+            watcher.cancel()
+            with suppress(asyncio.CancelledError):
+                await watcher
+        if registry is not None:
+            await registry.close()
+        shutdown_executor()
+        shutdown_process_pool()
 
 
 # Set lifespan context
@@ -74,3 +116,5 @@ app.router.lifespan_context = lifespan
 # Include routers
 app.include_router(search_router)
 app.include_router(files_router)
+app.include_router(health_router)
+app.include_router(metrics_router)
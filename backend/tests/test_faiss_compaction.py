@@ -0,0 +1,165 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from app.processors.vectordb.providers import faiss_vecdb  # noqa: E402
+from app.processors.vectordb.providers.faiss_vecdb import FaissVectorDB  # noqa: E402
+
+DIM = 16
+COLLECTION = "c"
+
+
+class InjectedFailure(Exception):
+    pass
+
+
+class FailingConnection:
+    """SQLite connection proxy failing the renumbering or its commit."""
+
+    def __init__(self, conn, fail):
+        self._conn = conn
+        self._fail = fail
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def executemany(self, sql, params):
+        if sql.startswith("UPDATE records"):
+            self._fail("renumber")
+        return self._conn.executemany(sql, params)
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        swapping = (
+            exc_type is None
+            and self._conn.execute(
+                "SELECT 1 FROM state WHERE key = 'vectors_file'"
+            ).fetchone()
+        )
+        if swapping:
+            try:
+                self._fail("commit")
+            except InjectedFailure:
+                # As sqlite3 does when its commit fails
+                self._conn.rollback()
+                raise
+        return self._conn.__exit__(exc_type, exc, tb)
+
+
+def _vectors(n, seed):
+    vectors = np.random.default_rng(seed).standard_normal((n, DIM))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def _assert_consistent(db, expected):
+    assert db.get_collection_info(COLLECTION)["size"] == len(expected)
+    for record_id, vector in list(expected.items())[::20]:
+        (hit,) = db.search_by_vector(COLLECTION, vector, limit=1)
+        assert hit.record_id == record_id
+        assert hit.text == f"t{record_id}"
+        assert hit.score == pytest.approx(1.0, abs=1e-4)
+
+
+STEPS = [
+    "write",
+    "remove_index",
+    "renumber",
+    "state",
+    "commit",
+    "remove_old_vectors",
+    "save",
+]
+
+
+@pytest.mark.parametrize("step", STEPS)
+def test_compaction_survives_failure_at_each_step(tmp_path, monkeypatch, step):
+    db_path = str(tmp_path / "db")
+    db = FaissVectorDB(db_path)
+    db.connect()
+    db.create_collection(COLLECTION, DIM, "cosine")
+    vectors = _vectors(1200, seed=0)
+    record_ids = [str(i) for i in range(1200)]
+    db.insert_many(
+        COLLECTION, [f"t{i}" for i in record_ids], vectors, record_ids=record_ids
+    )
+    expected = dict(zip(record_ids, vectors))
+    collection = db._get_collection(COLLECTION)
+    collection.save()
+    old_vectors_path = collection.vectors_path
+
+    crash_path = str(tmp_path / "crash")
+
+    def fail(at):
+        if at != step:
+            return
+        # What a crash at this point would leave on disk
+        shutil.copytree(
+            collection.path,
+            os.path.join(crash_path, COLLECTION),
+            ignore=shutil.ignore_patterns("*-shm"),
+        )
+        raise InjectedFailure(at)
+
+    real_remove, real_fsync = os.remove, os.fsync
+    real_write_state = collection._write_state
+    real_write_index = faiss.write_index
+
+    def remove(path):
+        if path == collection.index_path:
+            fail("remove_index")
+        elif path == old_vectors_path:
+            fail("remove_old_vectors")
+        real_remove(path)
+
+    def fsync(fd):
+        fail("write")
+        real_fsync(fd)
+
+    def write_state(**fields):
+        if "vectors_file" in fields:
+            fail("state")
+        real_write_state(**fields)
+
+    def write_index(index, path):
+        if collection.meta.get("vectors_file"):
+            fail("save")
+        real_write_index(index, path)
+
+    monkeypatch.setattr(os, "remove", remove)
+    monkeypatch.setattr(os, "fsync", fsync)
+    monkeypatch.setattr(collection, "_write_state", write_state)
+    monkeypatch.setattr(faiss_vecdb.faiss, "write_index", write_index)
+    monkeypatch.setattr(collection, "_conn", FailingConnection(collection._conn, fail))
+
+    # Deleting a third of the rows triggers a compaction
+    deleted = record_ids[::3]
+    assert db.delete_by_ids(COLLECTION, deleted)
+    for record_id in deleted:
+        expected.pop(record_id)
+    assert os.path.isdir(crash_path), f"no failure injected at {step}"
+
+    # The running collection keeps a consistent layout, old or new
+    _assert_consistent(db, expected)
+
+    # So do collections reloaded from a crash at that step and after it
+    crashed = FaissVectorDB(crash_path)
+    _assert_consistent(crashed, expected)
+    crashed.disconnect()
+
+    monkeypatch.undo()
+    db.disconnect()
+    reloaded = FaissVectorDB(db_path)
+    _assert_consistent(reloaded, expected)
+
+    # A later rebuild completes the compaction
+    collection = reloaded._get_collection(COLLECTION)
+    collection.rebuild()
+    assert collection.count == len(expected)
+    _assert_consistent(reloaded, expected)
+    reloaded.disconnect()